@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Fleet collection with several local agent processes
+Starts N agents on Unix sockets, each with its own HOME, collects from them
+and reports full versus delta poll sizes, GitHub requests for the whole fleet
+and whether a change on one host reaches the collector
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT: Path = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.fake_github import FakeGitHub
+from benchmarks.suite import quiet_monitor
+from health.fleet import FleetCollector
+from health.github import FetchConfig
+
+MCP_TTL: float = 0.2
+
+def claude_config(home: Path) -> Path:
+    return home / 'Library' / 'Application Support' / 'Claude' / 'claude_desktop_config.json'
+
+def start_agent(workdir: Path, index: int) -> subprocess.Popen[bytes]:
+    home: Path = workdir / f'home-{index}'
+    config: Path = claude_config(home)
+    config.parent.mkdir(parents=True)
+    config.write_text(json.dumps({'mcpServers': {'filesystem': {}, 'github': {}}}))
+    env: Dict[str, str] = dict(os.environ, HOME=str(home))
+    return subprocess.Popen(
+        [sys.executable, str(ROOT / 'project_health_monitor.py'),
+         '--agent', '--agent-name', f'host-{index}',
+         '--serve-socket', str(workdir / f'agent-{index}.sock'),
+         '--only', 'local,mcp,api', '--serve-ttl', f'mcp={MCP_TTL}'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+def wait_for_sockets(paths: List[Path], timeout: float = 30.0) -> None:
+    deadline: float = time.monotonic() + timeout
+    while not all(path.is_socket() for path in paths):
+        if time.monotonic() > deadline:
+            raise TimeoutError('agents did not start')
+        time.sleep(0.05)
+
+def main() -> None:
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Benchmark fleet collection from local agents')
+    parser.add_argument('--agents', type=int, default=4, help='Agent processes to start')
+    parser.add_argument('--latency', type=float, default=0.02, help='Fake GitHub latency in seconds')
+    args = parser.parse_args()
+
+    workdir: Path = Path(tempfile.mkdtemp(prefix='bench-fleet-'))
+    fake = FakeGitHub(latency=args.latency).start()
+    agents: List[subprocess.Popen[bytes]] = [start_agent(workdir, index) for index in range(args.agents)]
+    try:
+        sockets: List[Path] = [workdir / f'agent-{index}.sock' for index in range(args.agents)]
+        wait_for_sockets(sockets)
+
+        monitor = quiet_monitor(workdir)
+        monitor.github_token = 'benchmark-token'
+        monitor.github_fetch = FetchConfig(api_url=fake.url)
+        collector = FleetCollector(monitor, {f'host-{index}': f'unix:{path}' for index, path in enumerate(sockets)})
+
+        def poll() -> Dict[str, Any]:
+            before: int = sum(host.bytes_received for host in collector.hosts.values())
+            start: float = time.perf_counter()
+            fleet: Dict[str, Any] = collector.collect()
+            return {
+                'seconds': round(time.perf_counter() - start, 4),
+                'bytes': sum(host.bytes_received for host in collector.hosts.values()) - before,
+                'fleet': fleet
+            }
+
+        first: Dict[str, Any] = poll()
+        github_requests: int = fake.requests
+        unchanged: Dict[str, Any] = poll()
+
+        config: Path = claude_config(workdir / 'home-0')
+        config.write_text(json.dumps({'mcpServers': {'filesystem': {}, 'github': {}, 'memory': {}}}))
+        time.sleep(MCP_TTL * 2)
+        changed: Dict[str, Any] = poll()
+        host0: Dict[str, Any] = changed['fleet']['hosts']['host-0']
+
+        print(json.dumps({
+            'agents': args.agents,
+            'full_poll': {'seconds': first['seconds'], 'bytes': first['bytes']},
+            'delta_poll_unchanged': {'seconds': unchanged['seconds'], 'bytes': unchanged['bytes']},
+            'delta_poll_one_change': {'seconds': changed['seconds'], 'bytes': changed['bytes']},
+            'github_repositories': len(collector.repositories()),
+            'github_requests': github_requests,
+            'change_seen': host0['mcp_servers'].get('memory') is True,
+            'stale_hosts': [name for name, host in changed['fleet']['hosts'].items() if host['freshness']['stale']]
+        }, indent=2))
+    finally:
+        for agent in agents:
+            agent.terminate()
+        for agent in agents:
+            agent.wait(timeout=10)
+        fake.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Compare initial-commit strategies for new projects
+The old path ran `git init`, `git add .` and `git commit` per project; the
+fast path runs `git init` and `git var -l`, then one `git fast-import` stream
+and `git read-tree`
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fixtures import make_project_tree
+from create_project import GITIGNORE
+from creator.gitinit import GitBootstrapper, run_git
+
+def legacy_init(project_path: Path, bootstrapper: GitBootstrapper) -> None:
+    """The three git processes ProjectCreator._init_git used to run"""
+    subprocess.run(['git', 'init'], cwd=project_path, capture_output=True)
+    (project_path / '.gitignore').write_text(GITIGNORE)
+    subprocess.run(['git', 'add', '.'], cwd=project_path, capture_output=True)
+    subprocess.run(['git', 'commit', '-m', 'Initial commit'], cwd=project_path, capture_output=True)
+
+def fast_init(project_path: Path, bootstrapper: GitBootstrapper) -> None:
+    run_git(['init', '-q'], cwd=project_path)
+    (project_path / '.gitignore').write_text(GITIGNORE)
+    if bootstrapper.bootstrap(project_path, GITIGNORE) is None:
+        raise RuntimeError('fast path fell back to git add/commit')
+
+def run_mode(
+    label: str,
+    init: Callable[[Path, GitBootstrapper], None],
+    source: Path,
+    workdir: Path,
+    projects: int
+) -> Dict[str, Any]:
+    """Initialise `projects` copies of the source tree and check each ends up clean"""
+    target_root: Path = workdir / label
+    targets: List[Path] = []
+    for index in range(projects):
+        target: Path = target_root / f'project-{index}'
+        shutil.copytree(source, target)
+        targets.append(target)
+
+    bootstrapper = GitBootstrapper()
+    start: float = time.perf_counter()
+    for target in targets:
+        init(target, bootstrapper)
+    elapsed: float = time.perf_counter() - start
+
+    dirty: int = sum(1 for target in targets if run_git(['status', '--porcelain'], cwd=target))
+    trees: List[str] = [run_git(['rev-parse', 'HEAD^{tree}'], cwd=target).strip() for target in targets[:1]]
+    shutil.rmtree(target_root)
+    return {
+        'mode': label,
+        'projects': projects,
+        'seconds': round(elapsed, 4),
+        'per_project_ms': round(elapsed / projects * 1000, 2),
+        'dirty_after': dirty,
+        'tree': trees[0] if trees else None
+    }
+
+def main() -> None:
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Benchmark initial-commit strategies')
+    parser.add_argument('--projects', type=int, default=20, help='Projects initialised per mode')
+    parser.add_argument('--files', type=int, default=200, help='Files in each project')
+    args = parser.parse_args()
+
+    workdir: Path = Path(tempfile.mkdtemp(prefix='bench-git-init-'))
+    try:
+        source: Path = make_project_tree(workdir / 'source', args.files, depth=2)
+        (source / '__pycache__').mkdir()
+        (source / '__pycache__' / 'main.cpython-39.pyc').write_bytes(b'\0' * 64)
+        (source / '.env').write_text('TOKEN=placeholder\n')
+
+        modes: List[Tuple[str, Callable[[Path, GitBootstrapper], None]]] = [
+            ('legacy-add-commit', legacy_init),
+            ('fast-bootstrap', fast_init)
+        ]
+        results: List[Dict[str, Any]] = [
+            run_mode(label, init, source, workdir, args.projects) for label, init in modes
+        ]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold vs warm git status dirty-file counting
+Builds a synthetic repository with many tracked files and a few dirty ones
+"""
+
+import argparse
+import json
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fixtures import make_git_repo
+from health.gitstatus import GitStatusReader
+
+def time_reader(reader: GitStatusReader, repo: Path, runs: int) -> Dict[str, Any]:
+    """Time repeated count_changes calls (the first warm call primes the caches)"""
+    samples: List[float] = []
+    count: int = 0
+    for _ in range(runs):
+        start: float = time.perf_counter()
+        count = reader.count_changes(repo)
+        samples.append(time.perf_counter() - start)
+    return {
+        'mode': 'warm' if reader.warm else 'cold',
+        'fsmonitor': reader.fsmonitor_supported() if reader.warm else False,
+        'uncommitted': count,
+        'first_seconds': round(samples[0], 4),
+        'median_seconds': round(statistics.median(samples[1:] or samples), 4)
+    }
+
+def main() -> None:
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Benchmark git status modes')
+    parser.add_argument('--files', type=int, default=30000, help='Tracked files in the synthetic repo')
+    parser.add_argument('--per-dir', type=int, default=200, help='Files per directory')
+    parser.add_argument('--dirty', type=int, default=25, help='Modified plus untracked files')
+    parser.add_argument('--runs', type=int, default=5, help='Timed runs per mode')
+    args = parser.parse_args()
+
+    root: Path = Path(tempfile.mkdtemp(prefix='bench-git-status-'))
+    try:
+        make_git_repo(root, args.files, args.dirty, args.per_dir)
+        warm = GitStatusReader(warm=True)
+        results: List[Dict[str, Any]] = [
+            time_reader(GitStatusReader(warm=False), root, args.runs),
+            time_reader(warm, root, args.runs)
+        ]
+        warm.stop(root)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Compare REST and batched GraphQL repository fetching
+Reports request count, bytes transferred and wall time for each backend,
+optionally with the ci/prs/releases signal checks enabled
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fake_github import FakeGitHub
+from health.github import FetchConfig, GitHubClient
+
+def run_backend(
+    backend: str,
+    repos: List[str],
+    config: FetchConfig,
+    token: str,
+    checks: List[str]
+) -> Dict[str, Any]:
+    """Fetch every repository once with the given backend and collect counters"""
+    client = GitHubClient(token, config)
+    repo_checks: Dict[str, List[str]] = {repo: checks for repo in repos}
+    start: float = time.perf_counter()
+    try:
+        if backend == 'graphql':
+            results = client.fetch_repos_batched(repos, repo_checks)
+        else:
+            results = client.fetch_repos(repos, repo_checks)
+    finally:
+        client.close()
+    elapsed: float = time.perf_counter() - start
+
+    return {
+        'backend': backend,
+        'repos': len(repos),
+        'checks': checks,
+        'ok': sum(1 for result in results.values() if result.ok),
+        'ci_failing': sum(1 for result in results.values() if result.signals.get('ci') == 'failure'),
+        'requests': client.requests_made,
+        'bytes': client.bytes_received,
+        'seconds': round(elapsed, 4)
+    }
+
+def main() -> None:
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Benchmark GitHub fetch backends')
+    parser.add_argument('--repos', type=int, default=200, help='Number of synthetic repositories')
+    parser.add_argument('--latency', type=float, default=0.02, help='Simulated server latency in seconds')
+    parser.add_argument('--workers', type=int, default=8, help='Client concurrency cap')
+    parser.add_argument('--batch-size', type=int, default=50, help='Repositories per GraphQL query')
+    parser.add_argument('--checks', type=str, default='',
+                        help='Comma-separated signal checks to fetch as well (ci, prs, releases)')
+    parser.add_argument('--api-url', type=str, help='Benchmark against a real API instead of the fake')
+    parser.add_argument('--token', type=str, default='benchmark-token', help='Token for --api-url')
+    args = parser.parse_args()
+
+    fake = None
+    if args.api_url:
+        api_url: str = args.api_url
+    else:
+        fake = FakeGitHub(latency=args.latency).start()
+        api_url = fake.url
+
+    repos: List[str] = [f'bench-owner/repo-{i}' for i in range(args.repos)]
+    results: List[Dict[str, Any]] = []
+    try:
+        for backend in ('rest', 'graphql'):
+            config = FetchConfig(
+                api_url=api_url,
+                max_workers=args.workers,
+                batch_size=args.batch_size,
+                backend=backend
+            )
+            checks: List[str] = [check.strip() for check in args.checks.split(',') if check.strip()]
+            results.append(run_backend(backend, repos, config, args.token, checks))
+    finally:
+        if fake:
+            fake.stop()
+
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+GitHub checks against a fake API with a small rate limit
+Runs the same sequence of checks with and without the scheduler and reports,
+per run, how many repos were fetched, shown stale or reported as errors
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fake_github import FakeGitHub
+from benchmarks.suite import quiet_monitor
+from health.github import FetchConfig
+from health.ratelimit import GitHubScheduler
+from project_health_monitor import HealthStatus
+
+def run_mode(label: str, workdir: Path, args: argparse.Namespace, scheduled: bool) -> Dict[str, Any]:
+    fake = FakeGitHub(quota=args.quota, window=args.window).start()
+    try:
+        monitor = quiet_monitor(workdir)
+        monitor.github_token = 'benchmark-token'
+        monitor.github_fetch = FetchConfig(api_url=fake.url, retries=0)
+        monitor.config.github.interval = args.interval
+        monitor.repositories = [f'bench-owner/repo-{index}' for index in range(args.repos)]
+        scheduler: Optional[GitHubScheduler] = None
+        if scheduled:
+            scheduler = GitHubScheduler(path=workdir / f'{label}-schedule.json', reserve=args.reserve)
+        monitor.github_scheduler = scheduler
+
+        runs: List[Dict[str, Any]] = []
+        for _ in range(args.runs):
+            before: int = fake.requests
+            repos = monitor.check_github_status()
+            stale: int = sum(1 for info in repos.values() if info['stale'])
+            runs.append({
+                'requests': fake.requests - before,
+                'fetched': len(repos) - stale,
+                'stale': stale,
+                'errors': sum(1 for info in repos.values() if info['status'] == HealthStatus.ERROR)
+            })
+        return {'mode': label, 'quota_left': fake.remaining, 'rejected': fake.rate_limited, 'runs': runs}
+    finally:
+        fake.stop()
+
+def main() -> None:
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Benchmark GitHub checks under a rate limit')
+    parser.add_argument('--repos', type=int, default=40, help='Repositories checked per run')
+    parser.add_argument('--quota', type=int, default=60, help='REST requests allowed per window')
+    parser.add_argument('--window', type=float, default=3600.0, help='Rate-limit window in seconds')
+    parser.add_argument('--interval', type=float, default=300.0, help='Seconds between scheduled runs')
+    parser.add_argument('--reserve', type=int, default=0, help='Requests the scheduler leaves unused')
+    parser.add_argument('--runs', type=int, default=4, help='Consecutive runs per mode')
+    args = parser.parse_args()
+
+    workdir: Path = Path(tempfile.mkdtemp(prefix='bench-rate-limit-'))
+    try:
+        results: List[Dict[str, Any]] = [
+            run_mode('unscheduled', workdir, args, scheduled=False),
+            run_mode('scheduled', workdir, args, scheduled=True)
+        ]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
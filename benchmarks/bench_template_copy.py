@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Compare template instantiation modes
+Reports elapsed time, logical bytes by placement and physical bytes written
+(free-space delta) for the old copytree path, buffered copy, reflink and
+reflink with hardlinked assets
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fixtures import make_project_tree
+from creator.clone import TEMPLATE_CONFIG, CopyStats
+from creator.template import TemplateCache
+
+VARIABLES: Dict[str, str] = {
+    'name': 'bench-project', 'category': 'tools', 'description': 'Benchmark project', 'date': '2024-01-01'
+}
+
+def legacy_copy(template_path: Path, project_path: Path) -> CopyStats:
+    """The copytree/copy2 loop ProjectCreator._copy_template used to run"""
+    for item in template_path.iterdir():
+        if item.name == '.git':
+            continue
+        dest: Path = project_path / item.name
+        if item.is_dir():
+            shutil.copytree(item, dest, dirs_exist_ok=True)
+        else:
+            shutil.copy2(item, dest)
+    return CopyStats()
+
+def used_bytes(path: Path) -> int:
+    st = os.statvfs(path)
+    return (st.f_blocks - st.f_bfree) * st.f_frsize
+
+def run_mode(
+    label: str,
+    instantiate: Callable[[Path, Path], CopyStats],
+    template: Path,
+    workdir: Path,
+    projects: int
+) -> Dict[str, Any]:
+    """Instantiate the template `projects` times and total up the work"""
+    target_root: Path = workdir / label
+    target_root.mkdir()
+    os.sync()
+    before: int = used_bytes(workdir)
+    totals = CopyStats()
+    start: float = time.perf_counter()
+    for index in range(projects):
+        project: Path = target_root / f'project-{index}'
+        project.mkdir()
+        stats: CopyStats = instantiate(template, project)
+        totals.files += stats.files
+        totals.bytes_copied += stats.bytes_copied
+        totals.bytes_cloned += stats.bytes_cloned
+        totals.bytes_linked += stats.bytes_linked
+    elapsed: float = time.perf_counter() - start
+    os.sync()
+    written: int = used_bytes(workdir) - before
+    shutil.rmtree(target_root)
+
+    return {
+        'mode': label,
+        'projects': projects,
+        'seconds': round(elapsed, 4),
+        'bytes_copied': totals.bytes_copied,
+        'bytes_cloned': totals.bytes_cloned,
+        'bytes_linked': totals.bytes_linked,
+        'disk_bytes_written': max(0, written)
+    }
+
+def main() -> None:
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Benchmark template instantiation modes')
+    parser.add_argument('--projects', type=int, default=20, help='Projects instantiated per mode')
+    parser.add_argument('--files', type=int, default=300, help='Small files in the template')
+    parser.add_argument('--assets', type=int, default=4, help='Large asset files in the template')
+    parser.add_argument('--asset-mb', type=float, default=8.0, help='Size of each asset in MB')
+    parser.add_argument('--dir', type=Path, help='Run on this filesystem (e.g. a btrfs/XFS/APFS volume)')
+    args = parser.parse_args()
+
+    workdir: Path = Path(tempfile.mkdtemp(prefix='bench-template-', dir=args.dir))
+    try:
+        template: Path = make_project_tree(workdir / 'template' / 'src', args.files, depth=2).parent
+        assets: Path = template / 'assets'
+        assets.mkdir()
+        for index in range(args.assets):
+            (assets / f'model-{index}.bin').write_bytes(os.urandom(int(args.asset_mb * 1024 * 1024)))
+
+        hardlinked: Path = workdir / 'template-hardlink'
+        shutil.copytree(template, hardlinked)
+        (hardlinked / TEMPLATE_CONFIG).write_text(json.dumps({'mode': 'reflink', 'hardlink': ['assets/*']}))
+
+        # The path ProjectCreator takes, with compiled manifests kept in memory only
+        cache = TemplateCache(path=None)
+        modes: List[Tuple[str, Callable[[Path, Path], CopyStats], Path]] = [
+            ('legacy-copytree', legacy_copy, template),
+            ('copy', lambda src, dst: cache.instantiate(src, dst, VARIABLES, 'copy'), template),
+            ('reflink', lambda src, dst: cache.instantiate(src, dst, VARIABLES, 'reflink'), template),
+            ('reflink+hardlink-assets', lambda src, dst: cache.instantiate(src, dst, VARIABLES), hardlinked)
+        ]
+        results: List[Dict[str, Any]] = [
+            run_mode(label, func, source, workdir, args.projects) for label, func, source in modes
+        ]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,234 @@
+"""
+Local fake of the GitHub API for benchmarks
+Serves REST repository payloads (with ETags), the CI/pull request/release endpoints
+behind the optional signal checks and batched GraphQL queries, optionally enforcing a
+REST rate limit with GitHub's headers
+"""
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+# Endpoint templates GitHub includes in every repository payload
+URL_FIELDS = [
+    'archive', 'assignees', 'blobs', 'branches', 'collaborators', 'comments', 'commits',
+    'compare', 'contents', 'contributors', 'deployments', 'downloads', 'events', 'forks',
+    'git_commits', 'git_refs', 'git_tags', 'hooks', 'issue_comment', 'issue_events',
+    'issues', 'keys', 'labels', 'languages', 'merges', 'milestones', 'notifications',
+    'pulls', 'releases', 'stargazers', 'statuses', 'subscribers', 'subscription', 'tags',
+    'teams', 'trees'
+]
+
+def rest_payload(owner: str, name: str) -> Dict[str, Any]:
+    """Build a repository payload roughly the size and shape of the real one"""
+    base: str = f'https://api.github.com/repos/{owner}/{name}'
+    payload: Dict[str, Any] = {
+        'id': int(hashlib.md5(f'{owner}/{name}'.encode()).hexdigest()[:8], 16),
+        'name': name,
+        'full_name': f'{owner}/{name}',
+        'private': False,
+        'owner': {
+            'login': owner,
+            'avatar_url': f'https://avatars.githubusercontent.com/{owner}',
+            'url': f'https://api.github.com/users/{owner}',
+            'html_url': f'https://github.com/{owner}',
+            'type': 'User'
+        },
+        'html_url': f'https://github.com/{owner}/{name}',
+        'description': f'Synthetic repository {name} used for benchmarking',
+        'stargazers_count': len(name) * 3,
+        'watchers_count': len(name) * 3,
+        'forks_count': len(name),
+        'open_issues_count': len(name) % 7,
+        'pushed_at': '2026-10-01T12:00:00Z',
+        'created_at': '2024-01-01T12:00:00Z',
+        'updated_at': '2026-10-01T12:00:00Z',
+        'default_branch': 'main',
+        'license': {'key': 'mit', 'name': 'MIT License', 'spdx_id': 'MIT'},
+        'topics': ['automation', 'claude', 'tools'],
+        'permissions': {'admin': True, 'maintain': True, 'push': True, 'triage': True, 'pull': True}
+    }
+    for field_name in URL_FIELDS:
+        payload[f'{field_name}_url'] = f'{base}/{field_name}{{/id}}'
+    return payload
+
+def signal_state(name: str) -> Dict[str, Any]:
+    """Deterministic CI, pull request and release state for a synthetic repository"""
+    seed: int = int(hashlib.md5(name.encode()).hexdigest()[:8], 16)
+    return {
+        'ci': ['success', 'failure', 'pending', 'success'][seed % 4],
+        'oldest_pr': f'2026-{1 + seed % 9:02d}-15T12:00:00Z' if seed % 3 else None,
+        'release': f'v1.{seed % 10}.0' if seed % 5 else None,
+        'unreleased_commits': seed % 80
+    }
+
+def rest_signal(owner: str, name: str, endpoint: str) -> Any:
+    """REST payload for one signal endpoint, or None if the repository has no such resource"""
+    state: Dict[str, Any] = signal_state(name)
+    if endpoint == 'status':
+        return {'state': state['ci'], 'total_count': 1, 'statuses': [{'state': state['ci'], 'context': 'ci/build'}]}
+    if endpoint == 'check-runs':
+        return {'total_count': 0, 'check_runs': []}
+    if endpoint == 'pulls':
+        return [{'number': 1, 'created_at': state['oldest_pr']}] if state['oldest_pr'] else []
+    if endpoint == 'releases/latest':
+        if not state['release']:
+            return None
+        return {'tag_name': state['release'], 'published_at': '2026-06-01T12:00:00Z'}
+    if endpoint == 'compare':
+        return {'status': 'ahead', 'ahead_by': state['unreleased_commits'], 'behind_by': 0}
+    return None
+
+def graphql_node(owner: str, name: str) -> Dict[str, Any]:
+    """The GraphQL view of the same repository, with every signal field filled in"""
+    rest = rest_payload(owner, name)
+    state: Dict[str, Any] = signal_state(name)
+    return {
+        'name': name,
+        'stargazerCount': rest['stargazers_count'],
+        'forkCount': rest['forks_count'],
+        'pushedAt': rest['pushed_at'],
+        'issues': {'totalCount': rest['open_issues_count']},
+        'pullRequests': {'totalCount': 0},
+        'defaultBranchRef': {'name': 'main', 'target': {'statusCheckRollup': {'state': state['ci'].upper()}}},
+        'oldestPullRequest': {'nodes': [{'createdAt': state['oldest_pr']}] if state['oldest_pr'] else []},
+        'latestRelease': {'tagName': state['release'], 'publishedAt': '2026-06-01T12:00:00Z'} if state['release'] else None
+    }
+
+class FakeGitHub:
+    """Threaded HTTP server answering a subset of the GitHub API"""
+
+    def __init__(self, latency: float = 0.0, quota: Optional[int] = None, window: float = 3600.0) -> None:
+        self.latency: float = latency
+        # REST requests allowed per window; 304s are free, as on GitHub
+        self.quota: Optional[int] = quota
+        self.remaining: int = quota or 0
+        self.reset: float = time.time() + window
+        self.rate_limited: int = 0
+        self.requests: int = 0
+        self.bytes_sent: int = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        assert self._server is not None
+        return f'http://127.0.0.1:{self._server.server_port}'
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.bytes_sent = 0
+
+    def _count(self, body: bytes) -> None:
+        with self._lock:
+            self.requests += 1
+            self.bytes_sent += len(body)
+
+    def _spend(self) -> Optional[Dict[str, str]]:
+        """Take one request from the quota; rate-limit headers, or None once it is exhausted"""
+        with self._lock:
+            if self.quota is None:
+                return {}
+            if self.remaining <= 0:
+                self.rate_limited += 1
+                return None
+            self.remaining -= 1
+            return self._limit_headers()
+
+    def _limit_headers(self) -> Dict[str, str]:
+        return {
+            'X-RateLimit-Limit': str(self.quota),
+            'X-RateLimit-Remaining': str(self.remaining),
+            'X-RateLimit-Reset': str(int(self.reset)),
+            'X-RateLimit-Resource': 'core'
+        }
+
+    def start(self) -> 'FakeGitHub':
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def _send(self, status: int, body: bytes = b'', headers: Optional[Dict[str, str]] = None) -> None:
+                fake._count(body)
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                time.sleep(fake.latency)
+                parts = self.path.split('?')[0].strip('/').split('/')
+                if len(parts) < 3 or parts[0] != 'repos' or parts[2].startswith('missing'):
+                    self._send(404, b'{"message": "Not Found"}')
+                    return
+
+                payload: Any = rest_payload(parts[1], parts[2])
+                if len(parts) > 3:
+                    # /commits/REF/status, /commits/REF/check-runs, /pulls, /releases/latest, /compare/BASE...HEAD
+                    endpoint: str = parts[-1] if parts[3] == 'commits' else '/'.join(parts[3:5])
+                    payload = rest_signal(parts[1], parts[2], 'compare' if parts[3] == 'compare' else endpoint)
+                    if payload is None:
+                        self._send(404, b'{"message": "Not Found"}')
+                        return
+                body: bytes = json.dumps(payload).encode()
+                etag: str = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    with fake._lock:
+                        limits: Dict[str, str] = fake._limit_headers() if fake.quota is not None else {}
+                    self._send(304, headers=dict(limits, ETag=etag))
+                    return
+                spent: Optional[Dict[str, str]] = fake._spend()
+                if spent is None:
+                    with fake._lock:
+                        limits = fake._limit_headers()
+                    self._send(403, b'{"message": "API rate limit exceeded"}', limits)
+                    return
+                self._send(200, body, dict(spent, **{'Content-Type': 'application/json', 'ETag': etag}))
+
+            def do_POST(self) -> None:
+                time.sleep(fake.latency)
+                length: int = int(self.headers.get('Content-Length', 0))
+                request: Dict[str, Any] = json.loads(self.rfile.read(length) or b'{}')
+                variables: Dict[str, str] = request.get('variables') or {}
+
+                data: Dict[str, Any] = {}
+                errors = []
+                for key, name in variables.items():
+                    if not key.startswith('n'):
+                        continue
+                    index: str = key[1:]
+                    owner: str = variables.get(f'o{index}', '')
+                    if f't{index}' in variables:
+                        ahead: int = signal_state(name)['unreleased_commits']
+                        data[f'r{index}'] = {'ref': {'compare': {'aheadBy': ahead}}}
+                    elif name.startswith('missing'):
+                        data[f'r{index}'] = None
+                        errors.append({'path': [f'r{index}'], 'message': 'Could not resolve to a Repository'})
+                    else:
+                        data[f'r{index}'] = graphql_node(owner, name)
+
+                payload: Dict[str, Any] = {'data': data}
+                if errors:
+                    payload['errors'] = errors
+                self._send(200, json.dumps(payload).encode(), {'Content-Type': 'application/json'})
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,81 @@
+"""
+Synthetic fixtures for benchmarks
+Project trees, git repositories with dirty files, registries and workspaces
+"""
+
+import datetime
+import json
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List
+
+GIT_IDENTITY: List[str] = ['-c', 'user.name=bench', '-c', 'user.email=bench@example.com']
+CATEGORIES: List[str] = ['claude-tools', 'automation-tools', 'ml-projects']
+
+def make_project_tree(root: Path, files: int, depth: int = 3, fanout: int = 4, file_size: int = 512) -> Path:
+    """Spread `files` files over a directory tree `depth` levels deep with `fanout` children per level"""
+    directories: List[Path] = [root]
+    frontier: List[Path] = [root]
+    for _ in range(depth):
+        next_frontier: List[Path] = []
+        for parent in frontier:
+            for index in range(fanout):
+                child: Path = parent / f'dir{index}'
+                next_frontier.append(child)
+        directories.extend(next_frontier)
+        frontier = next_frontier
+
+    for directory in directories:
+        directory.mkdir(parents=True, exist_ok=True)
+    payload: bytes = b'x' * file_size
+    for index in range(files):
+        (directories[index % len(directories)] / f'file{index:06d}.txt').write_bytes(payload)
+    return root
+
+def make_git_repo(root: Path, files: int, dirty: int, per_dir: int = 200) -> Path:
+    """Commit `files` files, then modify or add `dirty` of them"""
+    root.mkdir(parents=True, exist_ok=True)
+    subprocess.run(['git', 'init', '-q', str(root)], check=True)
+    for index in range(files):
+        directory: Path = root / f'd{index // per_dir:04d}'
+        directory.mkdir(exist_ok=True)
+        (directory / f'f{index:06d}.txt').write_text(f'file {index}\n')
+    subprocess.run(['git', 'add', '-A'], cwd=root, check=True)
+    subprocess.run(['git', *GIT_IDENTITY, 'commit', '-q', '-m', 'synthetic'], cwd=root, check=True)
+
+    for index in range(dirty):
+        if index % 2:
+            (root / f'untracked-{index}.txt').write_text('new\n')
+        else:
+            (root / f'd{index // per_dir:04d}' / f'f{index:06d}.txt').write_text('changed\n')
+    return root
+
+def make_registry(path: Path, entries: int, base: Path) -> Path:
+    """Write a project-registry.json with `entries` projects"""
+    registry: Dict[str, Any] = {}
+    created: str = datetime.datetime(2025, 1, 1).isoformat()
+    for index in range(entries):
+        category: str = CATEGORIES[index % len(CATEGORIES)]
+        name: str = f'project-{index:06d}'
+        registry[name] = {
+            'category': category,
+            'path': str(base / category / name),
+            'created': created,
+            'status': 'active'
+        }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(registry, indent=2))
+    return path
+
+def make_workspace(base: Path, projects: int) -> Path:
+    """Category directories holding `projects` small project directories in total"""
+    for index in range(projects):
+        category: str = CATEGORIES[index % len(CATEGORIES)]
+        project: Path = base / category / f'project-{index:06d}'
+        project.mkdir(parents=True, exist_ok=True)
+        (project / 'README.md').write_text(f'# project {index}\n')
+        if index % 3 == 0:
+            (project / 'requirements.txt').write_text('requests\n')
+        if index % 5 == 0:
+            (project / 'package.json').write_text('{}\n')
+    return base
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the health monitor and project creator hot paths
+Runs every case against synthetic fixtures, writes machine-readable results
+and compares them with a previous results file
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT: Path = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.fake_github import FakeGitHub
+from benchmarks.fixtures import make_git_repo, make_project_tree, make_registry, make_workspace
+from create_project import ProjectCategory, ProjectCreator
+from creator.template import TemplateCache
+from creator.workspace import WorkspaceIndex
+from health.cache import ResponseCache
+from health.config import HealthConfig
+from health.dirsize import DirectorySizeIndex
+from health.github import FetchConfig
+from project_health_monitor import ProjectHealthMonitor
+
+@dataclass
+class Case:
+    """One benchmark: `run` is timed, `setup` runs untimed before every repetition"""
+    name: str
+    run: Callable[[], Any]
+    params: Dict[str, Any]
+    setup: Optional[Callable[[], None]] = None
+    teardown: Optional[Callable[[], None]] = None
+
+def measure(case: Case, repeat: int) -> Dict[str, Any]:
+    """Time `repeat` runs of a case and summarise them"""
+    samples: List[float] = []
+    for _ in range(repeat):
+        if case.setup:
+            case.setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start: float = time.perf_counter()
+            case.run()
+            samples.append(time.perf_counter() - start)
+    return {
+        'params': case.params,
+        'repeat': repeat,
+        'min_s': round(min(samples), 6),
+        'median_s': round(statistics.median(samples), 6),
+        'mean_s': round(statistics.fmean(samples), 6),
+        'stdev_s': round(statistics.stdev(samples), 6) if len(samples) > 1 else 0.0
+    }
+
+def quiet_monitor(workdir: Path) -> ProjectHealthMonitor:
+    """Monitor whose caches live under the benchmark's work directory, ignoring any config file"""
+    monitor = ProjectHealthMonitor(HealthConfig())
+    monitor.log_file = io.StringIO()
+    monitor.size_index = DirectorySizeIndex(path=workdir / 'dirsize-index.json')
+    monitor.github_cache = None
+    monitor.github_scheduler = None
+    monitor.test_cache = None
+    return monitor
+
+def directory_size_cases(workdir: Path, args: argparse.Namespace) -> List[Case]:
+    tree: Path = make_project_tree(workdir / 'tree', args.tree_files, depth=args.tree_depth)
+    params: Dict[str, Any] = {'files': args.tree_files, 'depth': args.tree_depth}
+    monitor = quiet_monitor(workdir)
+
+    def fresh_index() -> None:
+        monitor.size_index = DirectorySizeIndex(path=workdir / 'dirsize-cold.json')
+
+    warm = quiet_monitor(workdir)
+    warm._get_directory_size(tree)
+    return [
+        Case('directory_size_cold', lambda: monitor._get_directory_size(tree), params, setup=fresh_index),
+        Case('directory_size_warm', lambda: warm._get_directory_size(tree), params)
+    ]
+
+def local_projects_cases(workdir: Path, args: argparse.Namespace) -> List[Case]:
+    monitor = quiet_monitor(workdir)
+    monitor.local_projects = {
+        f'repo-{index}': str(make_git_repo(workdir / f'repo-{index}', args.repo_files, args.dirty))
+        for index in range(args.projects)
+    }
+    monitor.scan_workers = args.workers
+    params: Dict[str, Any] = {
+        'projects': args.projects,
+        'files': args.repo_files,
+        'dirty': args.dirty,
+        'workers': args.workers
+    }
+    monitor.check_local_projects()
+    return [Case('check_local_projects', monitor.check_local_projects, params)]
+
+def github_cases(workdir: Path, args: argparse.Namespace) -> List[Case]:
+    fake = FakeGitHub(latency=args.latency).start()
+    repos: List[str] = [f'bench-owner/repo-{index}' for index in range(args.repos)]
+    params: Dict[str, Any] = {'repos': args.repos, 'latency': args.latency, 'workers': args.workers}
+
+    cold = quiet_monitor(workdir)
+    cached = quiet_monitor(workdir)
+    for monitor in (cold, cached):
+        monitor.github_token = 'benchmark-token'
+        monitor.repositories = repos
+        monitor.github_fetch = FetchConfig(api_url=fake.url, max_workers=args.workers)
+    cached.github_cache = ResponseCache(path=workdir / 'http-cache')
+    cached.check_github_status()
+
+    return [
+        Case('check_github_status', cold.check_github_status, params),
+        Case('check_github_status_cached', cached.check_github_status, params, teardown=fake.stop)
+    ]
+
+def creator_cases(workdir: Path, args: argparse.Namespace) -> List[Case]:
+    creator = ProjectCreator()
+    creator.base_path = workdir / 'workspace'
+    creator.templates_path = workdir / 'templates'
+    creator.template_cache = TemplateCache(workdir / 'template-cache')
+    creator.workspace_index_path = workdir / 'workspace-index.sqlite3'
+    make_workspace(creator.base_path, args.workspace_projects)
+    make_project_tree(creator.templates_path / 'bench', args.template_files, depth=2)
+    # Written as the legacy JSON file so opening the registry also exercises the migration
+    make_registry(creator.base_path / 'project-registry.json', args.registry, creator.base_path)
+    creator.registry
+    names: List[str] = []
+    cold_indexes: List[Path] = []
+
+    def next_cold_index() -> None:
+        cold_indexes.append(workdir / f'workspace-cold-{len(cold_indexes)}.sqlite3')
+
+    def build_index() -> None:
+        index = WorkspaceIndex(creator.base_path, [c.value for c in ProjectCategory], cold_indexes[-1])
+        index.refresh(deep=True)
+        index.close()
+
+    def next_project() -> None:
+        names.append(f'bench-new-{len(names)}')
+
+    def create() -> None:
+        creator.create_project(names[-1], ProjectCategory.ML_PROJECTS.value, 'bench')
+
+    def update() -> None:
+        creator._update_registry(
+            'bench-registry-entry',
+            ProjectCategory.ML_PROJECTS,
+            creator.base_path / ProjectCategory.ML_PROJECTS.value / 'bench-registry-entry'
+        )
+
+    return [
+        Case(
+            'create_project', create,
+            {'template_files': args.template_files, 'registry': args.registry},
+            setup=next_project
+        ),
+        Case('update_registry', update, {'registry': args.registry}),
+        Case('get_project_info', lambda: creator.get_project_info('project-000042'), {'registry': args.registry}),
+        Case('list_projects', creator.list_projects, {'projects': args.workspace_projects}),
+        Case('workspace_refresh', creator.refresh_workspace, {'projects': args.workspace_projects}),
+        Case('workspace_index_cold', build_index, {'projects': args.workspace_projects}, setup=next_cold_index)
+    ]
+
+# Modules that must stay out of the import path of local-only runs
+LAZY_MODULES: List[str] = ['requests', 'urllib3', 'dotenv']
+
+def startup_cases(workdir: Path, args: argparse.Namespace) -> List[Case]:
+    script: str = str(ROOT / 'project_health_monitor.py')
+    probe = subprocess.run(
+        [sys.executable, '-c',
+         'import sys, project_health_monitor; '
+         f'print(",".join(m for m in {LAZY_MODULES!r} if m in sys.modules))'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    eager: str = probe.stdout.strip()
+    if eager:
+        raise RuntimeError(f'project_health_monitor imports {eager} at module load')
+
+    def command(*argv: str) -> Callable[[], Any]:
+        return lambda: subprocess.run([sys.executable, *argv], cwd=ROOT, capture_output=True)
+
+    return [
+        Case('startup_import', command('-c', 'import project_health_monitor'), {}),
+        Case('startup_help', command(script, '--help'), {}),
+        Case('startup_only_mcp', command(script, '--only', 'mcp', '--quiet'), {})
+    ]
+
+SUITES: Dict[str, Callable[[Path, argparse.Namespace], List[Case]]] = {
+    'dirsize': directory_size_cases,
+    'local': local_projects_cases,
+    'github': github_cases,
+    'creator': creator_cases,
+    'startup': startup_cases
+}
+
+def metadata() -> Dict[str, Any]:
+    """Environment details that make two result files comparable"""
+    try:
+        commit: str = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'timestamp': datetime.datetime.now().isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine()
+    }
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Print median ratios against a baseline and return the regressed case names"""
+    regressions: List[str] = []
+    print(f"{'case':32} {'baseline':>12} {'current':>12} {'ratio':>8}", file=sys.stderr)
+    for name, current in results['results'].items():
+        previous: Optional[Dict[str, Any]] = baseline.get('results', {}).get(name)
+        if previous is None:
+            print(f'{name:32} {"-":>12} {current["median_s"]:>12.6f} {"new":>8}', file=sys.stderr)
+            continue
+        ratio: float = current['median_s'] / previous['median_s'] if previous['median_s'] else float('inf')
+        flag: str = ''
+        if previous.get('params') != current['params']:
+            flag = ' (params differ)'
+        elif ratio > threshold:
+            flag = ' REGRESSION'
+            regressions.append(name)
+        print(
+            f'{name:32} {previous["median_s"]:>12.6f} {current["median_s"]:>12.6f} {ratio:>8.2f}{flag}',
+            file=sys.stderr
+        )
+    return regressions
+
+def main() -> None:
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Benchmark the monitor and creator hot paths')
+    parser.add_argument('--only', type=str, help=f'Comma-separated suites: {",".join(SUITES)}')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per case')
+    parser.add_argument('--output', type=Path, help='Write results JSON here instead of stdout')
+    parser.add_argument('--compare', type=Path, help='Previous results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='Median ratio above which a case counts as a regression')
+    parser.add_argument('--tree-files', type=int, default=20000, help='Files in the size-scan tree')
+    parser.add_argument('--tree-depth', type=int, default=4, help='Depth of the size-scan tree')
+    parser.add_argument('--projects', type=int, default=6, help='Local git projects to check')
+    parser.add_argument('--repo-files', type=int, default=2000, help='Tracked files per project')
+    parser.add_argument('--dirty', type=int, default=20, help='Dirty files per project')
+    parser.add_argument('--workers', type=int, default=8, help='Scan and fetch concurrency')
+    parser.add_argument('--repos', type=int, default=50, help='Repositories on the fake GitHub')
+    parser.add_argument('--latency', type=float, default=0.02, help='Fake GitHub latency in seconds')
+    parser.add_argument('--registry', type=int, default=5000, help='Entries in the synthetic registry')
+    parser.add_argument('--workspace-projects', type=int, default=600, help='Projects for list_projects')
+    parser.add_argument('--template-files', type=int, default=200, help='Files in the synthetic template')
+    args = parser.parse_args()
+
+    selected: List[str] = args.only.split(',') if args.only else list(SUITES)
+    unknown: List[str] = [name for name in selected if name not in SUITES]
+    if unknown:
+        parser.error(f'unknown suite(s): {", ".join(unknown)}')
+
+    results: Dict[str, Any] = {'meta': metadata(), 'results': {}}
+    workdir: Path = Path(tempfile.mkdtemp(prefix='bench-suite-'))
+    try:
+        for suite in selected:
+            cases: List[Case] = SUITES[suite](workdir / suite, args)
+            for case in cases:
+                print(f'⏱️  {case.name}', file=sys.stderr)
+                results['results'][case.name] = measure(case, args.repeat)
+            for case in cases:
+                if case.teardown:
+                    case.teardown()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    payload: str = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(payload)
+    else:
+        print(payload)
+
+    if args.compare:
+        regressions: List[str] = compare(results, json.loads(args.compare.read_text()), args.threshold)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -7,14 +7,20 @@ Creates new projects from templates following organization standards
 import os
 import shutil
 import argparse
-import subprocess
 import datetime
 import json
+import time
 from pathlib import Path
 from typing import Dict, List, Optional, Union, Tuple, Any
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from enum import Enum
 
+from creator.clone import COPY_MODES, CopyStats
+from creator.gitinit import GitBootstrapper, run_git
+from creator.template import TemplateCache, parse_placeholders, render
+from creator.registry import ProjectRegistry
+from creator.workspace import PROJECT_TYPES, SORT_ORDERS, RefreshStats, WorkspaceIndex, WorkspaceProject
+
 class ProjectCategory(Enum):
     """Valid project categories"""
     CLAUDE_TOOLS = 'claude-tools'
@@ -31,6 +37,84 @@ class ProjectConfig:
     git_init: bool = True
     create_readme: bool = True
 
+GITIGNORE: str = """# Python
+__pycache__/
+*.py[cod]
+*$py.class
+*.so
+.Python
+env/
+venv/
+.venv
+.env
+
+# IDE
+.vscode/
+.idea/
+*.swp
+*.swo
+.DS_Store
+
+# Project
+*.log
+dist/
+build/
+*.egg-info/
+.pytest_cache/
+.mypy_cache/
+"""
+
+# Built-in templates, parsed once; placeholders are {name}, {category}, {description}, {date},
+# and {{name}} etc. escape a literal {name}
+DEFAULT_DIRECTORIES: List[str] = ['src', 'tests', 'docs', 'configs']
+
+DEFAULT_README: List[str] = parse_placeholders("""# {name}
+
+## Overview
+{name} project
+
+## Setup
+```bash
+# Installation instructions here
+```
+
+## Usage
+```bash
+# Usage examples here
+```
+
+## Development
+Created: {date}
+""")
+
+CLAUDE_MD: List[str] = parse_placeholders("""# Project: {name}
+
+## Category
+{category}
+
+## Description
+{description}
+
+## Project Structure
+```
+{name}/
+├── src/         # Source code
+├── tests/       # Test files
+├── docs/        # Documentation
+└── configs/     # Configuration files
+```
+
+## Development Guidelines
+- Follow Python type hints for all functions
+- Write comprehensive tests
+- Document all public APIs
+- Use semantic versioning
+
+## Status
+- Created: {date}
+- Phase: PLANNING
+""")
+
 class ProjectCreator:
     """Create new projects from templates with type safety"""
     
@@ -42,6 +126,36 @@ class ProjectCreator:
             ProjectCategory.AUTOMATION_TOOLS.value: 'Automation and productivity tools', 
             ProjectCategory.ML_PROJECTS.value: 'Machine learning and AI projects'
         }
+        self._registry: Optional[ProjectRegistry] = None
+        self._workspace: Optional[WorkspaceIndex] = None
+        # None keeps the workspace index under ~/.cache/project-creator
+        self.workspace_index_path: Optional[Path] = None
+        # None defers to each template's .template.json (reflink with copy fallback by default)
+        self.copy_mode: Optional[str] = None
+        self.template_cache: TemplateCache = TemplateCache()
+        self.git_bootstrap: GitBootstrapper = GitBootstrapper()
+    
+    @property
+    def registry(self) -> ProjectRegistry:
+        """Registry for the current base_path, opened (and migrated from JSON) on first use"""
+        if self._registry is None or self._registry.path.parent != self.base_path:
+            if self._registry is not None:
+                self._registry.close()
+            self._registry = ProjectRegistry(self.base_path)
+        return self._registry
+    
+    @property
+    def workspace(self) -> WorkspaceIndex:
+        """Project index for the current base_path, opened on first use"""
+        if self._workspace is None or self._workspace.base_path != self.base_path:
+            if self._workspace is not None:
+                self._workspace.close()
+            self._workspace = WorkspaceIndex(
+                self.base_path,
+                [c.value for c in ProjectCategory],
+                self.workspace_index_path
+            )
+        return self._workspace
         
     def validate_category(self, category: str) -> ProjectCategory:
         """Validate and convert string to ProjectCategory enum"""
@@ -74,21 +188,7 @@ class ProjectCreator:
         print(f"📋 Template: {template}")
         print(f"📍 Location: {project_path}")
         
-        # Create directory structure
-        project_path.mkdir(parents=True, exist_ok=True)
-        
-        # Copy template files if template exists
-        template_path: Path = self.templates_path / template
-        if template_path.exists():
-            self._copy_template(template_path, project_path)
-        else:
-            self._create_default_structure(project_path)
-        
-        # Create CLAUDE.md with project info
-        self._create_claude_md(project_path, name, category_enum, description)
-        
-        # Initialize git if requested
-        self._init_git(project_path)
+        self.scaffold_project(name, category_enum, template, description)
         
         # Update registry
         self._update_registry(name, category_enum, project_path)
@@ -96,122 +196,97 @@ class ProjectCreator:
         print(f"✅ Project created successfully!")
         return project_path
     
-    def _copy_template(self, template_path: Path, project_path: Path) -> None:
-        """Copy template files to project directory"""
-        for item in template_path.iterdir():
-            if item.name == '.git':
-                continue
-            
-            dest: Path = project_path / item.name
-            if item.is_dir():
-                shutil.copytree(item, dest, dirs_exist_ok=True)
+    def scaffold_project(
+        self,
+        name: str,
+        category: ProjectCategory,
+        template: str,
+        description: str = "",
+        git_init: bool = True
+    ) -> Path:
+        """Create the project directory, files and git repository without registering it
+        
+        The directory is claimed atomically, so concurrent creators of the same
+        name fail cleanly; a partially scaffolded project is removed on error.
+        """
+        project_path: Path = self.base_path / category.value / name
+        project_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            project_path.mkdir()
+        except FileExistsError:
+            raise ValueError(f"Project already exists: {project_path}")
+        
+        variables: Dict[str, str] = self.template_variables(name, category, description)
+        try:
+            # Copy template files if template exists
+            template_path: Path = self.templates_path / template
+            if template_path.exists():
+                self._copy_template(template_path, project_path, variables)
             else:
-                shutil.copy2(item, dest)
+                self._create_default_structure(project_path, variables)
+            
+            # Create CLAUDE.md with project info
+            self._create_claude_md(project_path, variables)
+            
+            # Initialize git if requested
+            if git_init:
+                self._init_git(project_path)
+        except BaseException:
+            shutil.rmtree(project_path, ignore_errors=True)
+            raise
+        return project_path
+    
+    def template_variables(
+        self,
+        name: str,
+        category: ProjectCategory,
+        description: str = ""
+    ) -> Dict[str, str]:
+        """Values substituted for template placeholders"""
+        return {
+            'name': name,
+            'category': category.value,
+            'description': description or f"A {category.value} project",
+            'date': datetime.datetime.now().strftime('%Y-%m-%d')
+        }
     
-    def _create_default_structure(self, project_path: Path) -> None:
+    def _copy_template(
+        self,
+        template_path: Path,
+        project_path: Path,
+        variables: Dict[str, str]
+    ) -> CopyStats:
+        """Instantiate a compiled template (files marked for rendering substituted, others cloned or linked)"""
+        return self.template_cache.instantiate(template_path, project_path, variables, self.copy_mode)
+    
+    def _create_default_structure(self, project_path: Path, variables: Dict[str, str]) -> None:
         """Create default project structure"""
-        directories: List[str] = ['src', 'tests', 'docs', 'configs']
-        for dir_name in directories:
+        for dir_name in DEFAULT_DIRECTORIES:
             (project_path / dir_name).mkdir(exist_ok=True)
         
         # Create basic README
-        readme_content: str = f"""# {project_path.name}
-
-## Overview
-{project_path.name} project
-
-## Setup
-```bash
-# Installation instructions here
-```
-
-## Usage
-```bash
-# Usage examples here
-```
-
-## Development
-Created: {datetime.datetime.now().strftime('%Y-%m-%d')}
-"""
-        (project_path / 'README.md').write_text(readme_content)
+        (project_path / 'README.md').write_text(render(DEFAULT_README, variables))
     
-    def _create_claude_md(
-        self, 
-        project_path: Path, 
-        name: str, 
-        category: ProjectCategory, 
-        description: str
-    ) -> None:
+    def _create_claude_md(self, project_path: Path, variables: Dict[str, str]) -> None:
         """Create project-specific CLAUDE.md file"""
-        claude_content: str = f"""# Project: {name}
-
-## Category
-{category.value}
-
-## Description
-{description or f"A {category.value} project"}
-
-## Project Structure
-```
-{name}/
-├── src/         # Source code
-├── tests/       # Test files
-├── docs/        # Documentation
-└── configs/     # Configuration files
-```
-
-## Development Guidelines
-- Follow Python type hints for all functions
-- Write comprehensive tests
-- Document all public APIs
-- Use semantic versioning
-
-## Status
-- Created: {datetime.datetime.now().strftime('%Y-%m-%d')}
-- Phase: PLANNING
-"""
-        (project_path / 'CLAUDE.md').write_text(claude_content)
+        (project_path / 'CLAUDE.md').write_text(render(CLAUDE_MD, variables))
     
     def _init_git(self, project_path: Path) -> None:
-        """Initialize git repository"""
+        """Initialize git repository with an initial commit
+        
+        After `git init` and `git var`, the commit goes through one `git fast-import`
+        stream and `git read-tree`, unless attributes, signing, hooks or the
+        ignore rules in play need `git add`/`git commit` themselves.
+        """
         try:
-            subprocess.run(['git', 'init'], cwd=project_path, capture_output=True)
+            run_git(['init', '-q'], cwd=project_path)
             
             # Create .gitignore
-            gitignore_content: str = """# Python
-__pycache__/
-*.py[cod]
-*$py.class
-*.so
-.Python
-env/
-venv/
-.venv
-.env
-
-# IDE
-.vscode/
-.idea/
-*.swp
-*.swo
-.DS_Store
-
-# Project
-*.log
-dist/
-build/
-*.egg-info/
-.pytest_cache/
-.mypy_cache/
-"""
-            (project_path / '.gitignore').write_text(gitignore_content)
+            (project_path / '.gitignore').write_text(GITIGNORE)
             
-            subprocess.run(['git', 'add', '.'], cwd=project_path, capture_output=True)
-            subprocess.run(
-                ['git', 'commit', '-m', 'Initial commit'], 
-                cwd=project_path, 
-                capture_output=True
-            )
+            if self.git_bootstrap.bootstrap(project_path, GITIGNORE) is None:
+                run_git(['add', '.'], cwd=project_path)
+                run_git(['commit', '-q', '-m', 'Initial commit'], cwd=project_path)
         except Exception as e:
             print(f"⚠️  Git initialization failed: {e}")
     
@@ -222,20 +297,7 @@ build/
         project_path: Path
     ) -> None:
         """Update project registry"""
-        registry_file: Path = self.base_path / 'project-registry.json'
-        
-        registry: Dict[str, Any] = {}
-        if registry_file.exists():
-            registry = json.loads(registry_file.read_text())
-        
-        registry[name] = {
-            'category': category.value,
-            'path': str(project_path),
-            'created': datetime.datetime.now().isoformat(),
-            'status': 'active'
-        }
-        
-        registry_file.write_text(json.dumps(registry, indent=2))
+        self.registry.upsert(name, category.value, project_path)
     
     def list_projects(self) -> Dict[str, List[str]]:
         """List all existing projects by category"""
@@ -243,24 +305,66 @@ build/
             category.value: [] for category in ProjectCategory
         }
         
-        for category in ProjectCategory:
-            category_path: Path = self.base_path / category.value
-            if category_path.exists():
-                projects[category.value] = [
-                    p.name for p in category_path.iterdir() if p.is_dir()
-                ]
+        for project in self.scan_projects():
+            projects[project.category].append(project.name)
         
         return projects
     
-    def get_project_info(self, name: str) -> Optional[Dict[str, Any]]:
-        """Get information about a specific project"""
-        registry_file: Path = self.base_path / 'project-registry.json'
+    def scan_projects(
+        self,
+        category: Optional[str] = None,
+        project_type: Optional[str] = None,
+        sort: str = 'name',
+        refresh: bool = False
+    ) -> List[WorkspaceProject]:
+        """Projects on disk from the workspace index, with detected types, git and size
         
-        if not registry_file.exists():
-            return None
+        Categories whose directory changed are re-listed first, so created and
+        removed projects show up; `refresh` also rescans every project's contents.
+        """
+        if category is not None:
+            category = self.validate_category(category).value
+        self.workspace.refresh(deep=refresh)
+        return self.workspace.projects(category, project_type, sort)
+    
+    def refresh_workspace(self) -> RefreshStats:
+        """Rescan the workspace, re-listing only directories that changed"""
+        return self.workspace.refresh(deep=True)
+    
+    def get_project_info(self, name: str, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """Get information about a specific project
         
-        registry: Dict[str, Any] = json.loads(registry_file.read_text())
-        return registry.get(name)
+        Registry fields, plus what the workspace index knows about the project
+        directory when it exists; `refresh` rescans every project's contents first.
+        """
+        info: Optional[Dict[str, Any]] = self.registry.get(name)
+        self.workspace.refresh(deep=refresh)
+        found: List[WorkspaceProject] = self.workspace.get(name)
+        if info is not None:
+            # Prefer the directory in the registered category
+            found.sort(key=lambda project: project.category != info['category'])
+        if not found:
+            return info
+        project: WorkspaceProject = found[0]
+        details: Dict[str, Any] = dict(info or {'category': project.category, 'path': project.path})
+        details.update(
+            types=', '.join(project.types) or 'NONE',
+            git=project.git,
+            size_mb=round(project.size / (1024 * 1024), 2),
+            files=project.files,
+            modified=datetime.datetime.fromtimestamp(project.modified).isoformat(timespec='seconds')
+        )
+        return details
+    
+    def find_projects(
+        self,
+        category: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Registered projects filtered by category and/or status"""
+        if category is not None:
+            category = self.validate_category(category).value
+        return self.registry.find(category, status)
 
 def main() -> None:
     """Main entry point with type-safe argument parsing"""
@@ -292,17 +396,94 @@ def main() -> None:
         default='',
         help='Project description'
     )
+    create_parser.add_argument(
+        '--copy-mode',
+        type=str,
+        choices=COPY_MODES,
+        help='Override how template files are copied (default: per template, reflink)'
+    )
+    
+    # Batch command
+    batch_parser = subparsers.add_parser('create-batch', help='Create many projects from a manifest')
+    batch_parser.add_argument('manifest', type=Path, help='JSON or YAML manifest of projects')
+    batch_parser.add_argument(
+        '--workers',
+        type=int,
+        default=8,
+        help='Projects scaffolded concurrently'
+    )
+    batch_parser.add_argument('--json', action='store_true', help='Output results as JSON')
+    batch_parser.add_argument(
+        '--copy-mode',
+        type=str,
+        choices=COPY_MODES,
+        help='Override how template files are copied (default: per template, reflink)'
+    )
     
     # List command
-    subparsers.add_parser('list', help='List all projects')
+    list_parser = subparsers.add_parser('list', help='List all projects')
+    list_parser.add_argument(
+        '--category',
+        type=str,
+        choices=[c.value for c in ProjectCategory],
+        help='Only projects in this category'
+    )
+    list_parser.add_argument(
+        '--type',
+        type=str,
+        choices=PROJECT_TYPES,
+        help='Only projects of this detected type'
+    )
+    list_parser.add_argument(
+        '--sort',
+        type=str,
+        choices=list(SORT_ORDERS),
+        default='name',
+        help='Order within each category'
+    )
+    list_parser.add_argument('-l', '--long', action='store_true', help='Show types, git and size')
+    list_parser.add_argument('--json', action='store_true', help='Output projects as JSON')
+    list_parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Rescan every project instead of only changed categories'
+    )
     
     # Info command
     info_parser = subparsers.add_parser('info', help='Get project information')
     info_parser.add_argument('name', type=str, help='Project name')
+    info_parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Rescan every project instead of only changed categories'
+    )
+    
+    # Registry command
+    registry_parser = subparsers.add_parser('registry', help='Query or import the project registry')
+    registry_parser.add_argument(
+        '--category',
+        type=str,
+        choices=[c.value for c in ProjectCategory],
+        help='Only projects in this category'
+    )
+    registry_parser.add_argument('--status', type=str, help='Only projects with this status')
+    registry_parser.add_argument(
+        '--import-json',
+        type=Path,
+        metavar='FILE',
+        help='Merge a project-registry.json file into the registry'
+    )
+    registry_parser.add_argument(
+        '--set-status',
+        nargs=2,
+        metavar=('NAME', 'STATUS'),
+        help='Change the status of a registered project'
+    )
     
     args = parser.parse_args()
     
     creator = ProjectCreator()
+    creator.copy_mode = getattr(args, 'copy_mode', None)
     
     if args.command == 'create':
         try:
@@ -317,16 +498,66 @@ def main() -> None:
             print(f"❌ Error: {e}")
             exit(1)
     
+    elif args.command == 'create-batch':
+        from creator.batch import create_batch, load_manifest
+        
+        try:
+            configs: List[ProjectConfig] = load_manifest(args.manifest, creator)
+        except (OSError, ValueError) as e:
+            print(f"❌ Error: {e}")
+            exit(1)
+        
+        started: float = time.perf_counter()
+        results, registry_seconds = create_batch(creator, configs, args.workers)
+        elapsed: float = time.perf_counter() - started
+        failures: int = sum(1 for result in results if not result.ok)
+        
+        if args.json:
+            print(json.dumps({
+                'projects': [asdict(result) for result in results],
+                'created': len(results) - failures,
+                'failed': failures,
+                'registry_seconds': round(registry_seconds, 4),
+                'seconds': round(elapsed, 4)
+            }, indent=2))
+        else:
+            for result in results:
+                if result.ok:
+                    print(f"  ✅ {result.name} ({result.seconds:.2f}s) {result.path}")
+                else:
+                    print(f"  ❌ {result.name} ({result.seconds:.2f}s) {result.error}")
+            print(f"\n📦 {len(results) - failures} created, {failures} failed in {elapsed:.2f}s "
+                  f"(registry {registry_seconds:.3f}s)")
+        if failures:
+            exit(1)
+    
     elif args.command == 'list':
-        projects: Dict[str, List[str]] = creator.list_projects()
-        for category, project_list in projects.items():
-            if project_list:
+        scanned: List[WorkspaceProject] = creator.scan_projects(
+            args.category,
+            args.type,
+            args.sort,
+            args.refresh
+        )
+        if args.json:
+            print(json.dumps([asdict(project) for project in scanned], indent=2))
+        else:
+            projects: Dict[str, List[WorkspaceProject]] = {c.value: [] for c in ProjectCategory}
+            for project in scanned:
+                projects[project.category].append(project)
+            for category, project_list in projects.items():
+                if not project_list:
+                    continue
                 print(f"\n📁 {category}:")
                 for project in project_list:
-                    print(f"  • {project}")
+                    if args.long:
+                        print(f"  • {project.name} [{', '.join(project.types) or 'NONE'}] "
+                              f"{'🔧 Git' if project.git else '⚠️  No Git'} | "
+                              f"{project.size / (1024 * 1024):.2f}MB | {project.files} files")
+                    else:
+                        print(f"  • {project.name}")
     
     elif args.command == 'info':
-        info: Optional[Dict[str, Any]] = creator.get_project_info(args.name)
+        info: Optional[Dict[str, Any]] = creator.get_project_info(args.name, args.refresh)
         if info:
             print(f"\n📋 Project: {args.name}")
             for key, value in info.items():
@@ -334,6 +565,18 @@ def main() -> None:
         else:
             print(f"❌ Project not found: {args.name}")
     
+    elif args.command == 'registry':
+        if args.import_json:
+            count: int = creator.registry.import_json(args.import_json)
+            print(f"📥 Imported {count} entries from {args.import_json}")
+        if args.set_status:
+            if not creator.registry.set_status(*args.set_status):
+                print(f"❌ Project not found: {args.set_status[0]}")
+                exit(1)
+        matches: Dict[str, Dict[str, Any]] = creator.find_projects(args.category, args.status)
+        for project_name, entry in matches.items():
+            print(f"  • {project_name} [{entry['category']}, {entry['status']}] {entry['path']}")
+    
     else:
         parser.print_help()
 
@@ -0,0 +1,108 @@
+"""
+Bulk project creation from a manifest
+Scaffolds projects concurrently and registers every success in one transaction;
+a failing project is reported without aborting the rest of the batch
+"""
+
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+
+from health.pool import run_bounded
+
+if TYPE_CHECKING:
+    from create_project import ProjectConfig, ProjectCreator
+
+@dataclass
+class BatchResult:
+    """Outcome of one manifest entry"""
+    name: str
+    category: str
+    path: Optional[str] = None
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+def load_manifest(path: Path, creator: 'ProjectCreator') -> List['ProjectConfig']:
+    """Parse a JSON or YAML manifest into project configs
+
+    The manifest is either a list of projects or a mapping with optional
+    `defaults` and a `projects` list; each project needs at least a name.
+    """
+    from create_project import ProjectConfig
+
+    text: str = path.read_text()
+    data: Any
+    if path.suffix in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("YAML manifests need PyYAML (pip install pyyaml); use JSON otherwise")
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+
+    defaults: Dict[str, Any] = {}
+    if isinstance(data, dict):
+        defaults = data.get('defaults') or {}
+        data = data.get('projects')
+    if not isinstance(data, list):
+        raise ValueError(f"Manifest {path} must contain a list of projects")
+
+    configs: List[ProjectConfig] = []
+    seen: Set[str] = set()
+    for index, entry in enumerate(data):
+        if not isinstance(entry, dict) or not entry.get('name'):
+            raise ValueError(f"Manifest entry {index} has no name")
+        merged: Dict[str, Any] = dict(defaults, **entry)
+        if merged['name'] in seen:
+            raise ValueError(f"Duplicate project name in manifest: {merged['name']}")
+        seen.add(merged['name'])
+        if 'category' not in merged:
+            raise ValueError(f"Manifest entry {merged['name']} has no category")
+        configs.append(ProjectConfig(
+            name=str(merged['name']),
+            category=creator.validate_category(merged['category']),
+            template=str(merged.get('template', 'default')),
+            description=str(merged.get('description', '')),
+            git_init=bool(merged.get('git_init', True)),
+            create_readme=bool(merged.get('create_readme', True))
+        ))
+    return configs
+
+def create_batch(
+    creator: 'ProjectCreator',
+    configs: List['ProjectConfig'],
+    workers: int = 8
+) -> Tuple[List[BatchResult], float]:
+    """Scaffold every project in a worker pool, then register the successes together
+
+    Returns the per-project results and the seconds spent in the registry transaction.
+    """
+    def scaffold(config: 'ProjectConfig') -> Path:
+        return creator.scaffold_project(
+            config.name, config.category, config.template, config.description, config.git_init
+        )
+
+    outcomes = run_bounded(scaffold, configs, workers)
+
+    results: List[BatchResult] = []
+    registered: List[Tuple[str, str, Path, str, Optional[str]]] = []
+    for outcome in outcomes:
+        config = outcome.item
+        result = BatchResult(name=config.name, category=config.category.value, seconds=round(outcome.seconds, 4))
+        if outcome.value is None:
+            result.error = str(outcome.error) if outcome.error else 'scaffolding failed'
+        else:
+            result.path = str(outcome.value)
+            registered.append((config.name, config.category.value, outcome.value, 'active', None))
+        results.append(result)
+
+    start: float = time.perf_counter()
+    creator.registry.upsert_many(registered)
+    return results, time.perf_counter() - start
@@ -0,0 +1,157 @@
+"""
+Template instantiation without duplicating data
+Clones files copy-on-write (FICLONE on Linux, clonefile on macOS) where the
+filesystem supports it, hardlinks read-only assets a template opts into and
+falls back to a plain buffered copy everywhere else
+"""
+
+import ctypes
+import errno
+import fcntl
+import fnmatch
+import json
+import os
+import shutil
+import stat
+import sys
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Set, Tuple
+
+# Per-template settings, read from the template root and never copied
+TEMPLATE_CONFIG: str = '.template.json'
+
+COPY_MODES: List[str] = ['reflink', 'copy']
+
+# _IOW(0x94, 9, int) from linux/fs.h
+FICLONE: int = 0x40049409
+
+# errnos meaning "this filesystem (pair) can't clone", as opposed to real I/O errors
+CLONE_UNSUPPORTED = frozenset({
+    errno.EOPNOTSUPP, errno.ENOTSUP, errno.EXDEV, errno.EINVAL, errno.ENOTTY, errno.ENOSYS
+})
+
+@dataclass
+class TemplateOptions:
+    """How a template's files are instantiated"""
+    mode: str = 'reflink'
+    # Files matching these are hardlinked and made read-only, since the template
+    # and every project share one inode; edit them by replacing, not in place
+    hardlink: List[str] = field(default_factory=list)
+    # Text files matching these have {name}, {category}, {description} and {date}
+    # replaced, with {{name}} (and so on) for a literal {name}; every other file
+    # is placed byte for byte
+    render: List[str] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, template_path: Path) -> 'TemplateOptions':
+        try:
+            data: Dict[str, Any] = json.loads((template_path / TEMPLATE_CONFIG).read_text())
+        except (OSError, ValueError):
+            return cls()
+        mode: str = data.get('mode', 'reflink')
+        if mode not in COPY_MODES:
+            raise ValueError(f"{template_path / TEMPLATE_CONFIG}: mode must be one of {COPY_MODES}")
+        return cls(
+            mode=mode,
+            hardlink=list(data.get('hardlink', [])),
+            render=list(data.get('render', []))
+        )
+
+    def links(self, relative: str) -> bool:
+        return any(fnmatch.fnmatch(relative, pattern) for pattern in self.hardlink)
+
+    def renders(self, relative: str) -> bool:
+        return any(fnmatch.fnmatch(relative, pattern) for pattern in self.render)
+
+@dataclass
+class CopyStats:
+    """What instantiating one template did"""
+    files: int = 0
+    bytes_copied: int = 0
+    bytes_cloned: int = 0
+    bytes_linked: int = 0
+
+# (source device, destination device) pairs already known not to clone
+_unsupported: Set[Tuple[int, int]] = set()
+_unsupported_lock = threading.Lock()
+
+def _clonefile_function() -> Any:
+    """libc clonefile(2) on macOS, None elsewhere"""
+    function: Any = None
+    if sys.platform == 'darwin':
+        try:
+            function = ctypes.CDLL(None, use_errno=True).clonefile
+            function.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32]
+            function.restype = ctypes.c_int
+        except (OSError, AttributeError):
+            function = None
+    return function
+
+_clonefile = _clonefile_function()
+
+def clone_file(source: Path, dest: Path) -> bool:
+    """Copy-on-write clone of source to a new file at dest; False if unsupported"""
+    if _clonefile is not None:
+        if _clonefile(os.fsencode(source), os.fsencode(dest), 0) == 0:
+            return True
+        code: int = ctypes.get_errno()
+        if code in CLONE_UNSUPPORTED:
+            return False
+        raise OSError(code, os.strerror(code), str(dest))
+
+    if not hasattr(fcntl, 'ioctl') or not sys.platform.startswith('linux'):
+        return False
+    with open(source, 'rb') as src, open(dest, 'wb') as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return True
+        except OSError as e:
+            if e.errno in CLONE_UNSUPPORTED:
+                return False
+            raise
+
+def place_file(
+    source: str,
+    dest: str,
+    size: int,
+    relative: str,
+    devices: Tuple[int, int],
+    options: TemplateOptions,
+    stats: CopyStats
+) -> None:
+    """Hardlink, clone or copy one file, falling back in that order"""
+    if options.hardlink and options.links(relative):
+        try:
+            try:
+                os.link(source, dest)
+            except FileExistsError:
+                os.unlink(dest)
+                os.link(source, dest)
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+                raise
+        else:
+            # A write through any link would change the template and every other project
+            mode: int = os.stat(dest).st_mode
+            if mode & 0o222:
+                os.chmod(dest, stat.S_IMODE(mode) & ~0o222)
+            stats.bytes_linked += size
+            return
+
+    if options.mode == 'reflink':
+        with _unsupported_lock:
+            known_unsupported: bool = devices in _unsupported
+        if not known_unsupported:
+            if os.path.lexists(dest) and _clonefile is not None:
+                os.unlink(dest)
+            if clone_file(Path(source), Path(dest)):
+                shutil.copystat(source, dest)
+                stats.bytes_cloned += size
+                return
+            with _unsupported_lock:
+                _unsupported.add(devices)
+
+    shutil.copy2(source, dest)
+    stats.bytes_copied += size
@@ -0,0 +1,251 @@
+"""
+Fast initial commit for new projects
+After `git init` and one `git var -l` for the repository's settings, the files,
+tree and commit go to git in a single `git fast-import` stream and `git
+read-tree` fills the index, so git's own object, ref and reflog writers do the
+work whatever the repository's formats. Anything that would make `git
+add`/`git commit` do more than store the files as they are (attributes and
+filters, signing, hooks, line-ending conversion) sends the caller back to plain
+git. Blob ids are cached per process, so a template file shared by many
+projects in a batch is hashed once and sent once per stream.
+"""
+
+import fnmatch
+import hashlib
+import os
+import subprocess
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Hook names `git commit` runs; any of them installed means git must make the commit
+COMMIT_HOOKS: List[str] = ['pre-commit', 'prepare-commit-msg', 'commit-msg', 'post-commit']
+
+TRUE_VALUES = frozenset({'true', 'yes', 'on', '1'})
+
+class GitBootstrapError(RuntimeError):
+    """A git step failed; the message carries git's own error output"""
+
+def run_git(args: List[str], cwd: Optional[Path] = None, stdin: Optional[bytes] = None) -> str:
+    """Run git, raising GitBootstrapError with its stderr on a non-zero exit"""
+    try:
+        completed = subprocess.run(['git'] + args, cwd=cwd, input=stdin, capture_output=True)
+    except OSError as e:
+        raise GitBootstrapError(f"git {args[0]}: {e}")
+    stdout: str = completed.stdout.decode(errors='replace')
+    if completed.returncode != 0:
+        detail: str = (completed.stderr.decode(errors='replace') or stdout).strip()
+        raise GitBootstrapError(f"git {args[0]} failed ({completed.returncode}): {detail}")
+    return stdout
+
+def quote_path(path: bytes) -> bytes:
+    """A path as fast-import reads it: C-quoted only when it starts with a quote or holds a newline"""
+    if not path.startswith(b'"') and b'\n' not in path:
+        return path
+    return b'"' + path.replace(b'\\', b'\\\\').replace(b'"', b'\\"').replace(b'\n', b'\\n') + b'"'
+
+@dataclass
+class IgnoreRules:
+    """The subset of .gitignore syntax the fast path evaluates itself
+
+    Only slash-free patterns (optionally ending in '/' for directories) are
+    supported; they match a basename at any depth, exactly as git applies them.
+    """
+    patterns: List[Tuple[str, bool]] = field(default_factory=list)
+    supported: bool = True
+
+    @classmethod
+    def parse(cls, text: str) -> 'IgnoreRules':
+        rules = cls()
+        for raw in text.splitlines():
+            line: str = raw.strip()
+            if not line or line.startswith('#'):
+                continue
+            directory_only: bool = line.endswith('/')
+            pattern: str = line.rstrip('/')
+            if line.startswith('!') or '/' in pattern or '\\' in pattern or '**' in pattern:
+                rules.supported = False
+            rules.patterns.append((pattern, directory_only))
+        return rules
+
+    def ignores(self, name: str, is_dir: bool) -> bool:
+        return any(
+            fnmatch.fnmatchcase(name, pattern) and (is_dir or not directory_only)
+            for pattern, directory_only in self.patterns
+        )
+
+@dataclass
+class StagedFile:
+    """One file `git add .` would stage"""
+    path: bytes
+    mode: int
+    source: str
+    st: os.stat_result
+
+class GitBootstrapper:
+    """Creates a repository with one initial commit of a project's files"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # (dev, ino, size, mtime_ns) -> SHA-1 blob id, for files shared via hardlink; only used
+        # to send each blob once, so it holds whatever the repository's object format
+        self._blob_ids: Dict[Tuple[int, int, int, int], bytes] = {}
+
+    def _settings(self, project_path: Path) -> Dict[str, str]:
+        """Effective config and identities for one repository, as git itself resolves them
+
+        Runs in the project so includeIf "gitdir:" sections apply; config keys
+        are lower-cased, the last value of a repeated key wins.
+        """
+        settings: Dict[str, str] = {}
+        for line in run_git(['var', '-l'], cwd=project_path).splitlines():
+            key, sep, value = line.partition('=')
+            if sep:
+                settings[key if key.startswith('GIT_') else key.lower()] = value
+        return settings
+
+    def _needs_git(self, project_path: Path, settings: Dict[str, str]) -> Optional[str]:
+        """Why `git add`/`git commit` must do the commit, or None if writing it directly is exact"""
+        git_dir: Path = project_path / '.git'
+        config_home: Path = Path(os.environ.get('XDG_CONFIG_HOME') or Path.home() / '.config') / 'git'
+        if 'GIT_AUTHOR_IDENT' not in settings or 'GIT_COMMITTER_IDENT' not in settings:
+            return 'identity'
+        if settings.get('commit.gpgsign', '').lower() in TRUE_VALUES:
+            return 'commit signing'
+        if settings.get('core.autocrlf', 'false').lower() != 'false':
+            return 'line-ending conversion'
+        if settings.get('core.filemode', 'true').lower() not in TRUE_VALUES:
+            return 'core.fileMode'
+        if settings.get('core.symlinks', 'true').lower() not in TRUE_VALUES:
+            return 'core.symlinks'
+        if settings.get('i18n.commitencoding', 'utf-8').lower() not in ('utf-8', 'utf8'):
+            return 'commit encoding'
+        if 'core.hookspath' in settings or any((git_dir / 'hooks' / hook).exists() for hook in COMMIT_HOOKS):
+            return 'hooks'
+        if settings.get('core.excludesfile') or (config_home / 'ignore').exists():
+            return 'global excludes'
+        if settings.get('core.attributesfile') or (config_home / 'attributes').exists():
+            return 'global attributes'
+        if Path('/etc/gitattributes').exists() or (git_dir / 'info' / 'attributes').exists():
+            return 'attributes'
+        try:
+            excludes: str = (git_dir / 'info' / 'exclude').read_text()
+        except OSError:
+            excludes = ''
+        if any(line.strip() and not line.startswith('#') for line in excludes.splitlines()):
+            return 'info/exclude'
+        return None
+
+    def _collect(self, root: str, rules: IgnoreRules) -> Optional[List[StagedFile]]:
+        """Every file `git add .` would stage, sorted by path
+
+        None if a .gitattributes (filters, eol) or nested .gitignore needs git itself.
+        """
+        files: List[StagedFile] = []
+        stack: List[Tuple[str, bytes]] = [(root, b'')]
+        while stack:
+            directory, prefix = stack.pop()
+            with os.scandir(directory) as items:
+                for item in items:
+                    if not prefix and item.name == '.git':
+                        continue
+                    is_dir: bool = item.is_dir(follow_symlinks=False)
+                    if rules.ignores(item.name, is_dir):
+                        continue
+                    relative: bytes = prefix + os.fsencode(item.name)
+                    if is_dir:
+                        stack.append((item.path, relative + b'/'))
+                        continue
+                    if item.name == '.gitattributes' or (prefix and item.name == '.gitignore'):
+                        return None
+                    st = item.stat(follow_symlinks=False)
+                    if item.is_symlink():
+                        mode: int = 0o120000
+                    else:
+                        mode = 0o100755 if st.st_mode & 0o100 else 0o100644
+                    files.append(StagedFile(relative, mode, item.path, st))
+        files.sort(key=lambda staged: staged.path)
+        return files
+
+    def _blobs(self, files: List[StagedFile]) -> Tuple[List[bytes], List[int]]:
+        """fast-import blob commands for the files and each file's mark
+
+        A file whose id is already known (a hardlinked template asset seen in an
+        earlier project, or identical content earlier in this one) is sent once.
+        """
+        chunks: List[bytes] = []
+        marks: Dict[bytes, int] = {}
+        file_marks: List[int] = []
+        for staged in files:
+            st: os.stat_result = staged.st
+            key: Tuple[int, int, int, int] = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+            is_link: bool = staged.mode == 0o120000
+            with self._lock:
+                blob_id: Optional[bytes] = None if is_link else self._blob_ids.get(key)
+            if blob_id is not None and blob_id in marks:
+                file_marks.append(marks[blob_id])
+                continue
+
+            if is_link:
+                data: bytes = os.fsencode(os.readlink(staged.source))
+            else:
+                with open(staged.source, 'rb') as handle:
+                    data = handle.read()
+            if blob_id is None:
+                blob_id = hashlib.sha1(b'blob %d\0' % len(data) + data).digest()
+                if not is_link:
+                    with self._lock:
+                        self._blob_ids[key] = blob_id
+            if blob_id not in marks:
+                marks[blob_id] = len(marks) + 1
+                chunks += [b'blob\nmark :%d\ndata %d\n' % (marks[blob_id], len(data)), data, b'\n']
+            file_marks.append(marks[blob_id])
+        return chunks, file_marks
+
+    def _branch(self, project_path: Path) -> str:
+        """The ref HEAD points at in a new repository"""
+        try:
+            head: str = (project_path / '.git' / 'HEAD').read_text().strip()
+        except OSError:
+            head = ''
+        # Ref backends other than files (reftable) leave a placeholder in .git/HEAD
+        if head.startswith('ref: refs/heads/') and head != 'ref: refs/heads/.invalid':
+            return head[5:]
+        return run_git(['symbolic-ref', 'HEAD'], cwd=project_path).strip()
+
+    def bootstrap(self, project_path: Path, ignore_text: str, message: str = 'Initial commit') -> Optional[str]:
+        """Commit every non-ignored file of an initialised repository; returns the commit id
+
+        Expects `git init` to have run and .gitignore to contain `ignore_text`.
+        Returns None without committing when git would do more than store the
+        files as they are (see _needs_git) or the ignore rules in play are beyond
+        what this path evaluates (negations, nested .gitignore); the caller
+        should then use `git add` and `git commit`.
+        """
+        rules: IgnoreRules = IgnoreRules.parse(ignore_text)
+        if not rules.supported:
+            return None
+        settings: Dict[str, str] = self._settings(project_path)
+        if self._needs_git(project_path, settings) is not None:
+            return None
+        files: Optional[List[StagedFile]] = self._collect(str(project_path), rules)
+        if files is None:
+            return None
+
+        stream, file_marks = self._blobs(files)
+        commit_mark: int = max(file_marks, default=0) + 1
+        text: bytes = f'{message}\n'.encode()
+        # `git var` identities already carry the timestamp and zone (and honour GIT_*_DATE)
+        stream.append((
+            f'commit {self._branch(project_path)}\nmark :{commit_mark}\n'
+            f"author {settings['GIT_AUTHOR_IDENT']}\ncommitter {settings['GIT_COMMITTER_IDENT']}\n"
+        ).encode() + b'data %d\n' % len(text) + text)
+        stream += [b'M %o :%d %s\n' % (staged.mode, mark, quote_path(staged.path))
+                   for staged, mark in zip(files, file_marks)]
+        stream.append(b'\nget-mark :%d\ndone\n' % commit_mark)
+
+        commit: str = run_git(['fast-import', '--quiet', '--done'], cwd=project_path, stdin=b''.join(stream)).strip()
+        # fast-import leaves the index alone; the next `git status` fills in the stat data
+        run_git(['read-tree', commit], cwd=project_path)
+        return commit
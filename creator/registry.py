@@ -0,0 +1,155 @@
+"""
+SQLite project registry
+Atomic upserts and indexed lookups by name, category and status, safe for
+several creators writing at once; imports the legacy project-registry.json
+"""
+
+import datetime
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+REGISTRY_DB: str = 'project-registry.sqlite3'
+LEGACY_REGISTRY: str = 'project-registry.json'
+
+# user_version 1 means the legacy JSON registry has been imported
+SCHEMA_VERSION: int = 1
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS projects (
+    name TEXT PRIMARY KEY,
+    category TEXT NOT NULL,
+    path TEXT NOT NULL,
+    created TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_projects_category ON projects(category, name);
+CREATE INDEX IF NOT EXISTS idx_projects_status ON projects(status, name);
+"""
+
+Row = Tuple[str, str, str, str, str]
+
+def _entry(row: Row) -> Dict[str, Any]:
+    """Registry entry in the shape the JSON registry used"""
+    _, category, path, created, status = row
+    return {'category': category, 'path': path, 'created': created, 'status': status}
+
+class ProjectRegistry:
+    """Project registry stored next to the projects as project-registry.sqlite3"""
+
+    def __init__(self, base_path: Path) -> None:
+        self.path: Path = base_path / REGISTRY_DB
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # A generous busy timeout lets concurrent creators queue instead of failing
+        self._conn = sqlite3.connect(str(self.path), timeout=30.0, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+        self._migrate(base_path / LEGACY_REGISTRY)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _migrate(self, legacy: Path) -> None:
+        """Import the JSON registry once, in the same transaction that bumps user_version"""
+        with self._lock:
+            if self._conn.execute('PRAGMA user_version').fetchone()[0] >= SCHEMA_VERSION:
+                return
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                # Another process may have migrated while we waited for the write lock
+                if self._conn.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION:
+                    self._import(legacy)
+                    self._conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def _import(self, legacy: Path) -> int:
+        try:
+            registry: Dict[str, Any] = json.loads(legacy.read_text())
+        except (OSError, ValueError):
+            return 0
+        rows: List[Row] = [
+            (
+                name,
+                entry.get('category', ''),
+                entry.get('path', ''),
+                entry.get('created', ''),
+                entry.get('status', 'active')
+            )
+            for name, entry in registry.items() if isinstance(entry, dict)
+        ]
+        self._conn.executemany(
+            'INSERT OR IGNORE INTO projects (name, category, path, created, status) VALUES (?, ?, ?, ?, ?)',
+            rows
+        )
+        return len(rows)
+
+    def import_json(self, legacy: Path) -> int:
+        """Merge a JSON registry file; names already registered are kept"""
+        with self._lock, self._conn:
+            return self._import(legacy)
+
+    def upsert(
+        self,
+        name: str,
+        category: str,
+        path: Path,
+        status: str = 'active',
+        created: Optional[str] = None
+    ) -> None:
+        """Insert or update one project; an existing entry keeps its creation time"""
+        self.upsert_many([(name, category, path, status, created)])
+
+    def upsert_many(self, projects: List[Tuple[str, str, Path, str, Optional[str]]]) -> None:
+        """Upsert several projects in a single transaction"""
+        now: str = datetime.datetime.now().isoformat()
+        rows: List[Row] = [
+            (name, category, str(path), created or now, status)
+            for name, category, path, status, created in projects
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT INTO projects (name, category, path, created, status) VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT(name) DO UPDATE SET '
+                'category = excluded.category, path = excluded.path, status = excluded.status',
+                rows
+            )
+
+    def set_status(self, name: str, status: str) -> bool:
+        """Change a project's status; False if it is not registered"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute('UPDATE projects SET status = ? WHERE name = ?', (status, name))
+        return cursor.rowcount > 0
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row: Optional[Row] = self._conn.execute(
+                'SELECT name, category, path, created, status FROM projects WHERE name = ?', (name,)
+            ).fetchone()
+        return _entry(row) if row else None
+
+    def find(self, category: Optional[str] = None, status: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Projects matching every given filter, by name"""
+        clauses: List[str] = []
+        params: List[str] = []
+        if category is not None:
+            clauses.append('category = ?')
+            params.append(category)
+        if status is not None:
+            clauses.append('status = ?')
+            params.append(status)
+        where: str = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        with self._lock:
+            rows: List[Row] = self._conn.execute(
+                f'SELECT name, category, path, created, status FROM projects {where} ORDER BY name', params
+            ).fetchall()
+        return {row[0]: _entry(row) for row in rows}
+
+    def count(self) -> int:
+        with self._lock:
+            return int(self._conn.execute('SELECT COUNT(*) FROM projects').fetchone()[0])
@@ -0,0 +1,235 @@
+"""
+Compiled project templates
+A template directory is walked and parsed once into a manifest of directories,
+files, modes and the placeholder segments of files its .template.json lists
+under "render", cached on disk and revalidated by stat;
+instantiation is then a single pass of writes, clones and links
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from creator.clone import TEMPLATE_CONFIG, CopyStats, TemplateOptions, place_file
+
+DEFAULT_CACHE_DIR: Path = Path.home() / '.cache' / 'project-creator' / 'templates'
+
+# Bump when the manifest layout or parsing changes so stale caches are recompiled
+MANIFEST_VERSION: int = 3
+
+PLACEHOLDERS: Tuple[str, ...] = ('name', 'category', 'description', 'date')
+# {name}, or the escape {{name}} (group 1 set) for a literal {name}
+PLACEHOLDER_RE = re.compile(r'\{(\{)?(' + '|'.join(PLACEHOLDERS) + r')\}(?(1)\})')
+
+# Larger files are always placed verbatim rather than parsed
+MAX_RENDER_BYTES: int = 1024 * 1024
+
+def parse_placeholders(text: str) -> List[str]:
+    """Split text into alternating literal and placeholder-name segments
+
+    A doubled placeholder such as {{name}} is unescaped to a literal {name}.
+    """
+    segments: List[str] = []
+    literal: List[str] = []
+    position: int = 0
+    for match in PLACEHOLDER_RE.finditer(text):
+        literal.append(text[position:match.start()])
+        if match.group(1):
+            literal.append('{' + match.group(2) + '}')
+        else:
+            segments += [''.join(literal), match.group(2)]
+            literal = []
+        position = match.end()
+    literal.append(text[position:])
+    segments.append(''.join(literal))
+    return segments
+
+def render(segments: List[str], variables: Dict[str, str]) -> str:
+    return ''.join(
+        segment if index % 2 == 0 else variables[segment]
+        for index, segment in enumerate(segments)
+    )
+
+@dataclass
+class TemplateFile:
+    """One file of a compiled template; segments is None for verbatim files"""
+    path: str
+    mode: int
+    segments: Optional[List[str]] = None
+
+@dataclass
+class CompiledTemplate:
+    """Everything needed to instantiate a template without touching its directory tree"""
+    root: str
+    options: Dict[str, Any]
+    dirs: List[Tuple[str, int]] = field(default_factory=list)
+    files: List[TemplateFile] = field(default_factory=list)
+    # (relative path, mtime_ns, size) of every entry, used to detect edits;
+    # directories record size -1 since only their mtime tracks added/removed entries
+    signature: List[Tuple[str, int, int]] = field(default_factory=list)
+
+    def is_current(self) -> bool:
+        """True while every recorded entry still has the mtime and size it was compiled with"""
+        for relative, mtime_ns, size in self.signature:
+            try:
+                st = os.stat(os.path.join(self.root, relative))
+            except OSError:
+                return False
+            if st.st_mtime_ns != mtime_ns or (size >= 0 and st.st_size != size):
+                return False
+        return True
+
+def _text_segments(path: str, size: int, options: TemplateOptions, relative: str) -> Optional[List[str]]:
+    """Placeholder segments of a file the template marks for rendering, or None to place it verbatim"""
+    if size > MAX_RENDER_BYTES or options.links(relative) or not options.renders(relative):
+        return None
+    with open(path, 'rb') as handle:
+        raw: bytes = handle.read()
+    if b'\0' in raw:
+        return None
+    try:
+        text: str = raw.decode('utf-8')
+    except UnicodeDecodeError:
+        return None
+    segments: List[str] = parse_placeholders(text)
+    # Files whose only placeholders are escaped still need rendering to unescape them
+    return segments if len(segments) > 1 or segments[0] != text else None
+
+def compile_template(template_path: Path) -> CompiledTemplate:
+    """Walk and parse a template directory"""
+    options: TemplateOptions = TemplateOptions.load(template_path)
+    root: str = str(template_path)
+    compiled = CompiledTemplate(root=root, options=asdict(options))
+
+    root_stat = os.stat(root)
+    compiled.signature.append(('', root_stat.st_mtime_ns, -1))
+    config: str = os.path.join(root, TEMPLATE_CONFIG)
+    if os.path.exists(config):
+        config_stat = os.stat(config)
+        compiled.signature.append((TEMPLATE_CONFIG, config_stat.st_mtime_ns, config_stat.st_size))
+
+    stack: List[str] = ['']
+    while stack:
+        relative_dir: str = stack.pop()
+        with os.scandir(os.path.join(root, relative_dir)) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                if not relative_dir and entry.name in ('.git', TEMPLATE_CONFIG):
+                    continue
+                relative: str = f'{relative_dir}{entry.name}'
+                st = entry.stat()
+                if entry.is_dir():
+                    compiled.dirs.append((relative, st.st_mode & 0o7777))
+                    compiled.signature.append((relative, st.st_mtime_ns, -1))
+                    stack.append(relative + '/')
+                else:
+                    compiled.files.append(TemplateFile(
+                        path=relative,
+                        mode=st.st_mode & 0o7777,
+                        segments=_text_segments(entry.path, st.st_size, options, relative)
+                    ))
+                    compiled.signature.append((relative, st.st_mtime_ns, st.st_size))
+    compiled.dirs.sort()
+    return compiled
+
+class TemplateCache:
+    """Compiled templates kept in memory and in one JSON manifest per template on disk"""
+
+    def __init__(self, path: Optional[Path] = DEFAULT_CACHE_DIR) -> None:
+        self.path: Optional[Path] = path
+        self._compiled: Dict[str, CompiledTemplate] = {}
+        self._lock = threading.Lock()
+        self.compiles: int = 0
+
+    def _manifest_path(self, template_path: Path) -> Optional[Path]:
+        if self.path is None:
+            return None
+        digest: str = hashlib.sha256(str(template_path).encode()).hexdigest()[:24]
+        return self.path / f'{digest}.json'
+
+    def _load(self, template_path: Path) -> Optional[CompiledTemplate]:
+        manifest_path: Optional[Path] = self._manifest_path(template_path)
+        if manifest_path is None:
+            return None
+        try:
+            data: Dict[str, Any] = json.loads(manifest_path.read_text())
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != MANIFEST_VERSION or data.get('root') != str(template_path):
+            return None
+        return CompiledTemplate(
+            root=data['root'],
+            options=data['options'],
+            dirs=[(relative, mode) for relative, mode in data['dirs']],
+            files=[TemplateFile(**entry) for entry in data['files']],
+            signature=[(relative, mtime_ns, size) for relative, mtime_ns, size in data['signature']]
+        )
+
+    def _save(self, template_path: Path, compiled: CompiledTemplate) -> None:
+        manifest_path: Optional[Path] = self._manifest_path(template_path)
+        if manifest_path is None:
+            return
+        payload: Dict[str, Any] = dict(asdict(compiled), version=MANIFEST_VERSION)
+        try:
+            manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path: Path = manifest_path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+            tmp_path.write_text(json.dumps(payload))
+            os.replace(tmp_path, manifest_path)
+        except OSError:
+            pass
+
+    def get(self, template_path: Path) -> CompiledTemplate:
+        """Compiled form of a template, recompiled if any of its entries changed"""
+        key: str = str(template_path)
+        with self._lock:
+            compiled: Optional[CompiledTemplate] = self._compiled.get(key)
+            if compiled is None:
+                compiled = self._load(template_path)
+            if compiled is None or not compiled.is_current():
+                compiled = compile_template(template_path)
+                self.compiles += 1
+                self._save(template_path, compiled)
+            self._compiled[key] = compiled
+            return compiled
+
+    def instantiate(
+        self,
+        template_path: Path,
+        project_path: Path,
+        variables: Dict[str, str],
+        mode: Optional[str] = None
+    ) -> CopyStats:
+        """Write a template into an existing project directory, substituting placeholders"""
+        compiled: CompiledTemplate = self.get(template_path)
+        options = TemplateOptions(**compiled.options)
+        if mode is not None:
+            options.mode = mode
+        stats = CopyStats()
+        devices: Tuple[int, int] = (os.stat(compiled.root).st_dev, os.stat(project_path).st_dev)
+        target_root: str = str(project_path)
+
+        for relative, _ in compiled.dirs:
+            os.makedirs(os.path.join(target_root, relative), exist_ok=True)
+
+        for template_file in compiled.files:
+            source: str = os.path.join(compiled.root, template_file.path)
+            dest: str = os.path.join(target_root, template_file.path)
+            if template_file.segments is None:
+                place_file(source, dest, os.stat(source).st_size, template_file.path, devices, options, stats)
+            else:
+                content: bytes = render(template_file.segments, variables).encode('utf-8')
+                with open(dest, 'wb') as handle:
+                    handle.write(content)
+                os.chmod(dest, template_file.mode)
+                stats.bytes_copied += len(content)
+            stats.files += 1
+
+        # Directory modes and times last (deepest first), as copytree does
+        for relative, _ in reversed(compiled.dirs):
+            shutil.copystat(os.path.join(compiled.root, relative), os.path.join(target_root, relative))
+        return stats
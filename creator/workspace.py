@@ -0,0 +1,375 @@
+"""
+Workspace project index
+Records each project's category, detected types, git presence, size and file
+count in SQLite so list and info are answered from indexed queries; a quick
+refresh re-lists only the categories whose mtime changed, and rescanning
+projects is left to an explicit deep refresh
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import stat
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from health.dirsize import DEFAULT_SUMMARIZE
+from health.pool import run_bounded
+
+DEFAULT_INDEX_DIR: Path = Path.home() / '.cache' / 'project-creator'
+
+# Bump when the schema or directory-entry layout changes; the index is rebuilt
+INDEX_VERSION: int = 2
+
+# Top-level files that mark a project type, as scripts/detect-project.sh checks them
+TYPE_MARKERS: Dict[str, str] = {
+    'package.json': 'WEB',
+    'requirements.txt': 'ML',
+    'docker-compose.yml': 'DOCKER'
+}
+# Any *.sh below the project root marks it as automation
+SCRIPT_TYPE: str = 'AUTOMATION'
+PROJECT_TYPES: List[str] = list(TYPE_MARKERS.values()) + [SCRIPT_TYPE]
+
+# Trees counted as one opaque total, re-walked only when their top directory
+# changes and never searched for scripts
+SUMMARIZE: Set[str] = set(DEFAULT_SUMMARIZE) | {'.git'}
+
+SORT_ORDERS: Dict[str, str] = {
+    'name': 'name, category',
+    'category': 'category, name',
+    'size': 'size DESC, name',
+    'files': 'files DESC, name',
+    'modified': 'modified DESC, name'
+}
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS categories (
+    name TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS projects (
+    category TEXT NOT NULL,
+    name TEXT NOT NULL,
+    path TEXT NOT NULL,
+    types TEXT NOT NULL,
+    git INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    files INTEGER NOT NULL,
+    modified REAL NOT NULL,
+    dirs TEXT NOT NULL,
+    PRIMARY KEY (category, name)
+);
+CREATE INDEX IF NOT EXISTS idx_workspace_name ON projects(name);
+CREATE INDEX IF NOT EXISTS idx_workspace_size ON projects(size);
+CREATE INDEX IF NOT EXISTS idx_workspace_modified ON projects(modified);
+"""
+
+# Directory entries, keyed by path relative to the project root ('' is the root):
+# [mtime_ns, inode, direct_bytes, direct_files, has_script, child_dirs, markers]
+# child_dirs is None for a summarized tree, whose bytes and files are its totals;
+# markers lists the TYPE_MARKERS and .git names found directly in the directory
+DirEntry = List[Any]
+
+@dataclass
+class WorkspaceProject:
+    """One project directory as last scanned"""
+    name: str
+    category: str
+    path: str
+    types: List[str]
+    git: bool
+    size: int
+    files: int
+    modified: float
+
+@dataclass
+class RefreshStats:
+    """What one refresh had to do"""
+    categories_listed: int = 0
+    projects_scanned: int = 0
+    projects_changed: int = 0
+    projects_removed: int = 0
+    seconds: float = 0.0
+
+def _summary(path: str, st: os.stat_result) -> DirEntry:
+    total: int = 0
+    files: int = 0
+    stack: List[str] = [path]
+    while stack:
+        current: str = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total += entry.stat(follow_symlinks=False).st_size
+                            files += 1
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return [st.st_mtime_ns, st.st_ino, total, files, False, None, []]
+
+def scan_project(root: str, previous: Dict[str, DirEntry]) -> Optional[Dict[str, DirEntry]]:
+    """Directory entries of a project, re-listing only directories whose mtime changed
+
+    Like health.dirsize, a file rewritten in place is picked up once its
+    directory itself changes. Returns None if the project no longer exists.
+    """
+    try:
+        root_stat = os.stat(root)
+    except OSError:
+        return None
+    if not stat.S_ISDIR(root_stat.st_mode):
+        return None
+
+    current: Dict[str, DirEntry] = {}
+    stack: List[Tuple[str, os.stat_result]] = [('', root_stat)]
+    while stack:
+        relative, st = stack.pop()
+        path: str = os.path.join(root, relative) if relative else root
+        cached: Optional[DirEntry] = previous.get(relative)
+        unchanged: bool = cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_ino
+
+        if relative and os.path.basename(relative) in SUMMARIZE:
+            current[relative] = cached if cached is not None and unchanged else _summary(path, st)
+            continue
+
+        if cached is not None and unchanged and cached[5] is not None:
+            current[relative] = cached
+            for child in cached[5]:
+                child_relative: str = f'{relative}/{child}' if relative else child
+                try:
+                    child_stat = os.stat(os.path.join(root, child_relative), follow_symlinks=False)
+                except OSError:
+                    continue
+                if stat.S_ISDIR(child_stat.st_mode):
+                    stack.append((child_relative, child_stat))
+            continue
+
+        direct: int = 0
+        files: int = 0
+        has_script: bool = False
+        children: List[str] = []
+        markers: List[str] = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.name in TYPE_MARKERS or entry.name == '.git':
+                            markers.append(entry.name)
+                        if entry.is_dir(follow_symlinks=False):
+                            children.append(entry.name)
+                            stack.append((
+                                f'{relative}/{entry.name}' if relative else entry.name,
+                                entry.stat(follow_symlinks=False)
+                            ))
+                        elif entry.is_file(follow_symlinks=False):
+                            direct += entry.stat(follow_symlinks=False).st_size
+                            files += 1
+                            has_script = has_script or entry.name.endswith('.sh')
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+        current[relative] = [st.st_mtime_ns, st.st_ino, direct, files, has_script, children, sorted(markers)]
+    return current
+
+def _totals(dirs: Dict[str, DirEntry]) -> Tuple[List[str], bool, int, int, float]:
+    """(types, git, size, files, newest directory mtime) of a scanned project"""
+    root_markers: List[str] = dirs[''][6] if '' in dirs else []
+    types: List[str] = [TYPE_MARKERS[name] for name in TYPE_MARKERS if name in root_markers]
+    if any(entry[4] for entry in dirs.values()):
+        types.append(SCRIPT_TYPE)
+    return (
+        types,
+        '.git' in root_markers,
+        sum(entry[2] for entry in dirs.values()),
+        sum(entry[3] for entry in dirs.values()),
+        max((entry[0] for entry in dirs.values()), default=0) / 1e9
+    )
+
+ProjectRow = Tuple[str, str, str, str, int, int, int, float]
+
+def _project(row: ProjectRow) -> WorkspaceProject:
+    category, name, path, types, git, size, files, modified = row
+    return WorkspaceProject(
+        name=name,
+        category=category,
+        path=path,
+        types=types.split(',') if types else [],
+        git=bool(git),
+        size=size,
+        files=files,
+        modified=modified
+    )
+
+class WorkspaceIndex:
+    """Project index for one workspace, cached under ~/.cache/project-creator"""
+
+    def __init__(
+        self,
+        base_path: Path,
+        categories: List[str],
+        path: Optional[Path] = None,
+        workers: int = 8
+    ) -> None:
+        self.base_path: Path = base_path
+        self.categories: List[str] = list(categories)
+        if path is None:
+            digest: str = hashlib.sha256(str(base_path).encode()).hexdigest()[:16]
+            path = DEFAULT_INDEX_DIR / f'workspace-{digest}.sqlite3'
+        self.path: Path = path
+        self.workers: int = workers
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30.0, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        if self._conn.execute('PRAGMA user_version').fetchone()[0] != INDEX_VERSION:
+            # Only a cache: rebuild rather than migrate
+            with self._conn:
+                self._conn.executescript(
+                    'DROP TABLE IF EXISTS categories; DROP TABLE IF EXISTS projects; DROP TABLE IF EXISTS meta;'
+                )
+        self._conn.executescript(SCHEMA)
+        self._conn.execute(f'PRAGMA user_version = {INDEX_VERSION}')
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def refresh(self, deep: bool = False) -> RefreshStats:
+        """Bring the index up to date with the workspace
+
+        A quick refresh re-lists only categories whose directory mtime changed,
+        which catches created, renamed and removed projects. A deep refresh also
+        revisits every known project, re-listing only its changed directories.
+        """
+        started: float = time.perf_counter()
+        stats = RefreshStats()
+        with self._lock:
+            known: Dict[str, int] = dict(self._conn.execute('SELECT name, mtime_ns FROM categories').fetchall())
+
+        jobs: List[Tuple[str, str, Dict[str, DirEntry]]] = []
+        removed: List[Tuple[str, str]] = []
+        category_mtimes: Dict[str, Optional[int]] = {}
+        for category in self.categories:
+            category_path: Path = self.base_path / category
+            try:
+                category_stat: Optional[os.stat_result] = os.stat(category_path)
+            except OSError:
+                category_stat = None
+            if category_stat is None:
+                if category in known:
+                    category_mtimes[category] = None
+                continue
+            if not deep and known.get(category) == category_stat.st_mtime_ns:
+                continue
+
+            stats.categories_listed += 1
+            try:
+                with os.scandir(category_path) as entries:
+                    listed: Set[str] = {entry.name for entry in entries if entry.is_dir()}
+            except OSError:
+                # Removed or made unreadable since the stat; forget its projects
+                category_mtimes[category] = None
+                continue
+            # Only a deep refresh needs the stored directory entries
+            column: str = 'dirs' if deep else "''"
+            with self._lock:
+                previous: Dict[str, str] = dict(self._conn.execute(
+                    f'SELECT name, {column} FROM projects WHERE category = ?', (category,)
+                ).fetchall())
+            removed.extend((category, name) for name in previous if name not in listed)
+            for name in sorted(listed):
+                if name not in previous:
+                    jobs.append((category, name, {}))
+                elif deep:
+                    jobs.append((category, name, json.loads(previous[name])))
+            category_mtimes[category] = category_stat.st_mtime_ns
+
+        rows: List[Tuple[str, str, str, str, int, int, int, float, str]] = []
+        outcomes = run_bounded(
+            lambda job: scan_project(str(self.base_path / job[0] / job[1]), job[2]), jobs, self.workers
+        )
+        for outcome in outcomes:
+            category, name, previous_dirs = outcome.item
+            stats.projects_scanned += 1
+            if outcome.value is None:
+                removed.append((category, name))
+                continue
+            if outcome.value == previous_dirs:
+                continue
+            types, git, size, files, modified = _totals(outcome.value)
+            rows.append((
+                category, name, str(self.base_path / category / name), ','.join(types),
+                int(git), size, files, modified, json.dumps(outcome.value, separators=(',', ':'))
+            ))
+
+        with self._lock, self._conn:
+            self._conn.executemany('DELETE FROM projects WHERE category = ? AND name = ?', removed)
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO projects '
+                '(category, name, path, types, git, size, files, modified, dirs) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                rows
+            )
+            for category, mtime_ns in category_mtimes.items():
+                if mtime_ns is None:
+                    self._conn.execute('DELETE FROM projects WHERE category = ?', (category,))
+                    self._conn.execute('DELETE FROM categories WHERE name = ?', (category,))
+                else:
+                    self._conn.execute(
+                        'INSERT OR REPLACE INTO categories (name, mtime_ns) VALUES (?, ?)', (category, mtime_ns)
+                    )
+
+        stats.projects_changed = len(rows)
+        stats.projects_removed = len(removed)
+        stats.seconds = time.perf_counter() - started
+        return stats
+
+    def projects(
+        self,
+        category: Optional[str] = None,
+        project_type: Optional[str] = None,
+        sort: str = 'name',
+        limit: Optional[int] = None
+    ) -> List[WorkspaceProject]:
+        """Indexed projects matching every given filter, in `sort` order"""
+        if sort not in SORT_ORDERS:
+            raise ValueError(f"sort must be one of: {list(SORT_ORDERS)}")
+        clauses: List[str] = []
+        params: List[Any] = []
+        if category is not None:
+            clauses.append('category = ?')
+            params.append(category)
+        if project_type is not None:
+            clauses.append("instr(',' || types || ',', ?) > 0")
+            params.append(f',{project_type},')
+        where: str = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        query: str = (
+            'SELECT category, name, path, types, git, size, files, modified FROM projects '
+            f'{where} ORDER BY {SORT_ORDERS[sort]}'
+        )
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        with self._lock:
+            rows: List[ProjectRow] = self._conn.execute(query, params).fetchall()
+        return [_project(row) for row in rows]
+
+    def get(self, name: str) -> List[WorkspaceProject]:
+        """Every indexed project called `name`, as last scanned"""
+        with self._lock:
+            rows: List[ProjectRow] = self._conn.execute(
+                'SELECT category, name, path, types, git, size, files, modified FROM projects WHERE name = ?',
+                (name,)
+            ).fetchall()
+        return [_project(row) for row in rows]
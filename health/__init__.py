@@ -0,0 +1,3 @@
+"""
+Support modules for the project health monitor
+"""
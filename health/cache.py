@@ -0,0 +1,162 @@
+"""
+Persistent HTTP response cache for conditional GitHub requests
+Stores ETag/Last-Modified validators per URL so unchanged resources cost a 304
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_CACHE_DIR: Path = Path.home() / '.cache' / 'project-health' / 'http'
+
+@dataclass
+class CacheEntry:
+    """A cached response body together with its validators"""
+    url: str
+    body: Any
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    stored_at: float = 0.0
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers that let the server answer 304 Not Modified"""
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+class ResponseCache:
+    """On-disk URL-keyed cache with TTL and total-size eviction"""
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CACHE_DIR,
+        ttl: float = 7 * 24 * 3600,
+        max_bytes: int = 32 * 1024 * 1024
+    ) -> None:
+        self.path: Path = path
+        self.ttl: float = ttl
+        self.max_bytes: int = max_bytes
+        self._lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def _entry_path(self, url: str) -> Path:
+        digest: str = hashlib.sha256(url.encode()).hexdigest()
+        return self.path / f'{digest}.json'
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Return the stored entry for a URL, or None if absent or expired"""
+        entry_path = self._entry_path(url)
+        try:
+            raw: Dict[str, Any] = json.loads(entry_path.read_text())
+        except (OSError, ValueError):
+            return None
+
+        entry = CacheEntry(
+            url=raw.get('url', ''),
+            body=raw.get('body'),
+            etag=raw.get('etag'),
+            last_modified=raw.get('last_modified'),
+            stored_at=raw.get('stored_at', 0.0)
+        )
+        if entry.url != url or time.time() - entry.stored_at > self.ttl:
+            entry_path.unlink(missing_ok=True)
+            return None
+        return entry
+
+    def put(
+        self,
+        url: str,
+        body: Any,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> None:
+        """Store a response body; ignored when there is no validator to revalidate with"""
+        if not etag and not last_modified:
+            return
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        entry_path = self._entry_path(url)
+        payload: str = json.dumps({
+            'url': url,
+            'body': body,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': time.time()
+        })
+
+        # Write-then-rename so concurrent readers never see a partial file
+        tmp_path = entry_path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        tmp_path.write_text(payload)
+        os.replace(tmp_path, entry_path)
+
+    def touch(self, url: str) -> None:
+        """Refresh an entry's timestamp after a successful revalidation"""
+        entry_path = self._entry_path(url)
+        try:
+            raw: Dict[str, Any] = json.loads(entry_path.read_text())
+        except (OSError, ValueError):
+            return
+        raw['stored_at'] = time.time()
+        tmp_path = entry_path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        tmp_path.write_text(json.dumps(raw))
+        os.replace(tmp_path, entry_path)
+
+    def record(self, hit: bool) -> None:
+        """Count a lookup outcome"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters since the last reset"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def prune(self) -> None:
+        """Drop expired entries, then oldest ones until under the size budget"""
+        if not self.path.exists():
+            return
+        with self._lock:
+            now: float = time.time()
+            entries: List[Tuple[float, int, Path]] = []
+            total: int = 0
+
+            for item in self.path.glob('*.json'):
+                try:
+                    st = item.stat()
+                except OSError:
+                    continue
+                if now - st.st_mtime > self.ttl:
+                    item.unlink(missing_ok=True)
+                    continue
+                entries.append((st.st_mtime, st.st_size, item))
+                total += st.st_size
+
+            entries.sort()
+            for _, size, item in entries:
+                if total <= self.max_bytes:
+                    break
+                item.unlink(missing_ok=True)
+                total -= size
+
+    def clear(self) -> None:
+        """Remove every cached entry"""
+        with self._lock:
+            for item in self.path.glob('*.json'):
+                item.unlink(missing_ok=True)
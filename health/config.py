@@ -0,0 +1,415 @@
+"""
+Declarative monitor configuration
+Repositories, local projects (listed or discovered by glob), MCP servers and
+API keys, each with its own checks, refresh interval and timeout, plus
+per-section concurrency budgets. Files are TOML, YAML or JSON, parsed once and
+re-read only when their mtime or size changes.
+"""
+
+import copy
+import fnmatch
+import glob
+import json
+import os
+import sys
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Searched in order when no --config is given; PROJECT_HEALTH_CONFIG overrides
+CONFIG_DIR: Path = Path.home() / '.config' / 'project-health'
+CONFIG_NAMES: List[str] = ['config.toml', 'config.yaml', 'config.yml', 'config.json']
+CONFIG_ENV: str = 'PROJECT_HEALTH_CONFIG'
+
+SECTIONS: List[str] = ['github', 'local', 'mcp', 'api']
+# 'repo' covers push age and open issues; the rest each cost extra requests and are opt-in
+REPO_CHECKS: List[str] = ['repo', 'ci', 'prs', 'releases']
+DEFAULT_REPO_CHECKS: List[str] = ['repo']
+PROJECT_CHECKS: List[str] = ['git', 'size', 'tests']
+
+class ConfigError(ValueError):
+    """The configuration file is missing, unreadable or invalid"""
+
+@dataclass
+class RepoTarget:
+    """One GitHub repository"""
+    name: str
+    checks: List[str] = field(default_factory=lambda: list(DEFAULT_REPO_CHECKS))
+    interval: Optional[float] = None
+    timeout: Optional[float] = None
+
+@dataclass
+class ProjectTarget:
+    """One local project; `glob` entries expand into a target per matching directory"""
+    name: str = ''
+    path: str = ''
+    glob: str = ''
+    exclude: List[str] = field(default_factory=list)
+    checks: List[str] = field(default_factory=lambda: list(PROJECT_CHECKS))
+    interval: Optional[float] = None
+    timeout: Optional[float] = None
+
+@dataclass
+class RepoThresholds:
+    """Limits beyond which a repository's status degrades"""
+    push_days: float = 30.0
+    open_issues: int = 10
+    pr_age_days: float = 14.0
+    unreleased_commits: int = 50
+    release_age_days: float = 90.0
+    # Status for failing default-branch CI: 'error' or 'warning'
+    ci_failure: str = 'error'
+
+@dataclass
+class GitHubSettings:
+    concurrency: int = 8
+    timeout: float = 10.0
+    retries: int = 2
+    backend: str = 'rest'
+    interval: float = 300.0
+    # Requests per rate-limit window left for other tools sharing the token
+    reserve: int = 100
+    # Checks for repositories that don't list their own
+    checks: List[str] = field(default_factory=lambda: list(DEFAULT_REPO_CHECKS))
+    thresholds: RepoThresholds = field(default_factory=RepoThresholds)
+    repositories: List[RepoTarget] = field(default_factory=lambda: [
+        RepoTarget(name) for name in (
+            'reggienitro/claude-config',
+            'reggienitro/article-to-audio-extension',
+            'reggienitro/bee-supabase-integration',
+            'reggienitro/personal-data-lake',
+            'reggienitro/knowledge-scraper'
+        )
+    ])
+
+@dataclass
+class LocalSettings:
+    concurrency: int = 1
+    timeout: Optional[float] = None
+    interval: float = 60.0
+    exclude_dirs: List[str] = field(default_factory=list)
+    # None keeps the size index's own default (node_modules, .venv, venv)
+    summarize_dirs: Optional[List[str]] = None
+    projects: List[ProjectTarget] = field(default_factory=lambda: [
+        ProjectTarget(name, path) for name, path in (
+            ('claude-config', '~/claude-config'),
+            ('article-to-audio', '~/AI projects/claude-tools/article-to-audio-extension'),
+            ('bee-supabase', '~/AI projects/automation-tools/bee-supabase-integration'),
+            ('personal-data-lake', '~/AI projects/automation-tools/personal-data-lake'),
+            ('knowledge-scraper', '~/AI projects/claude-tools/knowledge-scraper')
+        )
+    ])
+
+@dataclass
+class TestSettings:
+    concurrency: int = 4
+    shards: int = 1
+    timeout: Optional[float] = None
+    interval: float = 900.0
+
+@dataclass
+class McpSettings:
+    config: str = '~/Library/Application Support/Claude/claude_desktop_config.json'
+    interval: float = 30.0
+    servers: List[str] = field(default_factory=lambda: [
+        'filesystem', 'github', 'supabase', 'beemcp',
+        'memory', 'web-search', 'exa-search'
+    ])
+
+@dataclass
+class ApiSettings:
+    env_file: str = '~/.config/api-keys/.env'
+    interval: float = 30.0
+    keys: List[str] = field(default_factory=lambda: [
+        'GITHUB_PERSONAL_ACCESS_TOKEN',
+        'SUPABASE_URL',
+        'SUPABASE_KEY',
+        'BEE_API_TOKEN',
+        'EXA_API_KEY'
+    ])
+
+@dataclass
+class HealthConfig:
+    """Everything the monitor checks; the defaults are the built-in target lists"""
+    checks: List[str] = field(default_factory=lambda: list(SECTIONS))
+    github: GitHubSettings = field(default_factory=GitHubSettings)
+    local: LocalSettings = field(default_factory=LocalSettings)
+    tests: TestSettings = field(default_factory=TestSettings)
+    mcp: McpSettings = field(default_factory=McpSettings)
+    api: ApiSettings = field(default_factory=ApiSettings)
+    # File this was loaded from and its (mtime_ns, size) at the time
+    source: Optional[Path] = None
+    signature: Optional[Tuple[int, int]] = None
+
+    def with_overrides(self, overrides: Dict[str, Any]) -> 'HealthConfig':
+        """Copy with dotted-key settings replaced, e.g. {'github.concurrency': 16}"""
+        config: HealthConfig = copy.deepcopy(self)
+        for key, value in overrides.items():
+            section, _, name = key.rpartition('.')
+            target: Any = getattr(config, section) if section else config
+            if not hasattr(target, name):
+                raise ConfigError(f"unknown setting {key}")
+            setattr(target, name, value)
+        return config
+
+    def projects(self) -> Dict[str, ProjectTarget]:
+        """Listed projects plus every directory matched by a glob entry, by name
+
+        A discovered directory is named after itself, or parent/name when that
+        name is already taken; explicitly listed projects always win.
+        """
+        resolved: Dict[str, ProjectTarget] = {
+            target.name: target for target in self.local.projects if not target.glob
+        }
+        claimed: Set[str] = {os.path.abspath(expand(target.path)) for target in resolved.values()}
+        for entry in self.local.projects:
+            if not entry.glob:
+                continue
+            for match in sorted(glob.glob(expand(entry.glob))):
+                path: str = os.path.abspath(match)
+                name: str = os.path.basename(path)
+                if path in claimed or not os.path.isdir(path):
+                    continue
+                if any(fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(path, pattern) for pattern in entry.exclude):
+                    continue
+                if name in resolved:
+                    name = f'{os.path.basename(os.path.dirname(path))}/{name}'
+                claimed.add(path)
+                resolved[name] = ProjectTarget(
+                    name=name,
+                    path=path,
+                    checks=list(entry.checks),
+                    interval=entry.interval,
+                    timeout=entry.timeout
+                )
+        return resolved
+
+    def intervals(self) -> Dict[str, float]:
+        """Refresh interval per report section, short enough for its most frequent target"""
+        repo_intervals: List[float] = [t.interval for t in self.github.repositories if t.interval is not None]
+        project_intervals: List[float] = [t.interval for t in self.local.projects if t.interval is not None]
+        return {
+            'github': min([self.github.interval] + repo_intervals),
+            'local': min([self.local.interval] + project_intervals),
+            'mcp': self.mcp.interval,
+            'api': self.api.interval,
+            'tests': self.tests.interval
+        }
+
+def expand(path: str) -> str:
+    return os.path.expandvars(os.path.expanduser(path))
+
+def find_config() -> Optional[Path]:
+    """The config file to use when none is given, or None for the built-in defaults"""
+    explicit: Optional[str] = os.environ.get(CONFIG_ENV)
+    if explicit:
+        return Path(expand(explicit))
+    for name in CONFIG_NAMES:
+        candidate: Path = CONFIG_DIR / name
+        if candidate.exists():
+            return candidate
+    return None
+
+def _parse(path: Path) -> Any:
+    text: str = path.read_text()
+    if path.suffix == '.toml':
+        if sys.version_info >= (3, 11):
+            import tomllib
+        else:
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise ConfigError(f"{path}: TOML config needs Python 3.11+ or tomli (pip install tomli)")
+        try:
+            return tomllib.loads(text)
+        except tomllib.TOMLDecodeError as e:
+            raise ConfigError(f"{path}: {e}")
+    if path.suffix in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError:
+            raise ConfigError(f"{path}: YAML config needs PyYAML (pip install pyyaml); use TOML or JSON otherwise")
+        try:
+            return yaml.safe_load(text) or {}
+        except yaml.YAMLError as e:
+            raise ConfigError(f"{path}: {e}")
+    try:
+        return json.loads(text)
+    except ValueError as e:
+        raise ConfigError(f"{path}: {e}")
+
+def _table(value: Any, where: str, allowed: List[str]) -> Dict[str, Any]:
+    """A mapping with only known keys, so typos fail loudly instead of being ignored"""
+    if not isinstance(value, dict):
+        raise ConfigError(f"{where} must be a table")
+    unknown: List[str] = [key for key in value if key not in allowed]
+    if unknown:
+        raise ConfigError(f"{where}: unknown key(s) {', '.join(map(str, unknown))}")
+    return value
+
+def _checks(value: Any, where: str, allowed: List[str]) -> List[str]:
+    if not isinstance(value, list) or any(item not in allowed for item in value):
+        raise ConfigError(f"{where}.checks must be a list drawn from {allowed}")
+    return list(value)
+
+def _number(value: Any, where: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        raise ConfigError(f"{where} must be a non-negative number")
+    return float(value)
+
+def _budget(target: Any, table: Dict[str, Any], where: str) -> None:
+    """Copy the concurrency/timeout/interval keys present in `table` onto a settings object"""
+    for key in ('concurrency', 'shards', 'retries', 'reserve'):
+        if key in table:
+            minimum: int = 0 if key in ('retries', 'reserve') else 1
+            if isinstance(table[key], bool) or not isinstance(table[key], int) or table[key] < minimum:
+                raise ConfigError(f"{where}.{key} must be a positive integer")
+            setattr(target, key, table[key])
+    for key in ('timeout', 'interval'):
+        if key in table:
+            setattr(target, key, _number(table[key], f'{where}.{key}'))
+
+def _repo(entry: Any, where: str, checks: List[str]) -> RepoTarget:
+    if isinstance(entry, str):
+        return RepoTarget(entry, list(checks))
+    table: Dict[str, Any] = _table(entry, where, ['name', 'checks', 'interval', 'timeout'])
+    if not isinstance(table.get('name'), str) or '/' not in table['name']:
+        raise ConfigError(f"{where}.name must be OWNER/REPO")
+    return RepoTarget(
+        name=table['name'],
+        checks=_checks(table.get('checks', checks), where, REPO_CHECKS),
+        interval=_number(table['interval'], f'{where}.interval') if 'interval' in table else None,
+        timeout=_number(table['timeout'], f'{where}.timeout') if 'timeout' in table else None
+    )
+
+def _project(entry: Any, where: str) -> ProjectTarget:
+    if isinstance(entry, str):
+        return ProjectTarget(name=os.path.basename(entry.rstrip('/')), path=entry)
+    table: Dict[str, Any] = _table(entry, where, ['name', 'path', 'glob', 'exclude', 'checks', 'interval', 'timeout'])
+    if ('path' in table) == ('glob' in table):
+        raise ConfigError(f"{where} needs exactly one of path or glob")
+    target = ProjectTarget(
+        path=str(table.get('path', '')),
+        glob=str(table.get('glob', '')),
+        exclude=[str(pattern) for pattern in table.get('exclude', [])],
+        checks=_checks(table.get('checks', PROJECT_CHECKS), where, PROJECT_CHECKS),
+        interval=_number(table['interval'], f'{where}.interval') if 'interval' in table else None,
+        timeout=_number(table['timeout'], f'{where}.timeout') if 'timeout' in table else None
+    )
+    target.name = str(table.get('name') or os.path.basename(target.path.rstrip('/')))
+    return target
+
+def _thresholds(value: Any) -> RepoThresholds:
+    table: Dict[str, Any] = _table(value, 'github.thresholds', list(vars(RepoThresholds())))
+    thresholds = RepoThresholds()
+    for key in ('push_days', 'pr_age_days', 'release_age_days'):
+        if key in table:
+            setattr(thresholds, key, _number(table[key], f'github.thresholds.{key}'))
+    for key in ('open_issues', 'unreleased_commits'):
+        if key in table:
+            setattr(thresholds, key, int(_number(table[key], f'github.thresholds.{key}')))
+    if 'ci_failure' in table:
+        if table['ci_failure'] not in ('error', 'warning'):
+            raise ConfigError("github.thresholds.ci_failure must be error or warning")
+        thresholds.ci_failure = table['ci_failure']
+    return thresholds
+
+def _strings(value: Any, where: str) -> List[str]:
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ConfigError(f"{where} must be a list of strings")
+    return list(value)
+
+def parse_config(data: Any, source: str = 'config') -> HealthConfig:
+    """Build a HealthConfig from parsed file contents; omitted keys keep their defaults"""
+    root: Dict[str, Any] = _table(data, source, ['checks'] + SECTIONS + ['tests'])
+    config = HealthConfig()
+    if 'checks' in root:
+        config.checks = _checks(root['checks'], source, SECTIONS)
+
+    if 'github' in root:
+        github: Dict[str, Any] = _table(
+            root['github'], 'github',
+            ['concurrency', 'timeout', 'retries', 'reserve', 'backend', 'interval', 'checks', 'thresholds',
+             'repositories']
+        )
+        _budget(config.github, github, 'github')
+        if 'backend' in github:
+            if github['backend'] not in ('rest', 'graphql'):
+                raise ConfigError("github.backend must be rest or graphql")
+            config.github.backend = github['backend']
+        if 'checks' in github:
+            config.github.checks = _checks(github['checks'], 'github', REPO_CHECKS)
+            for target in config.github.repositories:
+                target.checks = list(config.github.checks)
+        if 'thresholds' in github:
+            config.github.thresholds = _thresholds(github['thresholds'])
+        if 'repositories' in github:
+            config.github.repositories = [
+                _repo(entry, f'github.repositories[{index}]', config.github.checks)
+                for index, entry in enumerate(github['repositories'])
+            ]
+
+    if 'local' in root:
+        local: Dict[str, Any] = _table(
+            root['local'], 'local',
+            ['concurrency', 'timeout', 'interval', 'exclude_dirs', 'summarize_dirs', 'projects']
+        )
+        _budget(config.local, local, 'local')
+        if 'exclude_dirs' in local:
+            config.local.exclude_dirs = _strings(local['exclude_dirs'], 'local.exclude_dirs')
+        if 'summarize_dirs' in local:
+            config.local.summarize_dirs = _strings(local['summarize_dirs'], 'local.summarize_dirs')
+        if 'projects' in local:
+            config.local.projects = [
+                _project(entry, f'local.projects[{index}]') for index, entry in enumerate(local['projects'])
+            ]
+
+    if 'tests' in root:
+        _budget(config.tests, _table(root['tests'], 'tests', ['concurrency', 'shards', 'timeout', 'interval']), 'tests')
+
+    if 'mcp' in root:
+        mcp: Dict[str, Any] = _table(root['mcp'], 'mcp', ['config', 'interval', 'servers'])
+        _budget(config.mcp, mcp, 'mcp')
+        if 'config' in mcp:
+            config.mcp.config = str(mcp['config'])
+        if 'servers' in mcp:
+            config.mcp.servers = _strings(mcp['servers'], 'mcp.servers')
+
+    if 'api' in root:
+        api: Dict[str, Any] = _table(root['api'], 'api', ['env_file', 'interval', 'keys'])
+        _budget(config.api, api, 'api')
+        if 'env_file' in api:
+            config.api.env_file = str(api['env_file'])
+        if 'keys' in api:
+            config.api.keys = _strings(api['keys'], 'api.keys')
+    return config
+
+_cache: Dict[str, HealthConfig] = {}
+_cache_lock = threading.Lock()
+
+def file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def load_config(path: Optional[Path]) -> HealthConfig:
+    """Parsed config for `path` (built-in defaults for None), reusing the last parse while the file is unchanged"""
+    if path is None:
+        return HealthConfig()
+    signature: Optional[Tuple[int, int]] = file_signature(path)
+    if signature is None:
+        raise ConfigError(f"config file not found: {path}")
+    key: str = os.path.abspath(path)
+    with _cache_lock:
+        cached: Optional[HealthConfig] = _cache.get(key)
+    if cached is not None and cached.signature == signature:
+        return cached
+    config: HealthConfig = parse_config(_parse(path), str(path))
+    config.source = path
+    config.signature = signature
+    with _cache_lock:
+        _cache[key] = config
+    return config
@@ -0,0 +1,232 @@
+"""
+Incremental directory-size index
+Caches per-directory byte totals keyed by (mtime, inode) so unchanged subtrees are not re-listed
+"""
+
+import fnmatch
+import json
+import os
+import stat
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from health.pool import run_bounded
+
+DEFAULT_INDEX_PATH: Path = Path.home() / '.cache' / 'project-health' / 'dirsize-index.json'
+INDEX_VERSION: int = 1
+
+# Vendored trees that are counted once and then only re-walked when their top directory changes
+DEFAULT_SUMMARIZE: List[str] = ['node_modules', '.venv', 'venv']
+
+class DirectorySizeIndex:
+    """Persistent size index built from single os.scandir passes
+
+    Each directory entry stores [mtime_ns, inode, direct_file_bytes, child_dir_names].
+    A directory whose mtime and inode still match is not listed again; only its
+    child directories are stat'ed to find the subtrees that did change. Files
+    rewritten in place without touching their directory are picked up once the
+    directory itself changes.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = DEFAULT_INDEX_PATH,
+        exclude: Optional[List[str]] = None,
+        summarize: Optional[List[str]] = None
+    ) -> None:
+        self.path: Optional[Path] = path
+        self.exclude: List[str] = list(exclude or [])
+        self.summarize: List[str] = list(DEFAULT_SUMMARIZE if summarize is None else summarize)
+        self.workers: int = 1
+        self._entries: Dict[str, List[Any]] = {}
+        self._lock = threading.Lock()
+        self._loaded: bool = False
+        self._dirty: bool = False
+
+    @property
+    def signature(self) -> str:
+        """Identifies the pattern set the cached totals were computed with"""
+        return json.dumps([sorted(self.exclude), sorted(self.summarize)])
+
+    def load(self) -> None:
+        """Read the index from disk, discarding it if the patterns changed"""
+        self._loaded = True
+        if not self.path or not self.path.exists():
+            return
+        try:
+            raw: Dict[str, Any] = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        if raw.get('version') == INDEX_VERSION and raw.get('signature') == self.signature:
+            self._entries = raw.get('entries', {})
+
+    def save(self) -> None:
+        """Persist the index if anything changed since it was loaded"""
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            payload: str = json.dumps({
+                'version': INDEX_VERSION,
+                'signature': self.signature,
+                'entries': self._entries
+            })
+            self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp_path.write_text(payload)
+        os.replace(tmp_path, self.path)
+
+    def size_of(self, root: Path) -> int:
+        """Total bytes of regular files under root, excluding symlinks"""
+        if not self._loaded:
+            self.load()
+
+        root_str: str = os.path.abspath(root)
+        try:
+            root_stat = os.stat(root_str, follow_symlinks=False)
+        except OSError:
+            return 0
+        if not stat.S_ISDIR(root_stat.st_mode):
+            return root_stat.st_size if stat.S_ISREG(root_stat.st_mode) else 0
+
+        visited: Set[str] = set()
+        if self.workers > 1:
+            total: int = self._scan_parallel(root_str, root_stat, visited)
+        else:
+            total = self._scan(root_str, root_stat, '', visited)
+        self._forget_unvisited(root_str, visited)
+        return total
+
+    def _scan_parallel(self, root: str, st: os.stat_result, visited: Set[str]) -> int:
+        """List the root once, then size its top-level subtrees on the worker pool"""
+        visited.add(root)
+        direct: int = 0
+        children: List[Tuple[str, os.stat_result]] = []
+        try:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not self._matches(self.exclude, entry.name, entry.name):
+                                children.append((entry.name, entry.stat(follow_symlinks=False)))
+                        elif entry.is_file(follow_symlinks=False):
+                            direct += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            return 0
+
+        def scan_child(child: Tuple[str, os.stat_result]) -> Tuple[int, Set[str]]:
+            child_visited: Set[str] = set()
+            size: int = self._scan(os.path.join(root, child[0]), child[1], child[0], child_visited)
+            return size, child_visited
+
+        total: int = direct
+        for outcome in run_bounded(scan_child, children, self.workers):
+            if outcome.value is not None:
+                total += outcome.value[0]
+                visited.update(outcome.value[1])
+
+        self._store(root, [st.st_mtime_ns, st.st_ino, direct, [name for name, _ in children]])
+        return total
+
+    def _matches(self, patterns: List[str], rel_path: str, name: str) -> bool:
+        for pattern in patterns:
+            target: str = rel_path if '/' in pattern else name
+            if fnmatch.fnmatch(target, pattern):
+                return True
+        return False
+
+    def _store(self, path: str, entry: List[Any]) -> None:
+        with self._lock:
+            self._entries[path] = entry
+            self._dirty = True
+
+    def _scan(self, path: str, st: os.stat_result, rel_path: str, visited: Set[str]) -> int:
+        """Size of one directory, reusing the cached listing when it is unchanged"""
+        visited.add(path)
+        name: str = os.path.basename(path)
+
+        if rel_path and self._matches(self.summarize, rel_path, name):
+            return self._summary(path, st)
+
+        cached: Optional[List[Any]] = self._entries.get(path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_ino and cached[3] is not None:
+            total: int = cached[2]
+            for child_name in cached[3]:
+                child: str = os.path.join(path, child_name)
+                try:
+                    child_stat = os.stat(child, follow_symlinks=False)
+                except OSError:
+                    continue
+                if stat.S_ISDIR(child_stat.st_mode):
+                    total += self._scan(child, child_stat, _join(rel_path, child_name), visited)
+            return total
+
+        direct: int = 0
+        subtotal: int = 0
+        children: List[str] = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            child_rel: str = _join(rel_path, entry.name)
+                            if self._matches(self.exclude, child_rel, entry.name):
+                                continue
+                            children.append(entry.name)
+                            subtotal += self._scan(
+                                entry.path, entry.stat(follow_symlinks=False), child_rel, visited
+                            )
+                        elif entry.is_file(follow_symlinks=False):
+                            direct += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            return 0
+
+        self._store(path, [st.st_mtime_ns, st.st_ino, direct, children])
+        return direct + subtotal
+
+    def _summary(self, path: str, st: os.stat_result) -> int:
+        """Opaque total for a vendored tree, recomputed only when its top directory changes"""
+        cached: Optional[List[Any]] = self._entries.get(path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_ino and cached[3] is None:
+            return int(cached[2])
+
+        total: int = 0
+        stack: List[str] = [path]
+        while stack:
+            current: str = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                total += entry.stat(follow_symlinks=False).st_size
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+
+        self._store(path, [st.st_mtime_ns, st.st_ino, total, None])
+        return total
+
+    def _forget_unvisited(self, root: str, visited: Set[str]) -> None:
+        """Drop entries for directories under root that no longer exist or are excluded"""
+        prefix: str = root.rstrip(os.sep) + os.sep
+        with self._lock:
+            stale: List[str] = [
+                key for key in self._entries
+                if key.startswith(prefix) and key not in visited
+            ]
+            for key in stale:
+                del self._entries[key]
+            if stale:
+                self._dirty = True
+
+def _join(rel_path: str, name: str) -> str:
+    return f'{rel_path}/{name}' if rel_path else name
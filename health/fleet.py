@@ -0,0 +1,372 @@
+"""
+Multi-host health aggregation
+Agents serve their host-local sections with a versioned /delta endpoint so a
+collector only receives entries that changed since its last poll; the
+collector polls every agent concurrently, fetches GitHub once for the whole
+fleet and keeps per-host freshness
+"""
+
+import datetime
+import http.client
+import json
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from health.jsonutil import plain
+from health.pool import run_bounded
+from health.server import HealthRequestHandler, HealthServer
+from health.watch import Event, diff_reports, emit_ndjson
+
+if TYPE_CHECKING:
+    from project_health_monitor import ProjectHealthMonitor
+
+# Per-host report fields an agent publishes; GitHub belongs to the collector
+HOST_SECTIONS: List[str] = ['local_projects', 'mcp_servers', 'api_keys', 'tests', 'test_durations']
+
+# (section, entry key) -> (version it last changed at, value or None once removed)
+EntryLog = Dict[Tuple[str, str], Tuple[int, Any]]
+
+class DeltaLog:
+    """Versioned copy of an agent's sections
+
+    Every entry carries the version at which it last changed. The epoch is
+    new for each agent process, so a collector holding a cursor from a
+    previous run gets a full snapshot instead of a delta.
+    """
+
+    def __init__(self) -> None:
+        self.epoch: str = uuid.uuid4().hex[:12]
+        self.version: int = 0
+        self._entries: EntryLog = {}
+        self._lock = threading.Lock()
+
+    def update(self, fields: Dict[str, Any]) -> None:
+        """Record a section refresh; entries missing from a section are marked removed"""
+        with self._lock:
+            for section, values in fields.items():
+                if section not in HOST_SECTIONS or not isinstance(values, dict):
+                    continue
+                keys: Set[str] = set(values)
+                for key, value in values.items():
+                    known = self._entries.get((section, key))
+                    if known is None or known[1] != value:
+                        self.version += 1
+                        self._entries[(section, key)] = (self.version, value)
+                for (known_section, key), (_, value) in list(self._entries.items()):
+                    if known_section == section and key not in keys and value is not None:
+                        self.version += 1
+                        self._entries[(section, key)] = (self.version, None)
+
+    def delta(self, cursor: Optional[str]) -> Dict[str, Any]:
+        """Entries changed after `cursor` ("epoch:version"), or everything for a foreign cursor"""
+        epoch, _, version_text = (cursor or '').partition(':')
+        full: bool = epoch != self.epoch or not version_text.isdigit()
+        since: int = 0 if full else int(version_text)
+        sections: Dict[str, Dict[str, Any]] = {}
+        removed: Dict[str, List[str]] = {}
+        with self._lock:
+            for (section, key), (version, value) in self._entries.items():
+                if version <= since:
+                    continue
+                if value is None:
+                    if not full:
+                        removed.setdefault(section, []).append(key)
+                else:
+                    sections.setdefault(section, {})[key] = value
+            current: str = f'{self.epoch}:{self.version}'
+        return {'cursor': current, 'full': full, 'sections': sections, 'removed': removed}
+
+class AgentServer(HealthServer):
+    """HealthServer that also answers /delta for a fleet collector"""
+
+    def __init__(
+        self,
+        monitor: 'ProjectHealthMonitor',
+        ttls: Optional[Dict[str, float]] = None,
+        name: Optional[str] = None
+    ) -> None:
+        super().__init__(monitor, ttls)
+        self.name: str = name or socket.gethostname()
+        self.log = DeltaLog()
+
+    def delta(self, cursor: Optional[str], max_age: Optional[float] = None) -> Dict[str, Any]:
+        """Refresh stale sections, then return what changed since `cursor`"""
+        for name in self.sections:
+            state = self.section(name, max_age)
+            self.log.update(state.fields or {})
+        payload: Dict[str, Any] = self.log.delta(cursor)
+        payload.update(
+            host=self.name,
+            repositories=list(self.monitor.repositories),
+            freshness={name: state.freshness() for name, state in self.sections.items()}
+        )
+        return payload
+
+class AgentRequestHandler(HealthRequestHandler):
+    """Adds GET /delta?since=CURSOR to the health server routes"""
+
+    health: AgentServer
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path.rstrip('/') != '/delta':
+            super().do_GET()
+            return
+        query: Dict[str, List[str]] = parse_qs(url.query)
+        try:
+            max_age: Optional[float] = float(query['max_age'][0]) if 'max_age' in query else None
+        except ValueError:
+            self._send_json(400, {'error': 'max_age must be a number'})
+            return
+        self._send_json(200, self.health.delta(query.get('since', [None])[0], max_age))
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP client connection over a Unix socket"""
+
+    def __init__(self, path: str, timeout: float) -> None:
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path: str = path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+def fetch_json(url: str, path: str, timeout: float) -> Tuple[Dict[str, Any], int]:
+    """GET `path` from an agent at http://HOST:PORT or unix:/PATH; returns (payload, body bytes)"""
+    connection: http.client.HTTPConnection
+    if url.startswith('unix:'):
+        connection = UnixHTTPConnection(url[len('unix:'):], timeout)
+    else:
+        parts = urlsplit(url)
+        connection = http.client.HTTPConnection(parts.hostname or '127.0.0.1', parts.port, timeout=timeout)
+    try:
+        connection.request('GET', path)
+        response = connection.getresponse()
+        body: bytes = response.read()
+    finally:
+        connection.close()
+    if response.status != 200:
+        raise OSError(f"{url}{path}: HTTP {response.status}")
+    return json.loads(body), len(body)
+
+@dataclass
+class HostState:
+    """Everything the collector knows about one agent"""
+    name: str
+    url: str
+    cursor: Optional[str] = None
+    sections: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    repositories: List[str] = field(default_factory=list)
+    freshness: Dict[str, Any] = field(default_factory=dict)
+    last_seen: float = 0.0
+    error: Optional[str] = None
+    polls: int = 0
+    bytes_received: int = 0
+
+    def apply(self, delta: Dict[str, Any]) -> int:
+        """Merge one /delta response; returns the number of entries that changed"""
+        if delta.get('full'):
+            self.sections = {}
+        changed: int = 0
+        for section, entries in delta.get('sections', {}).items():
+            self.sections.setdefault(section, {}).update(entries)
+            changed += len(entries)
+        for section, keys in delta.get('removed', {}).items():
+            for key in keys:
+                self.sections.get(section, {}).pop(key, None)
+            changed += len(keys)
+        self.cursor = delta.get('cursor')
+        self.repositories = list(delta.get('repositories', self.repositories))
+        self.freshness = delta.get('freshness', {})
+        return changed
+
+class FleetCollector:
+    """Merges agent reports and fetches each GitHub repository once for the fleet"""
+
+    def __init__(
+        self,
+        monitor: 'ProjectHealthMonitor',
+        hosts: Dict[str, str],
+        github_ttl: float = 300.0,
+        timeout: float = 10.0,
+        workers: int = 16
+    ) -> None:
+        self.monitor = monitor
+        self.hosts: Dict[str, HostState] = {name: HostState(name, url) for name, url in hosts.items()}
+        self.github_ttl: float = github_ttl
+        self.timeout: float = timeout
+        self.workers: int = workers
+        self.github_repos: Dict[str, Any] = {}
+        self.github_updated: float = 0.0
+
+    def _poll_host(self, host: HostState) -> int:
+        query: str = f'?since={host.cursor}' if host.cursor else ''
+        delta, size = fetch_json(host.url, f'/delta{query}', self.timeout)
+        host.bytes_received += size
+        return host.apply(delta)
+
+    def poll(self) -> Dict[str, int]:
+        """Fetch every agent's delta concurrently; returns changed entries per host
+
+        An unreachable host keeps its last data and records the error, so it
+        shows up as stale rather than disappearing from the fleet report.
+        """
+        hosts: List[HostState] = list(self.hosts.values())
+        changed: Dict[str, int] = {}
+        # Allow the socket timeout to fire first so connections are closed cleanly
+        for outcome in run_bounded(self._poll_host, hosts, self.workers, self.timeout + 5.0):
+            host: HostState = outcome.item
+            host.polls += 1
+            if outcome.value is not None:
+                host.last_seen = time.time()
+                host.error = None
+                changed[host.name] = outcome.value
+            else:
+                host.error = 'timed out' if outcome.timed_out else str(outcome.error)
+        return changed
+
+    def repositories(self) -> List[str]:
+        """Every repository tracked by any agent, in first-seen order"""
+        seen: Dict[str, None] = {}
+        for host in self.hosts.values():
+            for repo in host.repositories:
+                seen.setdefault(repo, None)
+        return list(seen)
+
+    def refresh_github(self, force: bool = False) -> bool:
+        """Fetch the fleet's repositories in one pass if the shared result has expired"""
+        if not force and time.time() - self.github_updated < self.github_ttl:
+            return False
+        repositories: List[str] = self.repositories()
+        if not repositories:
+            return False
+        self.monitor.repositories = repositories
+        self.github_repos = plain(self.monitor.check_github_status())
+        self.github_updated = time.time()
+        return True
+
+    def host_report(self, host: HostState) -> Dict[str, Any]:
+        """One host's report: its own sections plus the shared results for its repositories"""
+        from project_health_monitor import HealthReport, HealthStatus
+
+        report = HealthReport(timestamp=datetime.datetime.fromtimestamp(host.last_seen or time.time()))
+        for section in HOST_SECTIONS:
+            setattr(report, section, dict(host.sections.get(section, {})))
+        report.github_repos = {
+            repo: self.github_repos[repo] for repo in host.repositories if repo in self.github_repos
+        }
+        self.monitor.assess_report(report)
+        if not host.last_seen:
+            # Nothing to assess for a host that has never answered
+            report.overall_health = HealthStatus.UNKNOWN
+        payload: Dict[str, Any] = plain(self.monitor.report_to_dict(report))
+        for unused in ('github_cache', 'timings', 'test_cache'):
+            payload.pop(unused, None)
+        payload['freshness'] = {
+            'last_seen': datetime.datetime.fromtimestamp(host.last_seen).isoformat() if host.last_seen else None,
+            'age_s': round(time.time() - host.last_seen, 3) if host.last_seen else None,
+            'stale': host.error is not None or not host.last_seen,
+            'error': host.error,
+            'sections': host.freshness
+        }
+        return payload
+
+    def report(self) -> Dict[str, Any]:
+        """Fleet report: shared GitHub results and one report per host"""
+        from project_health_monitor import HealthStatus
+
+        hosts: Dict[str, Dict[str, Any]] = {name: self.host_report(host) for name, host in self.hosts.items()}
+        order: List[str] = [
+            HealthStatus.HEALTHY.value, HealthStatus.UNKNOWN.value,
+            HealthStatus.WARNING.value, HealthStatus.ERROR.value
+        ]
+        overall: str = max(
+            (report['overall_health'] for report in hosts.values()),
+            key=order.index,
+            default=HealthStatus.UNKNOWN.value
+        )
+        stale: bool = any(report['freshness']['stale'] for report in hosts.values())
+        if stale and overall in (HealthStatus.HEALTHY.value, HealthStatus.UNKNOWN.value):
+            overall = HealthStatus.WARNING.value
+        return {
+            'timestamp': datetime.datetime.now().isoformat(),
+            'overall_health': overall,
+            'github_repos': self.github_repos,
+            'github_updated': (
+                datetime.datetime.fromtimestamp(self.github_updated).isoformat() if self.github_updated else None
+            ),
+            'github_cache': self.monitor.github_cache.stats() if self.monitor.github_cache else {},
+            'hosts': hosts
+        }
+
+    def collect(self) -> Dict[str, Any]:
+        """One poll of every agent, a GitHub refresh if due, and the merged report"""
+        self.poll()
+        self.refresh_github()
+        return self.report()
+
+    def run(self, interval: float, emit: Callable[[Event], None] = emit_ndjson, max_seconds: Optional[float] = None) -> None:
+        """Emit a fleet snapshot, then per-host diffs after every poll"""
+        started: float = time.monotonic()
+        fleet: Dict[str, Any] = self.collect()
+        emit({'type': 'snapshot', 'report': fleet})
+        previous: Dict[str, Dict[str, Any]] = fleet['hosts']
+
+        while max_seconds is None or time.monotonic() - started < max_seconds:
+            time.sleep(interval)
+            fleet = self.collect()
+            for name, after in fleet['hosts'].items():
+                before: Dict[str, Any] = previous.get(name, {})
+                for event in diff_reports(before, after):
+                    event.update(host=name, timestamp=fleet['timestamp'])
+                    emit(event)
+                if before.get('freshness', {}).get('stale') != after['freshness']['stale']:
+                    emit({
+                        'type': 'host',
+                        'host': name,
+                        'timestamp': fleet['timestamp'],
+                        'stale': after['freshness']['stale'],
+                        'error': after['freshness']['error']
+                    })
+            previous = fleet['hosts']
+
+def parse_hosts(specs: List[str]) -> Dict[str, str]:
+    """NAME=URL arguments (URL is http://HOST:PORT or unix:/PATH) as a mapping"""
+    hosts: Dict[str, str] = {}
+    for spec in specs:
+        name, separator, url = spec.partition('=')
+        if not separator or not name or not url:
+            raise ValueError(f"expected NAME=URL, got {spec!r}")
+        if not url.startswith(('http://', 'unix:')):
+            raise ValueError(f"{name}: URL must start with http:// or unix:")
+        if name in hosts:
+            raise ValueError(f"duplicate host name {name!r}")
+        hosts[name] = url
+    return hosts
+
+def display_fleet(report: Dict[str, Any]) -> None:
+    """Compact text summary of a fleet report"""
+    emoji: Dict[str, str] = {'healthy': '✅', 'warning': '⚠️', 'error': '❌', 'unknown': '❓'}
+    print("\n" + "="*60)
+    print(f"🛰️  FLEET HEALTH - {len(report['hosts'])} hosts - "
+          f"{emoji[report['overall_health']]} {report['overall_health'].upper()}")
+    print("="*60)
+    for name, host in report['hosts'].items():
+        freshness: Dict[str, Any] = host['freshness']
+        seen: str = f"{freshness['age_s']:.0f}s ago" if freshness['age_s'] is not None else 'never'
+        print(f"\n{emoji[host['overall_health']]} {name} (seen {seen}{', STALE: ' + str(freshness['error']) if freshness['stale'] else ''})")
+        print(f"     💻 {len(host['local_projects'])} projects | 🔌 "
+              f"{sum(1 for ok in host['mcp_servers'].values() if ok)}/{len(host['mcp_servers'])} MCP | 🔑 "
+              f"{sum(1 for ok in host['api_keys'].values() if ok)}/{len(host['api_keys'])} keys | "
+              f"📦 {len(host['github_repos'])} repos")
+        for recommendation in host['recommendations']:
+            print(f"     • {recommendation}")
+    print(f"\n📦 GitHub: {len(report['github_repos'])} repositories fetched once for the fleet")
+    print("\n" + "="*60)
@@ -0,0 +1,383 @@
+"""
+Concurrent GitHub API client for the health monitor
+Fans repository lookups out over a bounded thread pool sharing one keep-alive session
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+from health import graphql, signals
+from health.cache import ResponseCache
+from health.ratelimit import RateLimitTracker, resource_for
+
+if TYPE_CHECKING:
+    import requests
+
+# Status codes worth retrying; everything else is returned to the caller as-is
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+@dataclass
+class FetchConfig:
+    """Tuning knobs for GitHub fetches"""
+    api_url: str = 'https://api.github.com'
+    max_workers: int = 8
+    timeout: float = 10.0
+    retries: int = 2
+    backoff: float = 0.5
+    backend: str = 'rest'
+    batch_size: int = 50
+
+@dataclass
+class FetchResult:
+    """Outcome of a single API request"""
+    url: str
+    status_code: int = 0
+    # Decoded JSON: an object for single resources, a list for collections
+    data: Any = None
+    error: Optional[str] = None
+    attempts: int = 0
+    from_cache: bool = False
+    rate_limited: bool = False
+    # Optional signals fetched alongside a repository (see health.signals)
+    signals: Dict[str, Any] = field(default_factory=dict)
+    # Further requests made on this result's behalf (REST signal lookups, a batch's release-lag query)
+    requests: List['FetchResult'] = field(default_factory=list)
+    # False for all but the first repo of a GraphQL batch, so the shared request is timed once
+    owns_request: bool = True
+    started: float = 0.0
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code in (200, 304) and self.data is not None
+
+class GitHubClient:
+    """Thread-safe GitHub client with pooling, timeouts and retries"""
+
+    def __init__(
+        self,
+        token: str,
+        config: Optional[FetchConfig] = None,
+        cache: Optional[ResponseCache] = None,
+        limits: Optional[RateLimitTracker] = None
+    ) -> None:
+        self.config: FetchConfig = config or FetchConfig()
+        self.cache: Optional[ResponseCache] = cache
+        self.limits: Optional[RateLimitTracker] = limits
+        self.requests_made: int = 0
+        self.bytes_received: int = 0
+        self._stats_lock = threading.Lock()
+
+        # requests is imported here rather than at module load so that runs
+        # which never touch GitHub don't pay for the HTTP stack
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.session: 'requests.Session' = requests.Session()
+        self.session.headers.update({
+            'Authorization': f'token {token}',
+            'Accept': 'application/vnd.github.v3+json'
+        })
+
+        # One connection per worker so requests never queue on the pool
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max(1, self.config.max_workers)
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def repo_url(self, repo: str) -> str:
+        """Build the REST URL for a repository"""
+        return f"{self.config.api_url.rstrip('/')}/repos/{repo}"
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        result: FetchResult,
+        headers: Optional[Dict[str, str]] = None,
+        body: Optional[Dict[str, Any]] = None
+    ) -> Optional['requests.Response']:
+        """Send a request, retrying transient failures with exponential backoff
+        
+        With a rate-limit tracker, requests are not sent while the quota is
+        exhausted and rate-limit rejections are not retried.
+        """
+        result.started = time.perf_counter()
+        try:
+            return self._attempt(method, url, result, headers, body)
+        finally:
+            result.elapsed = time.perf_counter() - result.started
+
+    def _attempt(
+        self,
+        method: str,
+        url: str,
+        result: FetchResult,
+        headers: Optional[Dict[str, str]],
+        body: Optional[Dict[str, Any]]
+    ) -> Optional['requests.Response']:
+        import requests
+
+        resource: str = resource_for(url)
+        for attempt in range(self.config.retries + 1):
+            if self.limits and self.limits.blocked_until(resource):
+                result.rate_limited = True
+                result.error = f'rate limited ({resource})'
+                return None
+            result.attempts = attempt + 1
+            try:
+                response = self.session.request(
+                    method, url, headers=headers, json=body, timeout=self.config.timeout
+                )
+                with self._stats_lock:
+                    self.requests_made += 1
+                    self.bytes_received += len(response.content)
+                result.status_code = response.status_code
+                result.error = None
+
+                if self.limits and self.limits.observe(
+                    resource, response.status_code, response.headers,
+                    response.text if response.status_code in (403, 429) else ''
+                ):
+                    result.rate_limited = True
+                    result.error = f'rate limited ({resource})'
+                    return None
+                if response.status_code not in RETRYABLE_STATUS:
+                    return response
+                result.error = f'HTTP {response.status_code}'
+            except (requests.ConnectionError, requests.Timeout) as e:
+                with self._stats_lock:
+                    self.requests_made += 1
+                result.status_code = 0
+                result.error = str(e)
+
+            if attempt < self.config.retries:
+                time.sleep(self.config.backoff * (2 ** attempt))
+
+        return None
+
+    def get_json(self, url: str) -> FetchResult:
+        """GET a URL, revalidating against the response cache when possible"""
+        result = FetchResult(url=url)
+        cached = self.cache.get(url) if self.cache else None
+        headers: Dict[str, str] = cached.conditional_headers() if cached else {}
+
+        response = self._request('GET', url, result, headers=headers)
+        if response is None:
+            return result
+
+        if response.status_code == 304 and cached is not None and self.cache:
+            result.data = cached.body
+            result.from_cache = True
+            self.cache.record(hit=True)
+            self.cache.touch(url)
+        elif response.status_code == 200:
+            try:
+                result.data = response.json()
+            except ValueError as e:
+                result.error = f'Invalid JSON: {e}'
+                return result
+            if self.cache:
+                self.cache.record(hit=False)
+                self.cache.put(
+                    url,
+                    result.data,
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified')
+                )
+        else:
+            result.error = f'HTTP {response.status_code}'
+        return result
+
+    def post_json(self, url: str, body: Dict[str, Any]) -> FetchResult:
+        """POST a JSON body and decode the JSON response"""
+        result = FetchResult(url=url)
+
+        response = self._request('POST', url, result, body=body)
+        if response is None:
+            return result
+
+        if response.status_code == 200:
+            try:
+                result.data = response.json()
+            except ValueError as e:
+                result.error = f'Invalid JSON: {e}'
+        else:
+            result.error = f'HTTP {response.status_code}'
+        return result
+
+    def fetch_signals(
+        self,
+        repo: str,
+        data: Dict[str, Any],
+        checks: List[str],
+        requests: Optional[List[FetchResult]] = None
+    ) -> Dict[str, Any]:
+        """Signals for one repository over REST: at most two conditional requests per check
+
+        Each request's result is appended to `requests`, for timing.
+        """
+        made: List[FetchResult] = requests if requests is not None else []
+
+        def get(url: str) -> FetchResult:
+            made.append(self.get_json(url))
+            return made[-1]
+
+        base: str = self.repo_url(repo)
+        branch: str = quote(data.get('default_branch') or 'HEAD', safe='')
+        found: Dict[str, Any] = {}
+        if 'ci' in checks:
+            status = get(f'{base}/commits/{branch}/status')
+            runs = get(f'{base}/commits/{branch}/check-runs?filter=latest&per_page=100')
+            found['ci'] = signals.rest_ci_state(status.data if status.ok else None, runs.data if runs.ok else None)
+        if 'prs' in checks:
+            pulls = get(f'{base}/pulls?state=open&sort=created&direction=asc&per_page=1')
+            found['oldest_pr'] = pulls.data[0].get('created_at') if pulls.ok and pulls.data else None
+        if 'releases' in checks:
+            latest = get(f'{base}/releases/latest')
+            release: Dict[str, Any] = latest.data if latest.ok else {}
+            found['release'] = release.get('tag_name')
+            found['released_at'] = release.get('published_at')
+            found['unreleased_commits'] = None
+            if found['release']:
+                compare = get(f"{base}/compare/{quote(found['release'], safe='')}...{branch}")
+                if compare.ok:
+                    found['unreleased_commits'] = compare.data.get('ahead_by')
+        return found
+
+    def _fetch_repo(self, repo: str, checks: List[str]) -> FetchResult:
+        result: FetchResult = self.get_json(self.repo_url(repo))
+        if checks and result.ok:
+            result.signals = self.fetch_signals(repo, result.data, checks, result.requests)
+        return result
+
+    def iter_repos(
+        self,
+        repos: List[str],
+        checks: Optional[Dict[str, List[str]]] = None
+    ) -> Iterator[Tuple[str, FetchResult]]:
+        """Yield (repo, result) pairs as each concurrent REST fetch completes
+
+        `checks` maps repositories to the signal checks to fetch with them.
+        """
+        if not repos:
+            return
+
+        checks = checks or {}
+        workers: int = max(1, min(self.config.max_workers, len(repos)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(self._fetch_repo, repo, signals.wanted(checks.get(repo))): repo for repo in repos
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+        if self.cache:
+            self.cache.prune()
+
+    def fetch_repos(self, repos: List[str], checks: Optional[Dict[str, List[str]]] = None) -> Dict[str, FetchResult]:
+        """Fetch metadata for all repositories concurrently"""
+        results: Dict[str, FetchResult] = dict(self.iter_repos(repos, checks))
+        return {repo: results[repo] for repo in repos}
+
+    def _run_batch(self, url: str, batch: List[str], checks: Dict[str, List[str]]) -> Dict[str, FetchResult]:
+        """Fetch one chunk of repositories with a single GraphQL query
+
+        Signal fields ride along in the same query; release lag takes one more
+        query for the whole chunk.
+        """
+        wanted: List[str] = [
+            check for check in signals.SIGNAL_CHECKS if any(check in checks.get(repo, []) for repo in batch)
+        ]
+        query, variables = graphql.build_query(batch, wanted)
+        response = self.post_json(url, {'query': query, 'variables': variables})
+        if not response.ok or response.data is None:
+            return {
+                repo: FetchResult(
+                    url=url,
+                    status_code=response.status_code,
+                    error=response.error,
+                    attempts=response.attempts,
+                    rate_limited=response.rate_limited,
+                    started=response.started,
+                    elapsed=response.elapsed,
+                    owns_request=index == 0
+                )
+                for index, repo in enumerate(batch)
+            }
+
+        results: Dict[str, FetchResult] = {}
+        nodes: Dict[str, Any] = response.data.get('data') or {}
+        for index, (repo, (data, error)) in enumerate(graphql.split_response(batch, response.data).items()):
+            results[repo] = FetchResult(
+                url=url,
+                status_code=200 if data is not None else 404,
+                data=data,
+                error=error,
+                attempts=response.attempts,
+                started=response.started,
+                elapsed=response.elapsed,
+                owns_request=index == 0
+            )
+            if data is not None and checks.get(repo):
+                results[repo].signals = signals.graphql_signals(nodes[f'r{index}'], checks[repo])
+        self._add_release_lag(url, results)
+        return results
+
+    def _add_release_lag(self, url: str, results: Dict[str, FetchResult]) -> None:
+        """Fill unreleased_commits for every released repository in one compare query"""
+        releases: List[Tuple[str, str, str]] = [
+            (repo, result.signals['release'], result.data['default_branch'])
+            for repo, result in results.items()
+            if result.signals.get('release') and result.data.get('default_branch')
+        ]
+        if not releases:
+            return
+        query, variables = graphql.build_compare_query(releases)
+        response = self.post_json(url, {'query': query, 'variables': variables})
+        next(iter(results.values())).requests.append(response)
+        if not response.ok:
+            return
+        data: Dict[str, Any] = response.data.get('data') or {}
+        for index, (repo, _, _) in enumerate(releases):
+            ref: Dict[str, Any] = (data.get(f'r{index}') or {}).get('ref') or {}
+            results[repo].signals['unreleased_commits'] = (ref.get('compare') or {}).get('aheadBy')
+
+    def iter_repos_batched(
+        self,
+        repos: List[str],
+        checks: Optional[Dict[str, List[str]]] = None
+    ) -> Iterator[Tuple[str, FetchResult]]:
+        """Yield (repo, result) pairs as each GraphQL chunk completes"""
+        if not repos:
+            return
+
+        wanted: Dict[str, List[str]] = {
+            repo: signals.wanted(repo_checks) for repo, repo_checks in (checks or {}).items()
+        }
+        url: str = f"{self.config.api_url.rstrip('/')}/graphql"
+        batches: List[List[str]] = graphql.chunk(repos, self.config.batch_size)
+        workers: int = max(1, min(self.config.max_workers, len(batches)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(self._run_batch, url, batch, wanted) for batch in batches]
+            for future in as_completed(futures):
+                yield from future.result().items()
+
+    def fetch_repos_batched(
+        self,
+        repos: List[str],
+        checks: Optional[Dict[str, List[str]]] = None
+    ) -> Dict[str, FetchResult]:
+        """Fetch metadata through aliased GraphQL queries, one request per chunk"""
+        results: Dict[str, FetchResult] = dict(self.iter_repos_batched(repos, checks))
+        return {repo: results[repo] for repo in repos}
+
+    def close(self) -> None:
+        """Release pooled connections"""
+        self.session.close()
@@ -0,0 +1,87 @@
+"""
+Dirty-file counts from git status, optionally from a warm state
+Warm mode lets git keep state between runs: the untracked cache is stored in the
+index and, where git ships the builtin fsmonitor daemon, a long-lived watcher
+per repository answers which paths changed instead of a full worktree scan
+"""
+
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# No index refresh, so no .git/index.lock churn for watchers to see; warm mode keeps
+# the optional write because that is where the untracked cache is stored
+COLD_COMMAND: List[str] = ['git', '--no-optional-locks', 'status', '--porcelain']
+
+class GitStatusReader:
+    """Count uncommitted changes per repository"""
+
+    def __init__(self, warm: bool = False) -> None:
+        self.warm: bool = warm
+        self._fsmonitor: Optional[bool] = None
+        self._failed: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    def fsmonitor_supported(self) -> bool:
+        """Whether this git build ships the builtin fsmonitor daemon"""
+        if self._fsmonitor is None:
+            supported: bool = False
+            if sys.platform in ('darwin', 'win32'):
+                try:
+                    result = subprocess.run(
+                        ['git', 'version', '--build-options'],
+                        capture_output=True,
+                        text=True
+                    )
+                    supported = 'fsmonitor--daemon' in result.stdout
+                except OSError:
+                    pass
+            self._fsmonitor = supported
+        return self._fsmonitor
+
+    def warm_command(self) -> List[str]:
+        """git status with the state-keeping features switched on for this call only"""
+        options: List[str] = ['-c', 'core.untrackedCache=true']
+        if self.fsmonitor_supported():
+            options += ['-c', 'core.fsmonitor=true']
+        return ['git'] + options + ['status', '--porcelain']
+
+    def count_changes(self, path: Path, timeout: Optional[float] = None) -> int:
+        """Number of porcelain status lines, falling back to a cold run if warm mode fails"""
+        key: str = str(path)
+        with self._lock:
+            use_warm: bool = self.warm and not self._failed.get(key, False)
+
+        if use_warm:
+            result = self._run(self.warm_command(), path, timeout)
+            if result is not None and result.returncode == 0:
+                return _count_lines(result.stdout)
+            with self._lock:
+                self._failed[key] = True
+
+        result = self._run(COLD_COMMAND, path, timeout)
+        if result is None or result.returncode != 0:
+            return 0
+        return _count_lines(result.stdout)
+
+    def stop(self, path: Path) -> None:
+        """Stop the fsmonitor daemon for a repository, if one was started"""
+        if self.fsmonitor_supported():
+            self._run(['git', 'fsmonitor--daemon', 'stop'], path, None)
+
+    def _run(
+        self,
+        command: List[str],
+        path: Path,
+        timeout: Optional[float]
+    ) -> Optional['subprocess.CompletedProcess[str]']:
+        try:
+            return subprocess.run(command, cwd=path, capture_output=True, text=True, timeout=timeout)
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+def _count_lines(output: str) -> int:
+    stripped: str = output.strip()
+    return len(stripped.split('\n')) if stripped else 0
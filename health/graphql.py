@@ -0,0 +1,112 @@
+"""
+Batched GraphQL queries for repository metadata
+Requests only the fields the health checks use, many repositories per round trip
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+REPO_FIELDS: str = """
+    name
+    stargazerCount
+    forkCount
+    pushedAt
+    issues(states: OPEN) { totalCount }
+    pullRequests(states: OPEN) { totalCount }
+"""
+
+# Extra selections for the optional signal checks; the branch name is needed for release lag
+SIGNAL_FIELDS: Dict[str, str] = {
+    'ci': 'defaultBranchRef { name target { ... on Commit { statusCheckRollup { state } } } }',
+    'prs': 'oldestPullRequest: pullRequests(states: OPEN, first: 1, orderBy: {field: CREATED_AT, direction: ASC}) '
+           '{ nodes { createdAt } }',
+    'releases': 'defaultBranchRef { name } latestRelease { tagName publishedAt }'
+}
+
+def chunk(repos: List[str], size: int) -> List[List[str]]:
+    """Split the repository list into query-sized batches"""
+    size = max(1, size)
+    return [repos[i:i + size] for i in range(0, len(repos), size)]
+
+def build_query(repos: List[str], signals: Optional[List[str]] = None) -> Tuple[str, Dict[str, str]]:
+    """Build one aliased query (r0, r1, ...) with owner/name passed as variables
+
+    `signals` adds the fields for those checks to every repository in the batch.
+    """
+    params: List[str] = []
+    selections: List[str] = []
+    variables: Dict[str, str] = {}
+    fields: str = REPO_FIELDS + ''.join(f'    {SIGNAL_FIELDS[check]}\n' for check in signals or [])
+
+    for index, repo in enumerate(repos):
+        owner, _, name = repo.partition('/')
+        params.append(f'$o{index}: String!, $n{index}: String!')
+        selections.append(
+            f'r{index}: repository(owner: $o{index}, name: $n{index}) {{{fields}}}'
+        )
+        variables[f'o{index}'] = owner
+        variables[f'n{index}'] = name
+
+    query: str = f"query({', '.join(params)}) {{\n" + '\n'.join(selections) + '\n}'
+    return query, variables
+
+def build_compare_query(releases: List[Tuple[str, str, str]]) -> Tuple[str, Dict[str, str]]:
+    """Query commits on each default branch since its latest release tag
+
+    `releases` holds (repo, tag, branch); the result for each is at rN.ref.compare.aheadBy.
+    """
+    params: List[str] = []
+    selections: List[str] = []
+    variables: Dict[str, str] = {}
+
+    for index, (repo, tag, branch) in enumerate(releases):
+        owner, _, name = repo.partition('/')
+        params.append(f'$o{index}: String!, $n{index}: String!, $t{index}: String!, $b{index}: String!')
+        selections.append(
+            f'r{index}: repository(owner: $o{index}, name: $n{index}) '
+            f'{{ ref(qualifiedName: $t{index}) {{ compare(headRef: $b{index}) {{ aheadBy }} }} }}'
+        )
+        variables.update({
+            f'o{index}': owner, f'n{index}': name, f't{index}': f'refs/tags/{tag}', f'b{index}': branch
+        })
+
+    query: str = f"query({', '.join(params)}) {{\n" + '\n'.join(selections) + '\n}'
+    return query, variables
+
+def to_rest_shape(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a GraphQL repository node onto the REST field names
+
+    REST's open_issues_count includes open pull requests, so both are summed.
+    """
+    shape: Dict[str, Any] = {
+        'name': node['name'],
+        'stargazers_count': node['stargazerCount'],
+        'forks_count': node['forkCount'],
+        'open_issues_count': node['issues']['totalCount'] + node['pullRequests']['totalCount'],
+        'pushed_at': node['pushedAt']
+    }
+    if node.get('defaultBranchRef'):
+        shape['default_branch'] = node['defaultBranchRef']['name']
+    return shape
+
+def split_response(
+    repos: List[str],
+    payload: Dict[str, Any]
+) -> Dict[str, Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+    """Map a batched response back to (data, error) per repository"""
+    data: Dict[str, Any] = payload.get('data') or {}
+    errors: Dict[str, str] = {}
+
+    for error in payload.get('errors') or []:
+        path: List[Any] = error.get('path') or []
+        if path:
+            errors[str(path[0])] = error.get('message', 'GraphQL error')
+
+    results: Dict[str, Tuple[Optional[Dict[str, Any]], Optional[str]]] = {}
+    for index, repo in enumerate(repos):
+        alias: str = f'r{index}'
+        node: Optional[Dict[str, Any]] = data.get(alias)
+        if node:
+            results[repo] = (to_rest_shape(node), None)
+        else:
+            results[repo] = (None, errors.get(alias, 'Repository not returned'))
+    return results
@@ -0,0 +1,239 @@
+"""
+Time-series history of health reports
+Append-only SQLite store indexed by timestamp and entity, with downsampling,
+retention and an importer for the per-run JSON report files
+"""
+
+import datetime
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_HISTORY_PATH: Path = Path.home() / "AI projects" / "health-reports" / "history.sqlite3"
+
+# Report sections stored as one sample row per entity
+SECTIONS: List[str] = ['github_repos', 'local_projects', 'mcp_servers', 'api_keys']
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL UNIQUE,
+    overall_health TEXT NOT NULL,
+    recommendations TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS samples (
+    report_id INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    section TEXT NOT NULL,
+    entity TEXT NOT NULL,
+    status TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_samples_entity_ts ON samples(entity, ts);
+CREATE INDEX IF NOT EXISTS idx_samples_ts ON samples(ts);
+CREATE INDEX IF NOT EXISTS idx_samples_report ON samples(report_id);
+"""
+
+Point = Tuple[datetime.datetime, Any]
+
+def _epoch(value: datetime.datetime) -> float:
+    return value.timestamp()
+
+def _from_epoch(value: float) -> datetime.datetime:
+    return datetime.datetime.fromtimestamp(value)
+
+class HealthHistory:
+    """Append-only store of HealthReport snapshots"""
+
+    def __init__(self, path: Path = DEFAULT_HISTORY_PATH) -> None:
+        self.path: Path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def add(self, report: Dict[str, Any]) -> bool:
+        """Ingest a plain report dict (as produced by report_to_dict or read from a JSON file)
+
+        Returns False if a report with the same timestamp is already stored.
+        """
+        ts: float = _epoch(datetime.datetime.fromisoformat(report['timestamp']))
+        # Old or hand-written report files may lack an overall status
+        overall: str = _status(report.get('overall_health')) or 'unknown'
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                'INSERT OR IGNORE INTO reports (ts, overall_health, recommendations) VALUES (?, ?, ?)',
+                (ts, overall, json.dumps(report.get('recommendations', [])))
+            )
+            if cursor.rowcount == 0:
+                return False
+            report_id: Optional[int] = cursor.lastrowid
+
+            rows: List[Tuple[Optional[int], float, str, str, Optional[str], str]] = []
+            for section in SECTIONS:
+                for entity, entry in (report.get(section) or {}).items():
+                    if isinstance(entry, dict):
+                        data: Dict[str, Any] = {k: v for k, v in entry.items() if k != 'status'}
+                        status: Optional[str] = _status(entry.get('status'))
+                    else:
+                        data = {'value': entry}
+                        status = None
+                    rows.append((
+                        report_id, ts, section, entity, status,
+                        json.dumps(data, separators=(',', ':'))
+                    ))
+            self._conn.executemany(
+                'INSERT INTO samples (report_id, ts, section, entity, status, data) VALUES (?, ?, ?, ?, ?, ?)',
+                rows
+            )
+        return True
+
+    def import_json_reports(self, directory: Path) -> int:
+        """Import existing health-report-*.json files; already-imported runs are skipped"""
+        imported: int = 0
+        for report_file in sorted(directory.glob('health-report-*.json')):
+            try:
+                report: Dict[str, Any] = json.loads(report_file.read_text())
+            except (OSError, ValueError):
+                continue
+            if 'timestamp' in report and self.add(report):
+                imported += 1
+        return imported
+
+    def reports(
+        self,
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """Report-level summaries (timestamp, overall health, recommendations) in a time range"""
+        where, params = _range_clause(start, end)
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT ts, overall_health, recommendations FROM reports {where} ORDER BY ts', params
+            ).fetchall()
+        return [
+            {
+                'timestamp': _from_epoch(ts).isoformat(),
+                'overall_health': overall,
+                'recommendations': json.loads(recommendations)
+            }
+            for ts, overall, recommendations in rows
+        ]
+
+    def entity_samples(
+        self,
+        entity: str,
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None,
+        section: Optional[str] = None
+    ) -> Iterator[Tuple[datetime.datetime, Optional[str], Dict[str, Any]]]:
+        """Every stored (timestamp, status, fields) sample for one entity"""
+        where, params = _range_clause(start, end, prefix='AND')
+        query: str = f'SELECT ts, status, data FROM samples WHERE entity = ? {where}'
+        args: List[Any] = [entity] + params
+        if section:
+            query += ' AND section = ?'
+            args.append(section)
+        with self._lock:
+            rows = self._conn.execute(query + ' ORDER BY ts', args).fetchall()
+        for ts, status, data in rows:
+            yield _from_epoch(ts), status, json.loads(data)
+
+    def series(
+        self,
+        entity: str,
+        field: str,
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None
+    ) -> List[Point]:
+        """One field of one entity over time ('status' is accepted as a field)"""
+        points: List[Point] = []
+        for ts, status, data in self.entity_samples(entity, start, end):
+            value: Any = status if field == 'status' else data.get(field)
+            if value is not None:
+                points.append((ts, value))
+        return points
+
+    def downsample(
+        self,
+        entity: str,
+        field: str,
+        bucket_seconds: float,
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """Numeric series aggregated into fixed-width buckets (min/max/avg/last)"""
+        buckets: Dict[int, List[float]] = {}
+        for ts, value in self.series(entity, field, start, end):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            buckets.setdefault(int(_epoch(ts) // bucket_seconds), []).append(float(value))
+
+        return [
+            {
+                'start': _from_epoch(key * bucket_seconds).isoformat(),
+                'count': len(values),
+                'min': min(values),
+                'max': max(values),
+                'avg': round(sum(values) / len(values), 3),
+                'last': values[-1]
+            }
+            for key, values in sorted(buckets.items())
+        ]
+
+    def compact(self, before: datetime.datetime, bucket_seconds: float) -> int:
+        """Keep only the last report per bucket for history older than `before`"""
+        cutoff: float = _epoch(before)
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                'SELECT id, ts FROM reports WHERE ts < ? ORDER BY ts', (cutoff,)
+            ).fetchall()
+            keep: Dict[int, int] = {}
+            for report_id, ts in rows:
+                keep[int(ts // bucket_seconds)] = report_id
+            kept = set(keep.values())
+            drop: List[Tuple[int]] = [(report_id,) for report_id, _ in rows if report_id not in kept]
+            self._delete(drop)
+        return len(drop)
+
+    def prune(self, before: datetime.datetime) -> int:
+        """Delete all history older than `before`"""
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                'SELECT id FROM reports WHERE ts < ?', (_epoch(before),)
+            ).fetchall()
+            self._delete([(report_id,) for report_id, in rows])
+        return len(rows)
+
+    def _delete(self, report_ids: List[Tuple[int]]) -> None:
+        self._conn.executemany('DELETE FROM samples WHERE report_id = ?', report_ids)
+        self._conn.executemany('DELETE FROM reports WHERE id = ?', report_ids)
+
+def _status(value: Any) -> Optional[str]:
+    """Status as text whether it arrives as a HealthStatus or an already-serialised string"""
+    if value is None:
+        return None
+    return str(getattr(value, 'value', value))
+
+def _range_clause(
+    start: Optional[datetime.datetime],
+    end: Optional[datetime.datetime],
+    prefix: str = 'WHERE'
+) -> Tuple[str, List[Any]]:
+    clauses: List[str] = []
+    params: List[Any] = []
+    if start is not None:
+        clauses.append('ts >= ?')
+        params.append(_epoch(start))
+    if end is not None:
+        clauses.append('ts < ?')
+        params.append(_epoch(end))
+    if not clauses:
+        return '', params
+    return f"{prefix} {' AND '.join(clauses)}", params
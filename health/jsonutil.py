@@ -0,0 +1,17 @@
+"""
+JSON helpers shared by the report writers
+"""
+
+import json
+from enum import Enum
+from typing import Any
+
+def json_default(value: Any) -> Any:
+    """Serialise enums nested inside report TypedDicts"""
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def plain(value: Any) -> Any:
+    """Deep copy of a report structure with enums replaced by their values"""
+    return json.loads(json.dumps(value, default=json_default))
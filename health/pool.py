@@ -0,0 +1,127 @@
+"""
+Bounded worker pool with per-job timeouts
+Uses daemon threads so a job stuck on a hung mount never blocks the report or interpreter exit
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Generic, Iterator, List, Optional, Set, Tuple, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+@dataclass
+class JobResult(Generic[T, R]):
+    """Outcome of one job"""
+    item: T
+    value: Optional[R] = None
+    error: Optional[BaseException] = None
+    timed_out: bool = False
+    seconds: float = 0.0
+
+def run_bounded(
+    func: Callable[[T], R],
+    items: List[T],
+    workers: int,
+    timeout: Optional[float] = None,
+    item_timeout: Optional[Callable[[T], Optional[float]]] = None
+) -> List[JobResult[T, R]]:
+    """Run func over items with at most `workers` running at once
+
+    A job that exceeds `timeout` seconds (or `item_timeout(item)`, when given)
+    is reported as timed out and its thread is abandoned; a replacement worker
+    keeps the pool at full width. Results are returned in the order of `items`.
+    """
+    results: Dict[int, JobResult[T, R]] = dict(iter_bounded(func, items, workers, timeout, item_timeout))
+    return [results[index] for index in range(len(items))]
+
+def iter_bounded(
+    func: Callable[[T], R],
+    items: List[T],
+    workers: int,
+    timeout: Optional[float] = None,
+    item_timeout: Optional[Callable[[T], Optional[float]]] = None
+) -> Iterator[Tuple[int, JobResult[T, R]]]:
+    """Like run_bounded, but yield (index, result) as each job finishes or times out"""
+    results: List[JobResult[T, R]] = [JobResult(item=item) for item in items]
+    if not items:
+        return
+    limits: List[Optional[float]] = [
+        item_timeout(item) if item_timeout is not None else timeout for item in items
+    ]
+
+    pending: 'queue.Queue[int]' = queue.Queue()
+    for index in range(len(items)):
+        pending.put(index)
+    done: 'queue.Queue[Tuple[int, Optional[R], Optional[BaseException], float]]' = queue.Queue()
+
+    lock = threading.Lock()
+    started: Dict[int, float] = {}
+    abandoned: Set[int] = set()
+
+    def worker() -> None:
+        while True:
+            try:
+                index: int = pending.get_nowait()
+            except queue.Empty:
+                return
+            begin: float = time.monotonic()
+            with lock:
+                started[index] = begin
+            try:
+                value: Optional[R] = func(items[index])
+                done.put((index, value, None, time.monotonic() - begin))
+            except BaseException as e:
+                done.put((index, None, e, time.monotonic() - begin))
+            with lock:
+                if index in abandoned:
+                    return
+
+    def spawn() -> None:
+        threading.Thread(target=worker, daemon=True).start()
+
+    for _ in range(max(1, min(workers, len(items)))):
+        spawn()
+
+    finished: Set[int] = set()
+    while len(finished) < len(items):
+        wait: Optional[float] = None
+
+        if any(limit is not None for limit in limits):
+            now: float = time.monotonic()
+            with lock:
+                running: List[Tuple[int, float, float]] = [
+                    (index, begin, limit) for index, begin in started.items()
+                    if index not in finished and (limit := limits[index]) is not None
+                ]
+            for index, begin, limit in running:
+                if now - begin >= limit:
+                    with lock:
+                        abandoned.add(index)
+                    finished.add(index)
+                    results[index].timed_out = True
+                    results[index].seconds = now - begin
+                    yield index, results[index]
+                    if not pending.empty():
+                        spawn()
+            if len(finished) >= len(items):
+                break
+            deadlines: List[float] = [
+                begin + limit - now for index, begin, limit in running if index not in finished
+            ]
+            wait = max(0.0, min(deadlines)) if deadlines else 0.05
+
+        try:
+            index, value, error, seconds = done.get(timeout=wait)
+        except queue.Empty:
+            continue
+        if index in finished:
+            # Late result from a job already reported as timed out
+            continue
+        finished.add(index)
+        results[index].value = value
+        results[index].error = error
+        results[index].seconds = seconds
+        yield index, results[index]
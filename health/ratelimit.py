@@ -0,0 +1,211 @@
+"""
+Rate-limit-aware scheduling of GitHub repository refreshes
+Tracks the quota GitHub reports in response headers across runs, spends it on
+the most urgent repositories first and paces it over the reset window; repos
+left out of a run keep their last-known-good data, marked stale
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+DEFAULT_STATE_PATH: Path = Path.home() / '.cache' / 'project-health' / 'github-schedule.json'
+
+# GitHub asks clients hit by a secondary limit without Retry-After to wait at least a minute
+SECONDARY_LIMIT_WAIT: float = 60.0
+
+# Repositories in these states are refreshed before healthy ones
+URGENT_STATUSES = frozenset({'error', 'warning', 'unknown'})
+
+def resource_for(url: str) -> str:
+    """Quota bucket a request draws from"""
+    return 'graphql' if url.rstrip('/').endswith('/graphql') else 'core'
+
+@dataclass
+class RateLimit:
+    """Last quota GitHub reported for one resource"""
+    limit: int = 0
+    remaining: int = 0
+    reset: float = 0.0
+    blocked_until: float = 0.0
+
+class RateLimitTracker:
+    """Thread-safe record of the X-RateLimit-* and Retry-After headers seen per resource"""
+
+    def __init__(self) -> None:
+        self.limits: Dict[str, RateLimit] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, resource: str, status_code: int, headers: Mapping[str, str], body: str = '') -> bool:
+        """Update the quota from a response; True if the response was a rate-limit rejection"""
+        now: float = time.time()
+        with self._lock:
+            state: RateLimit = self.limits.setdefault(headers.get('X-RateLimit-Resource') or resource, RateLimit())
+            try:
+                if 'X-RateLimit-Remaining' in headers:
+                    state.remaining = int(headers['X-RateLimit-Remaining'])
+                    state.limit = int(headers.get('X-RateLimit-Limit', state.limit))
+                    state.reset = float(headers.get('X-RateLimit-Reset', state.reset))
+            except ValueError:
+                pass
+            if status_code not in (403, 429):
+                return False
+
+            retry_after: Optional[str] = headers.get('Retry-After')
+            if retry_after is not None and retry_after.isdigit():
+                state.blocked_until = max(state.blocked_until, now + int(retry_after))
+            elif 'X-RateLimit-Remaining' in headers and state.remaining == 0:
+                state.blocked_until = max(state.blocked_until, state.reset)
+            elif status_code == 429 or 'rate limit' in body.lower():
+                state.blocked_until = max(state.blocked_until, now + SECONDARY_LIMIT_WAIT)
+            else:
+                # A plain 403 is a permissions problem, not a quota one
+                return False
+            return True
+
+    def blocked_until(self, resource: str) -> float:
+        """Epoch seconds until which requests against `resource` should not be sent (0 if none)"""
+        with self._lock:
+            state: Optional[RateLimit] = self.limits.get(resource)
+            if state is None:
+                return 0.0
+            return state.blocked_until if state.blocked_until > time.time() else 0.0
+
+    def allowance(self, resource: str, interval: float, reserve: int) -> Optional[int]:
+        """Requests this run may spend so the quota lasts until it resets; None when unconstrained
+
+        The quota above `reserve` is split evenly across the runs, `interval`
+        seconds apart, that still fall before the reset.
+        """
+        now: float = time.time()
+        with self._lock:
+            state: Optional[RateLimit] = self.limits.get(resource)
+            if state is None:
+                return None
+            if state.blocked_until > now:
+                return 0
+            if state.reset <= now:
+                # The window rolled over since we last heard; the quota is full again
+                return None
+            usable: int = max(0, state.remaining - reserve)
+            runs: float = max(1.0, (state.reset - now) / max(interval, 1.0))
+            return int(math.ceil(usable / runs))
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: vars(state).copy() for name, state in self.limits.items()}
+
+    def restore(self, raw: Dict[str, Dict[str, Any]]) -> None:
+        with self._lock:
+            for name, values in raw.items():
+                try:
+                    self.limits[name] = RateLimit(
+                        limit=int(values.get('limit', 0)),
+                        remaining=int(values.get('remaining', 0)),
+                        reset=float(values.get('reset', 0.0)),
+                        blocked_until=float(values.get('blocked_until', 0.0))
+                    )
+                except (TypeError, ValueError):
+                    continue
+
+class GitHubScheduler:
+    """Persistent quota and per-repository refresh history deciding what each run fetches"""
+
+    def __init__(self, path: Optional[Path] = DEFAULT_STATE_PATH, reserve: int = 100) -> None:
+        self.path: Optional[Path] = path
+        self.reserve: int = reserve
+        self.tracker: RateLimitTracker = RateLimitTracker()
+        self._repos: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._loaded: bool = False
+
+    def load(self) -> None:
+        self._loaded = True
+        if not self.path or not self.path.exists():
+            return
+        try:
+            raw: Dict[str, Any] = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        self.tracker.restore(raw.get('limits', {}))
+        self._repos = raw.get('repos', {})
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.load()
+
+    def _urgency(self, repo: str) -> Tuple[int, float]:
+        record: Optional[Dict[str, Any]] = self._repos.get(repo)
+        if record is None:
+            return (0, 0.0)
+        return (0 if record.get('status') in URGENT_STATUSES else 1, float(record.get('checked', 0.0)))
+
+    def plan(
+        self,
+        repos: List[str],
+        resource: str,
+        interval: float,
+        cost: Callable[[str], float] = lambda repo: 1.0
+    ) -> Tuple[List[str], List[str]]:
+        """Split repos into (fetch now, defer), unhealthy and longest-unchecked first
+
+        `cost` is the most requests a repo's refresh can take (a fraction when
+        batched); repos are taken in order while they fit the allowance, and
+        any allowance at all covers at least the first.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            ordered: List[str] = sorted(repos, key=self._urgency)
+        allowance: Optional[int] = self.tracker.allowance(resource, interval, self.reserve)
+        if allowance is None:
+            return ordered, []
+        spent: float = 0.0
+        for count, repo in enumerate(ordered):
+            spent += cost(repo)
+            if spent > allowance + 1e-9 and (count > 0 or allowance == 0):
+                return ordered[:count], ordered[count:]
+        return ordered, []
+
+    def record(self, repo: str, info: Mapping[str, Any], fetched: bool) -> None:
+        """Remember a refresh; fetched results also become the repo's last-known-good data"""
+        self._ensure_loaded()
+        status: Any = info['status']
+        with self._lock:
+            record: Dict[str, Any] = self._repos.setdefault(repo, {})
+            record['checked'] = time.time()
+            record['status'] = getattr(status, 'value', status)
+            if fetched:
+                record['good'] = {key: getattr(value, 'value', value) for key, value in info.items()}
+                record['good_at'] = record['checked']
+
+    def last_good(self, repo: str) -> Optional[Dict[str, Any]]:
+        """The repo's last successfully fetched info and when it was fetched"""
+        self._ensure_loaded()
+        with self._lock:
+            record: Optional[Dict[str, Any]] = self._repos.get(repo)
+            if not record or 'good' not in record:
+                return None
+            return dict(record['good'], checked_at=record.get('good_at', 0.0))
+
+    def describe(self, resource: str) -> str:
+        """Human-readable quota state for log lines"""
+        state: Optional[Dict[str, Any]] = self.tracker.snapshot().get(resource)
+        if state is None:
+            return 'quota unknown'
+        until: float = max(state['blocked_until'], state['reset'])
+        return f"{state['remaining']}/{state['limit']} left until {time.strftime('%H:%M:%S', time.localtime(until))}"
+
+    def save(self) -> None:
+        if not self.path or not self._loaded:
+            return
+        with self._lock:
+            payload: str = json.dumps({'limits': self.tracker.snapshot(), 'repos': self._repos})
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp_path.write_text(payload)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,262 @@
+"""
+Server mode for the health monitor
+One resident monitor keeps each report section cached with its own freshness
+TTL and serves it over localhost HTTP or a Unix socket, with ETags for
+conditional fetches and one refresh at a time per section
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Type
+from urllib.parse import parse_qs, urlsplit
+
+from health.jsonutil import plain
+from health.timing import Timings
+
+if TYPE_CHECKING:
+    from project_health_monitor import ProjectHealthMonitor
+
+@dataclass
+class SectionState:
+    """Latest result of one section, plus the lock that serialises its refreshes"""
+    name: str
+    ttl: float
+    fields: Optional[Dict[str, Any]] = None
+    etag: str = ''
+    updated: float = 0.0
+    seconds: float = 0.0
+    refreshes: int = 0
+    error: Optional[str] = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def age(self) -> float:
+        return time.time() - self.updated if self.updated else float('inf')
+
+    def is_fresh(self, max_age: Optional[float] = None) -> bool:
+        limit: float = self.ttl if max_age is None else min(self.ttl, max_age)
+        return self.fields is not None and self.age() <= limit
+
+    def freshness(self) -> Dict[str, Any]:
+        return {
+            'updated': datetime.datetime.fromtimestamp(self.updated).isoformat() if self.updated else None,
+            'age_s': round(self.age(), 3) if self.updated else None,
+            'ttl_s': self.ttl,
+            'seconds': round(self.seconds, 4),
+            'refreshes': self.refreshes,
+            'error': self.error
+        }
+
+class HealthServer:
+    """Per-section report cache shared by every client connection"""
+
+    def __init__(self, monitor: 'ProjectHealthMonitor', ttls: Optional[Dict[str, float]] = None) -> None:
+        self.monitor = monitor
+        # --serve-ttl values win; other sections follow the config's intervals
+        self.ttls: Dict[str, float] = dict(ttls or {})
+        merged: Dict[str, float] = self._merged_ttls()
+        names: List[str] = list(monitor.checks) + (['tests'] if monitor.run_tests else [])
+        self.sections: Dict[str, SectionState] = {
+            name: SectionState(name, merged[name]) for name in names
+        }
+        self._stop = threading.Event()
+
+    def _merged_ttls(self) -> Dict[str, float]:
+        return dict(self.monitor.config.intervals(), **self.ttls)
+
+    def _collect(self, name: str) -> Dict[str, Any]:
+        """Run one section's check and return the HealthReport fields it fills"""
+        monitor = self.monitor
+        monitor.refresh_config()
+        merged: Dict[str, float] = self._merged_ttls()
+        for state in self.sections.values():
+            state.ttl = merged[state.name]
+        if name == 'github':
+            fields: Dict[str, Any] = {'github_repos': monitor.check_github_status()}
+            if monitor.github_cache:
+                fields['github_cache'] = monitor.github_cache.stats()
+            return fields
+        if name == 'local':
+            return {'local_projects': monitor.check_local_projects()}
+        if name == 'mcp':
+            return {'mcp_servers': monitor.check_mcp_servers()}
+        if name == 'api':
+            return {'api_keys': monitor.check_api_keys()}
+        tests, durations = monitor.check_project_tests()
+        return {'tests': tests, 'test_durations': durations}
+
+    def section(self, name: str, max_age: Optional[float] = None, force: bool = False) -> SectionState:
+        """Current state of a section, refreshed first if it is stale
+
+        Concurrent callers queue on the section lock; whoever gets it after a
+        refresh finds the section fresh again and returns without re-running it.
+        """
+        state: SectionState = self.sections[name]
+        requested: float = time.time()
+        if not force and state.is_fresh(max_age):
+            return state
+        with state.lock:
+            if state.updated >= requested or (not force and state.is_fresh(max_age)):
+                return state
+            # Spans are not served, so don't let them pile up across refreshes
+            self.monitor.timings = Timings()
+            start: float = time.perf_counter()
+            try:
+                fields: Dict[str, Any] = plain(self._collect(name))
+                state.error = None
+            except Exception as e:
+                state.error = str(e)
+                if state.fields is not None:
+                    return state
+                fields = {}
+            state.seconds = time.perf_counter() - start
+            state.fields = fields
+            state.etag = hashlib.sha256(json.dumps(fields, sort_keys=True).encode()).hexdigest()[:16]
+            state.updated = time.time()
+            state.refreshes += 1
+        return state
+
+    def report(self, max_age: Optional[float] = None, force: bool = False) -> Tuple[Dict[str, Any], str]:
+        """Full report assembled from the cached sections, and its ETag"""
+        from project_health_monitor import HealthReport
+
+        states: List[SectionState] = [self.section(name, max_age, force) for name in self.sections]
+        etag: str = hashlib.sha256(''.join(s.etag for s in states).encode()).hexdigest()[:16]
+        oldest: float = min((s.updated for s in states), default=time.time())
+        report = HealthReport(timestamp=datetime.datetime.fromtimestamp(oldest))
+        for state in states:
+            for key, value in (state.fields or {}).items():
+                setattr(report, key, value)
+        self.monitor.assess_report(report)
+
+        payload: Dict[str, Any] = plain(self.monitor.report_to_dict(report))
+        payload['freshness'] = {state.name: state.freshness() for state in states}
+        return payload, etag
+
+    def warm(self) -> None:
+        """Refresh sections just before they expire so clients always read a warm result"""
+        while not self._stop.is_set():
+            for name, state in self.sections.items():
+                if state.age() >= state.ttl * 0.9:
+                    self.section(name, force=True)
+            remaining: List[float] = [max(0.0, s.ttl * 0.9 - s.age()) for s in self.sections.values()]
+            self._stop.wait(min(remaining + [60.0]))
+
+    def stop(self) -> None:
+        self._stop.set()
+
+class HealthRequestHandler(BaseHTTPRequestHandler):
+    """GET /report, /sections and /sections/<name>
+
+    Query parameters: max_age=SECONDS demands a fresher result than the TTL,
+    refresh=1 forces a re-run. Responses carry an ETag and honour If-None-Match.
+    """
+
+    server_version = 'ProjectHealth/1.0'
+    health: HealthServer
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        query: Dict[str, List[str]] = parse_qs(url.query)
+        force: bool = query.get('refresh', ['0'])[0] in ('1', 'true')
+        try:
+            max_age: Optional[float] = float(query['max_age'][0]) if 'max_age' in query else None
+        except ValueError:
+            self._send_json(400, {'error': 'max_age must be a number'})
+            return
+
+        parts: List[str] = [part for part in url.path.split('/') if part]
+        if parts == ['report']:
+            payload, etag = self.health.report(max_age, force)
+            self._send_json(200, payload, etag)
+        elif parts == ['sections']:
+            self._send_json(200, {
+                name: state.freshness() for name, state in self.health.sections.items()
+            })
+        elif len(parts) == 2 and parts[0] == 'sections' and parts[1] in self.health.sections:
+            state: SectionState = self.health.section(parts[1], max_age, force)
+            self._send_json(200, dict(state.fields or {}, freshness=state.freshness()), state.etag)
+        else:
+            self._send_json(404, {'error': f'unknown path {url.path}'})
+
+    def _send_json(self, status: int, payload: Dict[str, Any], etag: Optional[str] = None) -> None:
+        quoted: Optional[str] = f'"{etag}"' if etag else None
+        if quoted and self.headers.get('If-None-Match') == quoted:
+            self.send_response(304)
+            self.send_header('ETag', quoted)
+            self.end_headers()
+            return
+
+        body: bytes = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if quoted:
+            self.send_header('ETag', quoted)
+            self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        # Unix-socket peers have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP over a Unix socket, one thread per connection"""
+    daemon_threads = True
+
+    def __init__(self, path: Path, handler: Callable[..., BaseHTTPRequestHandler]) -> None:
+        if path.is_socket():
+            path.unlink()
+        super().__init__(str(path), handler)
+        os.chmod(path, 0o600)
+
+def serve(
+    monitor: 'ProjectHealthMonitor',
+    port: Optional[int] = None,
+    socket_path: Optional[Path] = None,
+    ttls: Optional[Dict[str, float]] = None,
+    host: str = '127.0.0.1',
+    health: Optional[HealthServer] = None,
+    handler_class: Type[HealthRequestHandler] = HealthRequestHandler
+) -> None:
+    """Serve health reports until interrupted
+
+    `health` and `handler_class` let fleet agents plug in their own routes.
+    """
+    if health is None:
+        health = HealthServer(monitor, ttls)
+    handler = type('BoundHealthRequestHandler', (handler_class,), {'health': health})
+
+    server: socketserver.BaseServer
+    if socket_path is not None:
+        server = ThreadingUnixHTTPServer(socket_path, handler)
+        where: str = f'unix:{socket_path}'
+    else:
+        server = ThreadingHTTPServer((host, port or 0), handler)
+        server.daemon_threads = True
+        where = f'http://{host}:{server.server_address[1]}'
+
+    # Service managers stop us with SIGTERM; exit through the cleanup below
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    threading.Thread(target=health.warm, daemon=True).start()
+    print(f"🛰️  Serving health reports on {where}", file=monitor.log_file, flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        health.stop()
+        server.server_close()
+        if socket_path is not None and socket_path.is_socket():
+            socket_path.unlink()
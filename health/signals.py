@@ -0,0 +1,65 @@
+"""
+Optional repository signals beyond the metadata payload
+Default-branch CI, the oldest open pull request and unreleased commits since the
+latest release, normalised to the same shape whether fetched over REST or GraphQL
+"""
+
+from typing import Any, Dict, List, Optional
+
+SIGNAL_CHECKS: List[str] = ['ci', 'prs', 'releases']
+
+# Most REST requests a check adds per repository (the compare call needs a release)
+REST_COST: Dict[str, int] = {'ci': 2, 'prs': 1, 'releases': 2}
+
+# Check-run conclusions that mean the default branch is broken
+FAILING_CONCLUSIONS = frozenset({'failure', 'timed_out', 'startup_failure', 'action_required'})
+
+def wanted(checks: Optional[List[str]]) -> List[str]:
+    """The signal checks among a repository's checks"""
+    return [check for check in checks or [] if check in SIGNAL_CHECKS]
+
+def combine_ci(states: List[str]) -> Optional[str]:
+    """Worst of several CI states: failure, pending, success, or None if there is no CI"""
+    for state in ('failure', 'pending', 'success'):
+        if state in states:
+            return state
+    return None
+
+def rest_ci_state(status: Any, check_runs: Any) -> Optional[str]:
+    """CI state from the combined-status and check-runs payloads of one commit"""
+    states: List[str] = []
+    if isinstance(status, dict) and status.get('total_count'):
+        state: str = status.get('state', '')
+        states.append('failure' if state in ('failure', 'error') else state)
+    if isinstance(check_runs, dict):
+        for run in check_runs.get('check_runs') or []:
+            if run.get('status') != 'completed':
+                states.append('pending')
+            elif run.get('conclusion') in FAILING_CONCLUSIONS:
+                states.append('failure')
+            elif run.get('conclusion') == 'success':
+                states.append('success')
+    return combine_ci(states)
+
+def graphql_ci_state(rollup: Any) -> Optional[str]:
+    """CI state from a statusCheckRollup, which already merges statuses and check runs"""
+    if not isinstance(rollup, dict):
+        return None
+    state: str = str(rollup.get('state', '')).lower()
+    return {'error': 'failure', 'expected': 'pending'}.get(state, state) or None
+
+def graphql_signals(node: Dict[str, Any], checks: List[str]) -> Dict[str, Any]:
+    """Signals carried in a GraphQL repository node (unreleased_commits comes from a second query)"""
+    signals: Dict[str, Any] = {}
+    branch: Dict[str, Any] = node.get('defaultBranchRef') or {}
+    if 'ci' in checks:
+        signals['ci'] = graphql_ci_state((branch.get('target') or {}).get('statusCheckRollup'))
+    if 'prs' in checks:
+        nodes: List[Dict[str, Any]] = (node.get('oldestPullRequest') or {}).get('nodes') or []
+        signals['oldest_pr'] = nodes[0]['createdAt'] if nodes else None
+    if 'releases' in checks:
+        release: Dict[str, Any] = node.get('latestRelease') or {}
+        signals['release'] = release.get('tagName')
+        signals['released_at'] = release.get('publishedAt')
+        signals['unreleased_commits'] = None
+    return signals
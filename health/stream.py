@@ -0,0 +1,43 @@
+"""
+Merge several result generators into one stream
+Each producer runs on its own daemon thread so the slowest check never holds back the others
+"""
+
+import queue
+import threading
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+# Queue items: (producer name, (item,) or None once the producer is done, error)
+_Message = Tuple[str, Optional[Tuple[T]], Optional[BaseException]]
+
+def merge_streams(producers: Dict[str, Callable[[], Iterable[T]]]) -> Iterator[Tuple[str, T]]:
+    """Yield (producer name, item) in completion order across all producers
+
+    An exception raised inside a producer is re-raised to the consumer once
+    the items produced before it have been yielded.
+    """
+    messages: 'queue.Queue[_Message[T]]' = queue.Queue()
+
+    def run(name: str, producer: Callable[[], Iterable[T]]) -> None:
+        try:
+            for item in producer():
+                messages.put((name, (item,), None))
+        except BaseException as e:
+            messages.put((name, None, e))
+            return
+        messages.put((name, None, None))
+
+    for name, producer in producers.items():
+        threading.Thread(target=run, args=(name, producer), daemon=True).start()
+
+    remaining: int = len(producers)
+    while remaining:
+        name, box, error = messages.get()
+        if box is None:
+            remaining -= 1
+            if error is not None:
+                raise error
+            continue
+        yield name, box[0]
@@ -0,0 +1,175 @@
+"""
+Test-result cache keyed by a fingerprint of the project's source tree
+A suite whose sources are unchanged since its last green run is not re-run
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_CACHE_PATH: Path = Path.home() / '.cache' / 'project-health' / 'test-results.json'
+
+# Directories that never affect test outcomes in the mtime manifest
+SKIP_DIRS = frozenset({
+    '.git', '.venv', 'venv', 'node_modules', '__pycache__',
+    '.pytest_cache', '.mypy_cache', '.ruff_cache', '.tox', '.nox'
+})
+
+def git_fingerprint(path: Path) -> Optional[str]:
+    """Hash of the index (staged blob ids) plus stat data of every dirty or untracked file"""
+    try:
+        staged = subprocess.run(
+            ['git', 'ls-files', '--stage'], cwd=path, capture_output=True, timeout=60
+        )
+        dirty = subprocess.run(
+            ['git', 'status', '--porcelain', '-z', '--untracked-files=all'],
+            cwd=path, capture_output=True, timeout=60
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if staged.returncode != 0 or dirty.returncode != 0:
+        return None
+
+    digest = hashlib.sha256(b'git\0')
+    digest.update(staged.stdout)
+    records: List[bytes] = dirty.stdout.split(b'\0')
+    index: int = 0
+    while index < len(records):
+        record: bytes = records[index]
+        index += 1
+        if len(record) < 4:
+            continue
+        # Renames and copies are followed by their source path as a separate record
+        if record[:1] in (b'R', b'C') or record[1:2] in (b'R', b'C'):
+            index += 1
+        digest.update(record)
+        try:
+            st = os.stat(os.path.join(os.fsencode(path), record[3:]))
+            digest.update(f':{st.st_mtime_ns}:{st.st_size}\n'.encode())
+        except OSError:
+            digest.update(b':deleted\n')
+    return digest.hexdigest()
+
+def manifest_fingerprint(path: Path) -> str:
+    """Hash of (relative path, mtime, size) for every file outside SKIP_DIRS"""
+    entries: List[str] = []
+    stack: List[str] = [str(path)]
+    root_len: int = len(str(path)) + 1
+    while stack:
+        current: str = stack.pop()
+        try:
+            with os.scandir(current) as items:
+                for entry in items:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in SKIP_DIRS:
+                                stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            entries.append(f'{entry.path[root_len:]}:{st.st_mtime_ns}:{st.st_size}')
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+    digest = hashlib.sha256(b'manifest\0')
+    for line in sorted(entries):
+        digest.update(line.encode() + b'\n')
+    return digest.hexdigest()
+
+def fingerprint(path: Path) -> str:
+    """Source-tree fingerprint, from git where possible"""
+    if (path / '.git').exists():
+        git_hash: Optional[str] = git_fingerprint(path)
+        if git_hash:
+            return git_hash
+    return manifest_fingerprint(path)
+
+def is_green(counts: Optional[Dict[str, int]]) -> bool:
+    """True for a run pytest exited 0 from with no failures or errors (or a tree without tests)"""
+    if counts is None:
+        return True
+    return counts.get('exitcode') == 0 and counts.get('errors') == 0 and counts.get('failed', 0) == 0
+
+class TestResultCache:
+    """Persistent map of project path -> (fingerprint, green result, duration)"""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH) -> None:
+        self.path: Path = path
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.seconds_saved: float = 0.0
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            try:
+                self._entries = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def lookup(self, project: Path, current: str) -> Optional[Dict[str, Any]]:
+        """Cached entry if the fingerprint still matches; counts a hit or miss"""
+        with self._lock:
+            entry: Optional[Dict[str, Any]] = self._load().get(str(project))
+            # Entries stored before exit codes were recorded can't be trusted as green
+            if entry and entry.get('fingerprint') == current and is_green(entry.get('counts')):
+                self.hits += 1
+                self.seconds_saved += float(entry.get('seconds', 0.0))
+                return entry
+            self.misses += 1
+            return None
+
+    def store(
+        self,
+        project: Path,
+        current: str,
+        counts: Optional[Dict[str, int]],
+        seconds: float
+    ) -> None:
+        """Remember a green run (or a tree with no tests, counts=None); failing runs invalidate the entry"""
+        with self._lock:
+            entries = self._load()
+            if not is_green(counts):
+                entries.pop(str(project), None)
+            else:
+                entries[str(project)] = {
+                    'fingerprint': current,
+                    'has_tests': counts is not None,
+                    'counts': counts,
+                    'seconds': round(seconds, 3),
+                    'stored_at': time.time()
+                }
+
+    def save(self) -> None:
+        with self._lock:
+            if self._entries is None:
+                return
+            payload: str = json.dumps(self._entries, indent=2)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp_path.write_text(payload)
+        os.replace(tmp_path, self.path)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups: int = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'seconds_saved': round(self.seconds_saved, 3)
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.seconds_saved = 0.0
@@ -0,0 +1,187 @@
+"""
+Isolated, concurrent pytest runs for the health monitor
+Every run writes its JSON report to a private temporary path, so concurrent
+runs never clobber each other and stale reports are never misread
+"""
+
+import json
+import subprocess
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from health.pool import run_bounded
+from health.testcache import TestResultCache, fingerprint
+
+# Summed across shards; 'errors' is pytest-json-report's 'error' (collection and fixture errors)
+SUMMARY_FIELDS: Tuple[str, ...] = ('passed', 'failed', 'skipped', 'errors', 'total')
+
+@dataclass
+class TestRun:
+    """Aggregated outcome of one project's suite"""
+    project: str
+    counts: Optional[Dict[str, int]] = None
+    # Wall time of the suite; for a cached result, that of the run it came from
+    seconds: float = 0.0
+    shards: int = 1
+    error: Optional[str] = None
+    cached: bool = False
+    # perf_counter span this call actually spent on the project (just the lookup when cached)
+    started: float = 0.0
+    elapsed: float = 0.0
+
+def find_test_files(path: Path) -> List[Path]:
+    """Test modules pytest would collect by default"""
+    return sorted(set(path.glob('**/test_*.py')) | set(path.glob('**/*_test.py')))
+
+def run_pytest(
+    path: Path,
+    targets: Optional[List[str]] = None,
+    timeout: Optional[float] = None
+) -> Optional[Dict[str, int]]:
+    """Run pytest (with pytest-json-report) and return its summary counts and exit code"""
+    with tempfile.TemporaryDirectory(prefix='health-tests-') as tmp:
+        report_file: Path = Path(tmp) / 'report.json'
+        command: List[str] = [
+            'python', '-m', 'pytest', '--json-report', f'--json-report-file={report_file}'
+        ] + list(targets or [])
+        try:
+            subprocess.run(command, cwd=path, capture_output=True, text=True, timeout=timeout)
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+        if not report_file.exists():
+            return None
+        try:
+            report: Dict[str, Any] = json.loads(report_file.read_text())
+            summary: Dict[str, int] = report['summary']
+        except (OSError, ValueError, KeyError):
+            return None
+        counts: Dict[str, int] = {name: summary.get(name, 0) for name in SUMMARY_FIELDS}
+        counts['errors'] = summary.get('error', 0)
+        counts['exitcode'] = int(report.get('exitcode', -1))
+        return counts
+
+def shard_files(files: List[Path], shards: int) -> List[List[Path]]:
+    """Split test files into shards of roughly equal total size (largest first)"""
+    shards = max(1, min(shards, len(files)))
+    buckets: List[List[Path]] = [[] for _ in range(shards)]
+    loads: List[int] = [0] * shards
+    for test_file in sorted(files, key=lambda f: f.stat().st_size, reverse=True):
+        target: int = loads.index(min(loads))
+        buckets[target].append(test_file)
+        loads[target] += test_file.stat().st_size
+    return [bucket for bucket in buckets if bucket]
+
+class TestOrchestrator:
+    """Runs many project suites concurrently, optionally sharding each one
+
+    pytest already runs in its own process, so the pool only bounds how many
+    of those processes are alive at once.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        shards: int = 1,
+        timeout: Optional[float] = None,
+        cache: Optional[TestResultCache] = None
+    ) -> None:
+        self.workers: int = workers
+        self.shards: int = shards
+        self.timeout: Optional[float] = timeout
+        self.cache: Optional[TestResultCache] = cache
+
+    def run(self, projects: Dict[str, str]) -> Dict[str, TestRun]:
+        """Run every project's suite; projects without test files are omitted"""
+        jobs: List[Tuple[str, Path, Optional[List[str]]]] = []
+        runs: Dict[str, TestRun] = {}
+        fingerprints: Dict[str, str] = {}
+
+        candidates: List[Tuple[str, Path]] = [
+            (name, Path(path_str)) for name, path_str in projects.items() if Path(path_str).is_dir()
+        ]
+        if self.cache:
+            # Fingerprint before running so edits made during the run invalidate the result
+            for probe in run_bounded(lambda item: fingerprint(item[1]), candidates, self.workers):
+                if probe.value is not None:
+                    fingerprints[probe.item[0]] = probe.value
+
+        for name, path in candidates:
+            if self.cache and name in fingerprints:
+                lookup_start: float = time.perf_counter()
+                entry = self.cache.lookup(path, fingerprints[name])
+                if entry is not None:
+                    if not entry.get('has_tests', True):
+                        continue
+                    runs[name] = TestRun(
+                        project=name,
+                        counts=dict(entry['counts']),
+                        seconds=float(entry['seconds']),
+                        cached=True,
+                        started=lookup_start,
+                        elapsed=time.perf_counter() - lookup_start
+                    )
+                    continue
+
+            test_files: List[Path] = find_test_files(path)
+            if not test_files:
+                if self.cache and name in fingerprints:
+                    self.cache.store(path, fingerprints[name], None, 0.0)
+                continue
+
+            if self.shards > 1:
+                shards = shard_files(test_files, self.shards)
+                for shard in shards:
+                    jobs.append((name, path, [str(f.relative_to(path)) for f in shard]))
+                runs[name] = TestRun(project=name, shards=len(shards))
+            else:
+                jobs.append((name, path, None))
+                runs[name] = TestRun(project=name)
+
+        # First shard start and last shard end per project
+        spans: Dict[str, Tuple[float, float]] = {}
+        spans_lock = threading.Lock()
+
+        def run_job(job: Tuple[str, Path, Optional[List[str]]]) -> Optional[Dict[str, int]]:
+            start: float = time.perf_counter()
+            try:
+                return run_pytest(job[1], job[2], self.timeout)
+            finally:
+                end: float = time.perf_counter()
+                with spans_lock:
+                    first, last = spans.get(job[0], (start, end))
+                    spans[job[0]] = (min(first, start), max(last, end))
+
+        outcomes = run_bounded(run_job, jobs, self.workers)
+        for name, (first, last) in spans.items():
+            runs[name].started = first
+            runs[name].elapsed = last - first
+
+        for outcome in outcomes:
+            name = outcome.item[0]
+            run = runs[name]
+            # Shards run side by side, so the slowest one is the suite's wall time
+            run.seconds = max(run.seconds, outcome.seconds)
+            if outcome.value is None:
+                run.error = str(outcome.error) if outcome.error else 'no pytest report produced'
+                continue
+            counts: Dict[str, int] = run.counts or dict({field: 0 for field in SUMMARY_FIELDS}, exitcode=0)
+            for field in SUMMARY_FIELDS:
+                counts[field] += outcome.value[field]
+            # Any failing shard fails the suite
+            counts['exitcode'] = counts['exitcode'] or outcome.value['exitcode']
+            run.counts = counts
+
+        if self.cache:
+            for name, path in candidates:
+                result: Optional[TestRun] = runs.get(name)
+                if (result and not result.cached and result.counts is not None
+                        and not result.error and name in fingerprints):
+                    self.cache.store(path, fingerprints[name], result.counts, result.seconds)
+            self.cache.save()
+
+        return runs
@@ -0,0 +1,119 @@
+"""
+Timing and tracing for health checks
+Records wall and CPU time per check, per repo/project and per phase, and
+exports them as a report summary or a Chrome trace (chrome://tracing, Perfetto)
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+# Span categories: 'check' wraps a whole check, 'item' one repo/project,
+# 'http' / 'subprocess' / 'fs' are the phases inside an item
+CHECK = 'check'
+ITEM = 'item'
+HTTP = 'http'
+SUBPROCESS = 'subprocess'
+FS = 'fs'
+
+@dataclass
+class Span:
+    """One timed region"""
+    name: str
+    category: str
+    start: float
+    wall: float
+    cpu: float
+    thread: int
+    args: Dict[str, Any] = field(default_factory=dict)
+
+class Timings:
+    """Thread-safe span recorder
+
+    CPU time is per-thread for items and phases, and process-wide for checks
+    (whose work usually runs on worker threads).
+    """
+
+    def __init__(self) -> None:
+        self.origin: float = time.perf_counter()
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        name: str,
+        category: str,
+        start: float,
+        wall: float,
+        cpu: float = 0.0,
+        **args: Any
+    ) -> None:
+        """Record a span measured elsewhere (start is a perf_counter value)"""
+        span = Span(name, category, start - self.origin, wall, cpu, threading.get_ident(), args)
+        with self._lock:
+            self.spans.append(span)
+
+    @contextmanager
+    def span(self, name: str, category: str, **args: Any) -> Iterator[None]:
+        """Time the enclosed block"""
+        cpu_clock = time.process_time if category == CHECK else time.thread_time
+        start: float = time.perf_counter()
+        cpu_start: float = cpu_clock()
+        try:
+            yield
+        finally:
+            self.add(name, category, start, time.perf_counter() - start, cpu_clock() - cpu_start, **args)
+
+    def summary(self) -> Dict[str, Any]:
+        """Checks, per-item spans and per-phase totals for the report"""
+        with self._lock:
+            spans: List[Span] = list(self.spans)
+
+        checks: Dict[str, Dict[str, float]] = {}
+        items: Dict[str, Dict[str, float]] = {}
+        phases: Dict[str, Dict[str, float]] = {}
+        for span in spans:
+            entry: Dict[str, float] = {'wall_s': round(span.wall, 4), 'cpu_s': round(span.cpu, 4)}
+            if 'cached_seconds' in span.args:
+                # Wall time of the earlier run a cached result came from
+                entry['cached_seconds'] = round(span.args['cached_seconds'], 4)
+            if span.category == CHECK:
+                checks[span.name] = entry
+            elif span.category == ITEM:
+                items[span.name] = entry
+            else:
+                total = phases.setdefault(span.category, {'wall_s': 0.0, 'cpu_s': 0.0, 'count': 0})
+                total['wall_s'] = round(total['wall_s'] + span.wall, 4)
+                total['cpu_s'] = round(total['cpu_s'] + span.cpu, 4)
+                total['count'] += 1
+        return {'checks': checks, 'items': items, 'phases': phases}
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Trace Event Format document with one complete ('X') event per span"""
+        with self._lock:
+            spans = list(self.spans)
+        pid: int = os.getpid()
+        return {
+            'traceEvents': [
+                {
+                    'name': span.name,
+                    'cat': span.category,
+                    'ph': 'X',
+                    'ts': round(span.start * 1e6, 1),
+                    'dur': round(span.wall * 1e6, 1),
+                    'pid': pid,
+                    'tid': span.thread,
+                    'args': dict(span.args, cpu_ms=round(span.cpu * 1000, 3))
+                }
+                for span in spans
+            ],
+            'displayTimeUnit': 'ms'
+        }
+
+    def write_chrome_trace(self, path: Path) -> None:
+        path.write_text(json.dumps(self.to_chrome_trace()))
@@ -0,0 +1,445 @@
+"""
+Watch mode for the health monitor
+Keeps one report resident, re-runs only the sections whose inputs changed and
+emits the differences as a stream of events
+"""
+
+import ctypes
+import ctypes.util
+import datetime
+import fnmatch
+import hashlib
+import json
+import os
+import select
+import struct
+import sys
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple
+
+from health.jsonutil import json_default, plain
+
+if TYPE_CHECKING:
+    from project_health_monitor import HealthReport, ProjectHealthMonitor
+
+# inotify event bits (see inotify(7))
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (
+    IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+)
+EVENT_HEADER = struct.Struct('iIII')
+
+# Report sections compared entry by entry when building diffs
+KEYED_SECTIONS: List[str] = ['github_repos', 'local_projects', 'mcp_servers', 'api_keys']
+SCALAR_SECTIONS: List[str] = ['overall_health', 'recommendations']
+
+Event = Dict[str, Any]
+
+class Watcher(ABC):
+    """Maps filesystem changes back to report section keys"""
+
+    @abstractmethod
+    def add_tree(self, key: str, root: Path, shallow: List[str], skip: List[str]) -> None:
+        """Watch a directory tree; `shallow` dirs are watched but not descended, `skip` dirs ignored"""
+
+    @abstractmethod
+    def add_file(self, key: str, path: Path) -> None:
+        """Watch a single file, including replacement by rename"""
+
+    @abstractmethod
+    def remove(self, key: str) -> None:
+        """Stop watching everything registered under `key`"""
+
+    @abstractmethod
+    def wait(self, timeout: float) -> Set[str]:
+        """Block up to `timeout` seconds and return the keys whose inputs changed"""
+
+    def close(self) -> None:
+        pass
+
+def _matches(name: str, patterns: List[str]) -> bool:
+    return any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+def _git_lock(directory: str, name: str) -> bool:
+    """Lock files git creates and removes around its own reads, e.g. .git/index.lock"""
+    return name.endswith('.lock') and os.path.basename(directory) == '.git'
+
+class InotifyWatcher(Watcher):
+    """Linux inotify watcher driven through libc, one watch per directory"""
+
+    def __init__(self, debounce: float = 0.2) -> None:
+        if not sys.platform.startswith('linux'):
+            raise OSError('inotify is only available on Linux')
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._fd: int = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            error: int = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self.debounce: float = debounce
+        # wd -> [(key, directory, file name or None for tree watches)]
+        self._watches: Dict[int, List[Tuple[str, str, Optional[str]]]] = {}
+        self._trees: Dict[str, Tuple[List[str], List[str]]] = {}
+
+    def _add_watch(self, directory: str, key: str, name: Optional[str]) -> None:
+        wd: int = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            error: int = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), directory)
+        targets = self._watches.setdefault(wd, [])
+        if (key, directory, name) not in targets:
+            targets.append((key, directory, name))
+
+    def _add_tree_dirs(self, key: str, root: str) -> None:
+        shallow, skip = self._trees[key]
+        for current, dirs, _ in os.walk(root):
+            self._add_watch(current, key, None)
+            kept: List[str] = []
+            for name in dirs:
+                if _matches(name, skip):
+                    continue
+                if _matches(name, shallow):
+                    self._add_watch(os.path.join(current, name), key, None)
+                    continue
+                kept.append(name)
+            dirs[:] = kept
+
+    def add_tree(self, key: str, root: Path, shallow: List[str], skip: List[str]) -> None:
+        self._trees[key] = (shallow, skip)
+        if root.is_dir():
+            self._add_tree_dirs(key, str(root))
+
+    def add_file(self, key: str, path: Path) -> None:
+        if path.parent.is_dir():
+            self._add_watch(str(path.parent), key, path.name)
+
+    def remove(self, key: str) -> None:
+        self._trees.pop(key, None)
+        for wd, targets in list(self._watches.items()):
+            kept = [target for target in targets if target[0] != key]
+            if kept:
+                self._watches[wd] = kept
+            else:
+                # Watches are shared per directory, so only drop one no other key uses
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._watches[wd]
+
+    def wait(self, timeout: float) -> Set[str]:
+        ready, _, _ = select.select([self._fd], [], [], max(0.0, timeout))
+        if not ready:
+            return set()
+
+        # Let a burst of writes settle so one save triggers one refresh
+        time.sleep(self.debounce)
+        changed: Set[str] = set()
+        while True:
+            try:
+                data: bytes = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            changed |= self._parse(data)
+        return changed
+
+    def _parse(self, data: bytes) -> Set[str]:
+        changed: Set[str] = set()
+        offset: int = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            raw_name: bytes = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length]
+            offset += EVENT_HEADER.size + length
+            name: str = os.fsdecode(raw_name.rstrip(b'\0'))
+
+            if mask & IN_Q_OVERFLOW:
+                changed |= {key for targets in self._watches.values() for key, _, _ in targets}
+                continue
+            targets = self._watches.get(wd, [])
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+
+            for key, directory, file_name in targets:
+                if file_name is not None:
+                    if name == file_name:
+                        changed.add(key)
+                    continue
+                if _git_lock(directory, name):
+                    continue
+                changed.add(key)
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and name:
+                    shallow, skip = self._trees[key]
+                    new_dir: str = os.path.join(directory, name)
+                    if _matches(name, skip):
+                        continue
+                    try:
+                        if _matches(name, shallow):
+                            self._add_watch(new_dir, key, None)
+                        else:
+                            self._add_tree_dirs(key, new_dir)
+                    except OSError:
+                        pass
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+class PollingWatcher(Watcher):
+    """Portable fallback that fingerprints watched paths every `interval` seconds"""
+
+    def __init__(self, interval: float = 5.0) -> None:
+        self.interval: float = interval
+        self._trees: Dict[str, Tuple[Path, List[str], List[str]]] = {}
+        self._files: Dict[str, Path] = {}
+        self._fingerprints: Dict[str, str] = {}
+
+    def add_tree(self, key: str, root: Path, shallow: List[str], skip: List[str]) -> None:
+        self._trees[key] = (root, shallow, skip)
+        self._fingerprints[key] = self._fingerprint(key)
+
+    def add_file(self, key: str, path: Path) -> None:
+        self._files[key] = path
+        self._fingerprints[key] = self._fingerprint(key)
+
+    def remove(self, key: str) -> None:
+        self._trees.pop(key, None)
+        self._files.pop(key, None)
+        self._fingerprints.pop(key, None)
+
+    def _fingerprint(self, key: str) -> str:
+        digest = hashlib.sha1()
+        if key in self._files:
+            try:
+                st = self._files[key].stat()
+                digest.update(f'{st.st_mtime_ns}:{st.st_size}'.encode())
+            except OSError:
+                digest.update(b'missing')
+            return digest.hexdigest()
+
+        root, shallow, skip = self._trees[key]
+        stack: List[Tuple[str, bool]] = [(str(root), True)]
+        while stack:
+            current, descend = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if _git_lock(current, entry.name):
+                            continue
+                        try:
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        digest.update(f'{entry.path}:{st.st_mtime_ns}:{st.st_size}\n'.encode())
+                        if descend and entry.is_dir(follow_symlinks=False) and not _matches(entry.name, skip):
+                            stack.append((entry.path, not _matches(entry.name, shallow)))
+            except OSError:
+                continue
+        return digest.hexdigest()
+
+    def wait(self, timeout: float) -> Set[str]:
+        time.sleep(max(0.0, min(self.interval, timeout)))
+        changed: Set[str] = set()
+        for key in list(self._trees) + list(self._files):
+            fingerprint: str = self._fingerprint(key)
+            if fingerprint != self._fingerprints.get(key):
+                self._fingerprints[key] = fingerprint
+                changed.add(key)
+        return changed
+
+def create_watcher(poll_interval: float = 5.0, force_polling: bool = False) -> Watcher:
+    """inotify where available, polling everywhere else"""
+    if not force_polling:
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(poll_interval)
+
+def diff_reports(before: Dict[str, Any], after: Dict[str, Any]) -> List[Event]:
+    """Per-entry differences between two plain report dicts"""
+    events: List[Event] = []
+    for section in KEYED_SECTIONS:
+        old: Dict[str, Any] = before.get(section) or {}
+        new: Dict[str, Any] = after.get(section) or {}
+        for key in list(old) + [k for k in new if k not in old]:
+            if old.get(key) != new.get(key):
+                events.append({
+                    'type': 'diff',
+                    'section': section,
+                    'key': key,
+                    'before': old.get(key),
+                    'after': new.get(key)
+                })
+    for section in SCALAR_SECTIONS:
+        if before.get(section) != after.get(section):
+            events.append({
+                'type': 'diff',
+                'section': section,
+                'key': None,
+                'before': before.get(section),
+                'after': after.get(section)
+            })
+    return events
+
+def emit_ndjson(event: Event) -> None:
+    """Write one event per line to stdout"""
+    print(json.dumps(event, default=json_default), flush=True)
+
+class WatchSession:
+    """Resident monitor that refreshes report sections as their inputs change"""
+
+    def __init__(
+        self,
+        monitor: 'ProjectHealthMonitor',
+        github_interval: float = 300.0,
+        poll_interval: float = 5.0,
+        force_polling: bool = False,
+        emit: Callable[[Event], None] = emit_ndjson
+    ) -> None:
+        self.monitor = monitor
+        self.github_interval: float = github_interval
+        self.emit: Callable[[Event], None] = emit
+        self.poll_interval: float = poll_interval
+        self.watcher: Watcher = create_watcher(poll_interval, force_polling)
+        self.report: Optional['HealthReport'] = None
+        self._env_values: Dict[str, Optional[str]] = {}
+        # Projects currently watched, to tell config edits that add or remove one
+        self._projects: Dict[str, str] = {}
+        self._register()
+
+    def _register(self) -> None:
+        self._projects = dict(self.monitor.local_projects)
+        for name, path_str in self._projects.items():
+            if not self._watch_project(name, path_str):
+                return
+        self.watcher.add_file('mcp', self.monitor.claude_config_path)
+        self.watcher.add_file('env', self.monitor.env_file)
+        if self.monitor.config.source is not None:
+            # Any change fires 'config', which refresh() turns into refresh_config()
+            self.watcher.add_file('config', self.monitor.config.source)
+
+    def _watch_project(self, name: str, path_str: str) -> bool:
+        """Watch one project's tree; False if that forced a switch to polling"""
+        shallow: List[str] = ['.git'] + self.monitor.size_index.summarize
+        skip: List[str] = list(self.monitor.size_index.exclude)
+        try:
+            self.watcher.add_tree(f'local:{name}', Path(path_str), shallow, skip)
+        except OSError as e:
+            # Typically the inotify watch limit; fall back for every key
+            print(f"⚠️  inotify unavailable for {name} ({e}), polling instead", file=self.monitor.log_file)
+            self._fallback_to_polling()
+            return False
+        return True
+
+    def _sync_projects(self, report: 'HealthReport') -> Set[str]:
+        """Follow config edits to the project list; returns the sections of projects to scan"""
+        current: Dict[str, str] = dict(self.monitor.local_projects)
+        for name, path_str in self._projects.items():
+            if current.get(name) != path_str:
+                self.watcher.remove(f'local:{name}')
+                report.local_projects.pop(name, None)
+        added: List[str] = [name for name, path_str in current.items() if self._projects.get(name) != path_str]
+        self._projects = current
+        for name in added:
+            if not self._watch_project(name, current[name]):
+                break
+        return {f'local:{name}' for name in added}
+
+    def _fallback_to_polling(self) -> None:
+        self.watcher.close()
+        self.watcher = PollingWatcher(self.poll_interval)
+        self._register()
+
+    def _reload_env(self) -> None:
+        """Re-read the dotenv file, dropping keys that were removed from it"""
+        from dotenv import dotenv_values
+
+        values: Dict[str, Optional[str]] = dict(dotenv_values(self.monitor.env_file))
+        for key in self._env_values:
+            if key not in values:
+                os.environ.pop(key, None)
+        for key, value in values.items():
+            if value is not None:
+                os.environ[key] = value
+        self._env_values = values
+        self.monitor.github_token = os.getenv('GITHUB_PERSONAL_ACCESS_TOKEN')
+
+    def refresh(self, sections: Set[str]) -> List[Event]:
+        """Recompute the given sections and return the resulting diffs"""
+        report = self.report
+        assert report is not None
+        before: Dict[str, Any] = plain(self.monitor.report_to_dict(report))
+
+        # Pick up config edits, watching and scanning projects they add and dropping removed ones
+        config = self.monitor.config
+        self.monitor.refresh_config()
+        if self.monitor.config is not config:
+            # Targets, checks and thresholds may all have changed
+            sections = sections | {'env', 'github', 'mcp'} | {f'local:{name}' for name in self.monitor.local_projects}
+        checks: List[str] = self.monitor.checks
+        sections = sections | self._sync_projects(report)
+        if 'env' in sections:
+            self._reload_env()
+            if 'api' in checks:
+                report.api_keys = self.monitor.check_api_keys()
+        if 'github' in sections and 'github' in checks:
+            report.github_repos = self.monitor.check_github_status()
+            if self.monitor.github_cache:
+                report.github_cache = self.monitor.github_cache.stats()
+        if 'mcp' in sections and 'mcp' in checks:
+            report.mcp_servers = self.monitor.check_mcp_servers()
+
+        projects_changed: bool = False
+        for section in sorted(sections):
+            if section.startswith('local:') and 'local' in checks:
+                name: str = section.split(':', 1)[1]
+                path_str: Optional[str] = self.monitor.local_projects.get(name)
+                if path_str is not None:
+                    report.local_projects[name] = self.monitor.check_local_project(path_str, name)
+                    projects_changed = True
+        if projects_changed:
+            self.monitor.size_index.save()
+
+        report.timestamp = datetime.datetime.now()
+        self.monitor.assess_report(report)
+        after: Dict[str, Any] = plain(self.monitor.report_to_dict(report))
+
+        events: List[Event] = diff_reports(before, after)
+        for event in events:
+            event['timestamp'] = after['timestamp']
+            self.emit(event)
+        return events
+
+    def run(self, max_seconds: Optional[float] = None) -> None:
+        """Emit a snapshot, then diffs until interrupted (or `max_seconds` elapse)"""
+        started: float = time.monotonic()
+        self.report = self.monitor.generate_health_report()
+        self.emit({'type': 'snapshot', 'report': plain(self.monitor.report_to_dict(self.report))})
+        next_github: float = time.monotonic() + self.github_interval
+
+        try:
+            while max_seconds is None or time.monotonic() - started < max_seconds:
+                now: float = time.monotonic()
+                timeout: float = next_github - now
+                if max_seconds is not None:
+                    timeout = min(timeout, started + max_seconds - now)
+
+                sections: Set[str] = self.watcher.wait(timeout)
+                if time.monotonic() >= next_github:
+                    sections.add('github')
+                    next_github = time.monotonic() + self.github_interval
+                if sections:
+                    self.refresh(sections)
+        finally:
+            self.watcher.close()
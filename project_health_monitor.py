@@ -5,18 +5,35 @@ Tracks status across all 5 GitHub repositories and local projects
 """
 
 import os
-import subprocess
+import sys
 import json
+import time
 import datetime
+import dataclasses
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple, TypedDict
+from typing import Callable, Dict, Iterable, Iterator, List, Any, Optional, TextIO, Tuple, Type, TypedDict
 from dataclasses import dataclass, field
 from enum import Enum
-import requests
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv('/Users/aettefagh/.config/api-keys/.env')
+from health.cache import ResponseCache
+from health.config import (
+    PROJECT_CHECKS, SECTIONS, ConfigError, HealthConfig, ProjectTarget, RepoTarget,
+    expand, file_signature, find_config, load_config
+)
+from health.dirsize import DirectorySizeIndex
+from health.gitstatus import GitStatusReader
+from health.jsonutil import json_default
+from health.pool import iter_bounded
+from health.stream import merge_streams
+from health.testcache import TestResultCache, fingerprint
+from health.testrun import TestOrchestrator, find_test_files, run_pytest
+from health.timing import CHECK, FS, HTTP, ITEM, SUBPROCESS, Timings
+from health.github import FetchConfig, FetchResult, GitHubClient
+from health.ratelimit import GitHubScheduler
+from health.signals import REST_COST, wanted
+
+# Checks selectable with --only
+CHECKS: List[str] = list(SECTIONS)
 
 class HealthStatus(Enum):
     """Health status levels"""
@@ -40,6 +57,12 @@ class RepoInfo(TypedDict):
     open_issues: int
     last_push: str
     status: HealthStatus
+    # Last-known-good data shown because the rate limit deferred this repo's refresh
+    stale: bool
+    # Results of the opt-in ci/prs/releases checks (see health.signals)
+    signals: Dict[str, Any]
+    # Why the status is not healthy
+    problems: List[str]
 
 class LocalProjectInfo(TypedDict):
     """Type definition for local project information"""
@@ -60,175 +83,425 @@ class HealthReport:
     api_keys: Dict[str, bool] = field(default_factory=dict)
     overall_health: HealthStatus = HealthStatus.UNKNOWN
     recommendations: List[str] = field(default_factory=list)
+    github_cache: Dict[str, int] = field(default_factory=dict)
+    timings: Dict[str, Any] = field(default_factory=dict)
+    tests: Dict[str, TestStatus] = field(default_factory=dict)
+    test_durations: Dict[str, float] = field(default_factory=dict)
+    test_cache: Dict[str, Any] = field(default_factory=dict)
 
 class ProjectHealthMonitor:
     """Monitor health across all projects with type safety"""
     
-    def __init__(self) -> None:
+    def __init__(self, config: Optional[HealthConfig] = None) -> None:
+        """Monitor the targets in `config`, by default the config file found by find_config()"""
         self.github_token: Optional[str] = os.getenv('GITHUB_PERSONAL_ACCESS_TOKEN')
+        self.github_fetch: FetchConfig = FetchConfig()
+        self.github_cache: Optional[ResponseCache] = ResponseCache()
+        self.github_scheduler: Optional[GitHubScheduler] = GitHubScheduler()
+        self.size_index: DirectorySizeIndex = DirectorySizeIndex()
+        self.git_status: GitStatusReader = GitStatusReader()
+        self.run_tests: bool = False
+        self.test_cache: Optional[TestResultCache] = TestResultCache()
+        self._env_loaded: bool = False
+        self.timings: Timings = Timings()
+        self.log_file: TextIO = sys.stdout
+        # Command-line settings laid over every (re)loaded config, e.g. {'github.concurrency': 16}
+        self.config_overrides: Dict[str, Any] = {}
+        # Last result per target ('github:OWNER/REPO', 'local:NAME'), reused within its interval
+        self._target_results: Dict[str, Tuple[float, Any]] = {}
+        self.apply_config(config if config is not None else load_config(find_config()))
+    
+    def apply_config(self, config: HealthConfig) -> None:
+        """Take targets and budgets from a config, with config_overrides on top"""
+        if self.config_overrides:
+            config = config.with_overrides(self.config_overrides)
+        self.config: HealthConfig = config
+        self.checks: List[str] = list(config.checks)
+        self.repo_targets: Dict[str, RepoTarget] = {
+            target.name: target for target in config.github.repositories
+        }
         self.repositories: List[str] = [
-            'reggienitro/claude-config',
-            'reggienitro/article-to-audio-extension', 
-            'reggienitro/bee-supabase-integration',
-            'reggienitro/personal-data-lake',
-            'reggienitro/knowledge-scraper'
+            target.name for target in config.github.repositories if target.checks
         ]
+        self._set_projects(config.projects())
+        self.mcp_servers: List[str] = list(config.mcp.servers)
+        self.claude_config_path: Path = Path(expand(config.mcp.config))
+        self.required_api_keys: List[str] = list(config.api.keys)
+        self.env_file: Path = Path(expand(config.api.env_file))
+        
+        self.github_fetch.max_workers = config.github.concurrency
+        self.github_fetch.timeout = config.github.timeout
+        self.github_fetch.retries = config.github.retries
+        self.github_fetch.backend = config.github.backend
+        if self.github_scheduler:
+            self.github_scheduler.reserve = config.github.reserve
+        self.scan_workers: int = config.local.concurrency
+        self.scan_timeout: Optional[float] = config.local.timeout
+        self.size_index.workers = config.local.concurrency
+        self.size_index.exclude = list(config.local.exclude_dirs)
+        if config.local.summarize_dirs is not None:
+            self.size_index.summarize = list(config.local.summarize_dirs)
+        self.test_workers: int = config.tests.concurrency
+        self.test_shards: int = config.tests.shards
+        self.test_timeout: Optional[float] = config.tests.timeout
+    
+    def _set_projects(self, targets: Dict[str, ProjectTarget]) -> None:
+        self.project_targets: Dict[str, ProjectTarget] = targets
         self.local_projects: Dict[str, str] = {
-            'claude-config': '/Users/aettefagh/claude-config',
-            'article-to-audio': '/Users/aettefagh/AI projects/claude-tools/article-to-audio-extension',
-            'bee-supabase': '/Users/aettefagh/AI projects/automation-tools/bee-supabase-integration',
-            'personal-data-lake': '/Users/aettefagh/AI projects/automation-tools/personal-data-lake',
-            'knowledge-scraper': '/Users/aettefagh/AI projects/claude-tools/knowledge-scraper'
+            name: expand(target.path) for name, target in targets.items()
         }
-        self.mcp_servers: List[str] = [
-            'filesystem', 'github', 'supabase', 'beemcp', 
-            'memory', 'web-search', 'exa-search'
-        ]
-        self.required_api_keys: List[str] = [
-            'GITHUB_PERSONAL_ACCESS_TOKEN',
-            'SUPABASE_URL',
-            'SUPABASE_KEY',
-            'BEE_API_TOKEN',
-            'EXA_API_KEY'
-        ]
+    
+    def refresh_config(self) -> None:
+        """Re-apply the config file if it changed on disk, and re-run project discovery"""
+        source: Optional[Path] = self.config.source
+        if source is not None and file_signature(source) != self.config.signature:
+            try:
+                self.apply_config(load_config(source))
+                return
+            except ConfigError as e:
+                self._log(f"⚠️  Keeping the previous config: {e}")
+        if any(target.glob for target in self.config.local.projects):
+            self._set_projects(self.config.projects())
+    
+    def _reusable(self, key: str, interval: Optional[float]) -> Optional[Any]:
+        """A target's last result if it was checked less than `interval` seconds ago"""
+        if not interval:
+            return None
+        last: Optional[Tuple[float, Any]] = self._target_results.get(key)
+        if last is not None and time.time() - last[0] < interval:
+            return last[1]
+        return None
+    
+    def _remember(self, key: str, value: Any) -> None:
+        self._target_results[key] = (time.time(), value)
+    
+    def _log(self, message: str) -> None:
+        """Progress and error output for the checks"""
+        print(message, file=self.log_file)
+    
+    def load_environment(self) -> None:
+        """Load the API-key dotenv file once, on first use by a check that reads credentials"""
+        if self._env_loaded:
+            return
+        self._env_loaded = True
+        from dotenv import load_dotenv
+        
+        load_dotenv(self.env_file)
+        if not self.github_token:
+            self.github_token = os.getenv('GITHUB_PERSONAL_ACCESS_TOKEN')
     
     def check_github_status(self) -> Dict[str, RepoInfo]:
         """Check GitHub repository status with type safety"""
-        repo_status: Dict[str, RepoInfo] = {}
+        results: Dict[str, RepoInfo] = dict(self.iter_github_status())
+        return {repo: results[repo] for repo in self.repositories if repo in results}
+    
+    def iter_github_status(self) -> Iterator[Tuple[str, RepoInfo]]:
+        """Yield each repository's status as soon as its fetch completes
         
+        Repositories checked within their own interval are answered from the
+        last result. With a scheduler, the rate limit decides how many of the
+        rest are fetched (most urgent first); the others get their last-known
+        good data, marked stale. Fetches are grouped by request timeout.
+        """
+        self.load_environment()
         if not self.github_token:
-            print("⚠️  GitHub token not found")
-            return repo_status
+            self._log("⚠️  GitHub token not found")
+            return
         
-        headers: Dict[str, str] = {
-            'Authorization': f'token {self.github_token}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
+        if self.github_cache:
+            self.github_cache.reset_stats()
         
+        due: List[str] = []
         for repo in self.repositories:
+            target: Optional[RepoTarget] = self.repo_targets.get(repo)
+            reused: Optional[RepoInfo] = self._reusable(f'github:{repo}', target.interval if target else None)
+            if reused is not None:
+                yield repo, reused
+            else:
+                due.append(repo)
+        
+        scheduler: Optional[GitHubScheduler] = self.github_scheduler
+        if scheduler:
+            graphql: bool = self.github_fetch.backend == 'graphql'
+            resource: str = 'graphql' if graphql else 'core'
+            due, deferred = scheduler.plan(due, resource, self.config.github.interval, self._refresh_cost)
+            if deferred:
+                self._log(f"⏳ GitHub rate limit ({scheduler.describe(resource)}): "
+                          f"showing last-known data for {len(deferred)} repositories")
+            for repo in deferred:
+                yield repo, self._stale_repo(repo)
+        
+        groups: Dict[float, List[str]] = {}
+        for repo in due:
+            target = self.repo_targets.get(repo)
+            timeout: float = target.timeout if target and target.timeout else self.github_fetch.timeout
+            groups.setdefault(timeout, []).append(repo)
+        
+        try:
+            for timeout, repos in groups.items():
+                client = GitHubClient(self.github_token, dataclasses.replace(self.github_fetch, timeout=timeout),
+                                      self.github_cache, scheduler.tracker if scheduler else None)
+                try:
+                    checks: Dict[str, List[str]] = {repo: self._repo_checks(repo) for repo in repos}
+                    if self.github_fetch.backend == 'graphql':
+                        results = client.iter_repos_batched(repos, checks)
+                    else:
+                        results = client.iter_repos(repos, checks)
+                    for repo, result in results:
+                        info: RepoInfo = self._repo_info(repo, result)
+                        if not info['stale']:
+                            self._remember(f'github:{repo}', info)
+                            if scheduler:
+                                scheduler.record(repo, info, fetched=info['status'] != HealthStatus.ERROR)
+                        yield repo, info
+                finally:
+                    client.close()
+        finally:
+            if scheduler:
+                scheduler.save()
+    
+    def _repo_checks(self, repo: str) -> List[str]:
+        target: Optional[RepoTarget] = self.repo_targets.get(repo)
+        return target.checks if target else self.config.github.checks
+    
+    def _refresh_cost(self, repo: str) -> float:
+        """Most requests refreshing a repo can take; GraphQL shares one query (two with releases) per batch"""
+        checks: List[str] = wanted(self._repo_checks(repo))
+        if self.github_fetch.backend == 'graphql':
+            return (2.0 if 'releases' in checks else 1.0) / max(1, self.github_fetch.batch_size)
+        return 1.0 + sum(REST_COST[check] for check in checks)
+    
+    def _repo_info(self, repo: str, result: FetchResult) -> RepoInfo:
+        """Convert a fetch result into a RepoInfo entry"""
+        end: float = max(request.started + request.elapsed for request in [result] + result.requests)
+        self.timings.add(f'github:{repo}', ITEM, result.started, end - result.started,
+                         attempts=result.attempts, cached=result.from_cache, requests=1 + len(result.requests))
+        for request in ([result] if result.owns_request else []) + result.requests:
+            self.timings.add('http', HTTP, request.started, request.elapsed, url=request.url)
+        data = result.data
+        if result.ok and data is not None:
             try:
-                # Get basic repo info
-                url: str = f'https://api.github.com/repos/{repo}'
-                response = requests.get(url, headers=headers)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    repo_status[repo] = RepoInfo(
-                        name=data['name'],
-                        stars=data['stargazers_count'],
-                        forks=data['forks_count'],
-                        open_issues=data['open_issues_count'],
-                        last_push=data['pushed_at'],
-                        status=self._determine_repo_health(data)
-                    )
-                else:
-                    repo_status[repo] = RepoInfo(
-                        name=repo.split('/')[-1],
-                        stars=0,
-                        forks=0,
-                        open_issues=0,
-                        last_push='unknown',
-                        status=HealthStatus.ERROR
-                    )
-                    
-            except Exception as e:
-                print(f"❌ Error checking {repo}: {e}")
-                repo_status[repo] = RepoInfo(
-                    name=repo.split('/')[-1],
-                    stars=0,
-                    forks=0,
-                    open_issues=0,
-                    last_push='unknown',
-                    status=HealthStatus.ERROR
+                status, problems = self._determine_repo_health(data, result.signals, self._repo_checks(repo))
+                return RepoInfo(
+                    name=data['name'],
+                    stars=data['stargazers_count'],
+                    forks=data['forks_count'],
+                    open_issues=data['open_issues_count'],
+                    last_push=data['pushed_at'],
+                    status=status,
+                    stale=False,
+                    signals=result.signals,
+                    problems=problems
                 )
+            except (KeyError, TypeError, ValueError) as e:
+                self._log(f"❌ Error checking {repo}: {e}")
+        elif result.rate_limited:
+            return self._stale_repo(repo)
+        elif result.status_code == 0:
+            self._log(f"❌ Error checking {repo}: {result.error}")
         
-        return repo_status
+        return self._unreachable_repo(repo)
+    
+    def _unreachable_repo(self, repo: str) -> RepoInfo:
+        """Placeholder entry for a repository that could not be fetched"""
+        return RepoInfo(
+            name=repo.split('/')[-1],
+            stars=0,
+            forks=0,
+            open_issues=0,
+            last_push='unknown',
+            status=HealthStatus.ERROR,
+            stale=False,
+            signals={},
+            problems=[]
+        )
     
-    def _determine_repo_health(self, repo_data: Dict[str, Any]) -> HealthStatus:
-        """Determine repository health status"""
-        issues: int = repo_data.get('open_issues_count', 0)
+    def _stale_repo(self, repo: str) -> RepoInfo:
+        """Last-known-good entry for a repository the rate limit kept us from refreshing"""
+        last: Optional[Dict[str, Any]] = self.github_scheduler.last_good(repo) if self.github_scheduler else None
+        if last is None:
+            return RepoInfo(
+                name=repo.split('/')[-1],
+                stars=0,
+                forks=0,
+                open_issues=0,
+                last_push='unknown',
+                status=HealthStatus.UNKNOWN,
+                stale=True,
+                signals={},
+                problems=[]
+            )
+        return RepoInfo(
+            name=last['name'],
+            stars=last['stars'],
+            forks=last['forks'],
+            open_issues=last['open_issues'],
+            last_push=last['last_push'],
+            status=HealthStatus(last['status']),
+            stale=True,
+            signals=last.get('signals', {}),
+            problems=last.get('problems', [])
+        )
+    
+    def _determine_repo_health(
+        self,
+        repo_data: Dict[str, Any],
+        signals: Dict[str, Any],
+        checks: List[str]
+    ) -> Tuple[HealthStatus, List[str]]:
+        """Determine repository health status and the reasons it is not healthy"""
+        thresholds = self.config.github.thresholds
+        now = datetime.datetime.now(datetime.timezone.utc)
         
-        # Check last push date
-        last_push_str: str = repo_data.get('pushed_at', '')
-        if last_push_str:
-            last_push = datetime.datetime.fromisoformat(last_push_str.replace('Z', '+00:00'))
-            days_since_push: int = (datetime.datetime.now(datetime.timezone.utc) - last_push).days
-            
-            if days_since_push > 30:
-                return HealthStatus.WARNING
-            if issues > 10:
-                return HealthStatus.WARNING
-            
-        return HealthStatus.HEALTHY
+        def days_since(timestamp: str) -> float:
+            moment = datetime.datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+            return (now - moment).total_seconds() / 86400
+        
+        warnings: List[str] = []
+        errors: List[str] = []
+        if 'repo' in checks:
+            last_push_str: str = repo_data.get('pushed_at') or ''
+            if last_push_str and days_since(last_push_str) > thresholds.push_days:
+                warnings.append(f"no push in {int(days_since(last_push_str))} days")
+            issues: int = repo_data.get('open_issues_count', 0)
+            if issues > thresholds.open_issues:
+                warnings.append(f"{issues} open issues")
+        
+        if signals.get('ci') == 'failure':
+            (errors if thresholds.ci_failure == 'error' else warnings).append("default-branch CI failing")
+        
+        if signals.get('oldest_pr'):
+            pr_days: float = days_since(signals['oldest_pr'])
+            if pr_days > thresholds.pr_age_days:
+                warnings.append(f"pull request open for {int(pr_days)} days")
+        
+        unreleased: Optional[int] = signals.get('unreleased_commits')
+        if unreleased:
+            released_days: float = days_since(signals['released_at']) if signals.get('released_at') else 0.0
+            if unreleased > thresholds.unreleased_commits or released_days > thresholds.release_age_days:
+                warnings.append(f"{unreleased} commits since release {signals.get('release')}")
+        
+        if errors:
+            return HealthStatus.ERROR, errors + warnings
+        if warnings:
+            return HealthStatus.WARNING, warnings
+        return HealthStatus.HEALTHY, []
     
     def check_local_projects(self) -> Dict[str, LocalProjectInfo]:
         """Check local project status with type safety"""
-        project_status: Dict[str, LocalProjectInfo] = {}
-        
-        for name, path_str in self.local_projects.items():
-            path = Path(path_str)
-            
-            if not path.exists():
-                project_status[name] = LocalProjectInfo(
-                    path=path_str,
-                    has_git=False,
-                    uncommitted_changes=0,
-                    last_modified='not found',
-                    size_mb=0.0,
-                    status=HealthStatus.ERROR
+        results: Dict[str, LocalProjectInfo] = dict(self.iter_local_projects())
+        return {name: results[name] for name in self.local_projects if name in results}
+    
+    def _project_timeout(self, name: str) -> Optional[float]:
+        target: Optional[ProjectTarget] = self.project_targets.get(name)
+        return target.timeout if target and target.timeout else self.scan_timeout
+    
+    def iter_local_projects(self) -> Iterator[Tuple[str, LocalProjectInfo]]:
+        """Yield each local project's status as soon as its scan completes"""
+        try:
+            jobs: List[Tuple[str, str]] = []
+            for name, path_str in self.local_projects.items():
+                target: Optional[ProjectTarget] = self.project_targets.get(name)
+                reused: Optional[LocalProjectInfo] = self._reusable(
+                    f'local:{name}', target.interval if target else None
                 )
-                continue
-            
-            # Check git status
-            has_git: bool = (path / '.git').exists()
-            uncommitted: int = 0
-            
-            if has_git:
-                try:
-                    result = subprocess.run(
-                        ['git', 'status', '--porcelain'],
-                        cwd=path,
-                        capture_output=True,
-                        text=True
-                    )
-                    uncommitted = len(result.stdout.strip().split('\n')) if result.stdout.strip() else 0
-                except:
-                    pass
-            
-            # Get project size
-            size_mb: float = self._get_directory_size(path)
+                if reused is not None:
+                    yield name, reused
+                else:
+                    jobs.append((name, path_str))
             
-            # Get last modified time
-            last_modified: str = datetime.datetime.fromtimestamp(
-                path.stat().st_mtime
-            ).strftime('%Y-%m-%d %H:%M')
+            if self.scan_workers <= 1 and all(self._project_timeout(name) is None for name, _ in jobs):
+                for name, path_str in jobs:
+                    yield name, self.check_local_project(path_str, name)
+                return
             
-            # Determine health
-            if uncommitted > 10:
-                status = HealthStatus.WARNING
-            elif not has_git:
-                status = HealthStatus.WARNING
-            else:
-                status = HealthStatus.HEALTHY
-            
-            project_status[name] = LocalProjectInfo(
-                path=path_str,
-                has_git=has_git,
-                uncommitted_changes=uncommitted,
-                last_modified=last_modified,
-                size_mb=size_mb,
-                status=status
+            outcomes = iter_bounded(
+                lambda job: self.check_local_project(job[1], job[0]),
+                jobs,
+                self.scan_workers,
+                item_timeout=lambda job: self._project_timeout(job[0])
             )
+            for _, outcome in outcomes:
+                name, path_str = outcome.item
+                if outcome.value is not None:
+                    yield name, outcome.value
+                elif outcome.timed_out:
+                    self._log(f"⏱️  Timed out checking {name} after {self._project_timeout(name)}s")
+                    yield name, self._unavailable_project(path_str, 'timed out')
+                else:
+                    self._log(f"❌ Error checking {name}: {outcome.error}")
+                    yield name, self._unavailable_project(path_str, 'error')
+        finally:
+            self.size_index.save()
+    
+    def _unavailable_project(self, path_str: str, reason: str) -> LocalProjectInfo:
+        """Placeholder entry for a project that could not be inspected"""
+        return LocalProjectInfo(
+            path=path_str,
+            has_git=False,
+            uncommitted_changes=0,
+            last_modified=reason,
+            size_mb=0.0,
+            status=HealthStatus.ERROR
+        )
+    
+    def check_local_project(self, path_str: str, name: Optional[str] = None) -> LocalProjectInfo:
+        """Inspect a single local project, running only the checks its target enables"""
+        target: Optional[ProjectTarget] = self.project_targets.get(name) if name else None
+        checks: List[str] = target.checks if target else PROJECT_CHECKS
+        with self.timings.span(f'local:{name or path_str}', ITEM, path=path_str):
+            info: LocalProjectInfo = self._inspect_project(path_str, checks, self._project_timeout(name or ''))
+        if name:
+            self._remember(f'local:{name}', info)
+        return info
+    
+    def _inspect_project(self, path_str: str, checks: List[str], timeout: Optional[float]) -> LocalProjectInfo:
+        path = Path(path_str)
+        
+        if not path.exists():
+            return self._unavailable_project(path_str, 'not found')
         
-        return project_status
+        # Check git status
+        has_git: bool = (path / '.git').exists()
+        uncommitted: int = 0
+        
+        if has_git and 'git' in checks:
+            with self.timings.span('git status', SUBPROCESS, path=path_str):
+                uncommitted = self.git_status.count_changes(path, timeout)
+        
+        # Get project size
+        size_mb: float = 0.0
+        if 'size' in checks:
+            with self.timings.span('directory size', FS, path=path_str):
+                size_mb = self._get_directory_size(path)
+        
+        # Get last modified time
+        last_modified: str = datetime.datetime.fromtimestamp(
+            path.stat().st_mtime
+        ).strftime('%Y-%m-%d %H:%M')
+        
+        # Determine health
+        if uncommitted > 10:
+            status = HealthStatus.WARNING
+        elif not has_git:
+            status = HealthStatus.WARNING
+        else:
+            status = HealthStatus.HEALTHY
+        
+        return LocalProjectInfo(
+            path=path_str,
+            has_git=has_git,
+            uncommitted_changes=uncommitted,
+            last_modified=last_modified,
+            size_mb=size_mb,
+            status=status
+        )
     
     def _get_directory_size(self, path: Path) -> float:
         """Calculate directory size in MB"""
         total_size: int = 0
         try:
-            for item in path.rglob('*'):
-                if item.is_file() and not item.is_symlink():
-                    total_size += item.stat().st_size
+            total_size = self.size_index.size_of(path)
         except:
             pass
         return round(total_size / (1024 * 1024), 2)
@@ -238,7 +511,7 @@ class ProjectHealthMonitor:
         server_status: Dict[str, bool] = {}
         
         # Check Claude desktop config
-        config_path = Path.home() / 'Library' / 'Application Support' / 'Claude' / 'claude_desktop_config.json'
+        config_path = self.claude_config_path
         
         if config_path.exists():
             try:
@@ -259,6 +532,7 @@ class ProjectHealthMonitor:
     def check_api_keys(self) -> Dict[str, bool]:
         """Check if required API keys are configured"""
         key_status: Dict[str, bool] = {}
+        self.load_environment()
         
         for key_name in self.required_api_keys:
             key_status[key_name] = bool(os.getenv(key_name))
@@ -269,69 +543,188 @@ class ProjectHealthMonitor:
         """Run tests for a project and return results"""
         path = Path(project_path)
         
+        # Reuse the last green result if the sources are unchanged
+        current: Optional[str] = fingerprint(path) if self.test_cache else None
+        if self.test_cache and current:
+            entry = self.test_cache.lookup(path, current)
+            if entry is not None:
+                counts = entry['counts']
+                if counts is None:
+                    return None
+                return TestStatus(
+                    passed=counts['passed'],
+                    failed=counts['failed'],
+                    skipped=counts['skipped'],
+                    total=counts['total']
+                )
+        
         # Check for test files
-        test_files: List[Path] = list(path.glob('**/test_*.py')) + list(path.glob('**/*_test.py'))
+        if not find_test_files(path):
+            return None
+        
+        # Run pytest if available
+        start: float = time.perf_counter()
+        with self.timings.span(f'pytest:{path.name}', SUBPROCESS, path=project_path):
+            counts = run_pytest(path, timeout=self.test_timeout)
         
-        if not test_files:
+        if counts is None:
             return None
+        if self.test_cache and current:
+            self.test_cache.store(path, current, counts, time.perf_counter() - start)
+            self.test_cache.save()
+        return TestStatus(
+            passed=counts['passed'],
+            failed=counts['failed'],
+            skipped=counts['skipped'],
+            total=counts['total']
+        )
+    
+    def check_project_tests(self) -> Tuple[Dict[str, TestStatus], Dict[str, float]]:
+        """Run all local project suites concurrently; returns results and per-project seconds"""
+        orchestrator = TestOrchestrator(self.test_workers, self.test_shards, self.test_timeout, self.test_cache)
+        results: Dict[str, TestStatus] = {}
+        durations: Dict[str, float] = {}
         
-        try:
-            # Run pytest if available
-            result = subprocess.run(
-                ['python', '-m', 'pytest', '--json-report', '--json-report-file=/tmp/test-report.json'],
-                cwd=path,
-                capture_output=True,
-                text=True
-            )
-            
-            # Parse test results
-            if Path('/tmp/test-report.json').exists():
-                report = json.loads(Path('/tmp/test-report.json').read_text())
-                return TestStatus(
-                    passed=report['summary'].get('passed', 0),
-                    failed=report['summary'].get('failed', 0),
-                    skipped=report['summary'].get('skipped', 0),
-                    total=report['summary'].get('total', 0)
+        tested: Dict[str, str] = {
+            name: path for name, path in self.local_projects.items()
+            if name not in self.project_targets or 'tests' in self.project_targets[name].checks
+        }
+        for name, run in orchestrator.run(tested).items():
+            durations[name] = round(run.seconds, 3)
+            extra: Dict[str, Any] = {'cached_seconds': run.seconds} if run.cached else {}
+            self.timings.add(f'tests:{name}', ITEM, run.started, run.elapsed,
+                             shards=run.shards, cached=run.cached, **extra)
+            if run.error:
+                self._log(f"❌ Error testing {name}: {run.error}")
+            if run.counts is not None:
+                results[name] = TestStatus(
+                    passed=run.counts['passed'],
+                    failed=run.counts['failed'],
+                    skipped=run.counts['skipped'],
+                    total=run.counts['total']
                 )
-        except:
-            pass
         
-        return None
+        return results, durations
     
     def generate_health_report(self) -> HealthReport:
         """Generate comprehensive health report"""
+        self.refresh_config()
         report = HealthReport(timestamp=datetime.datetime.now())
+        self.timings = Timings()
+        
+        # Check the selected components
+        if 'github' in self.checks:
+            self._log("🔍 Checking GitHub repositories...")
+            with self.timings.span('github', CHECK):
+                report.github_repos = self.check_github_status()
+            if self.github_cache:
+                report.github_cache = self.github_cache.stats()
+        
+        if 'local' in self.checks:
+            self._log("🔍 Checking local projects...")
+            with self.timings.span('local_projects', CHECK):
+                report.local_projects = self.check_local_projects()
+        
+        if 'mcp' in self.checks:
+            self._log("🔍 Checking MCP servers...")
+            with self.timings.span('mcp_servers', CHECK):
+                report.mcp_servers = self.check_mcp_servers()
         
-        # Check all components
-        print("🔍 Checking GitHub repositories...")
-        report.github_repos = self.check_github_status()
+        if 'api' in self.checks:
+            self._log("🔍 Checking API keys...")
+            with self.timings.span('api_keys', CHECK):
+                report.api_keys = self.check_api_keys()
         
-        print("🔍 Checking local projects...")
-        report.local_projects = self.check_local_projects()
+        if self.run_tests:
+            self._log("🔍 Running project tests...")
+            if self.test_cache:
+                self.test_cache.reset_stats()
+            with self.timings.span('tests', CHECK):
+                report.tests, report.test_durations = self.check_project_tests()
+            if self.test_cache:
+                report.test_cache = self.test_cache.stats()
         
-        print("🔍 Checking MCP servers...")
-        report.mcp_servers = self.check_mcp_servers()
+        self.assess_report(report)
+        report.timings = self.timings.summary()
+        return report
+    
+    def stream_health_report(self) -> Iterator[Dict[str, Any]]:
+        """Yield one record per repo/project/server/key as it completes, then a summary"""
+        self.refresh_config()
+        report = HealthReport(timestamp=datetime.datetime.now())
+        self.timings = Timings()
+        sections: Dict[str, Dict[str, Any]] = {
+            'github_repo': report.github_repos,
+            'local_project': report.local_projects,
+            'mcp_server': report.mcp_servers,
+            'api_key': report.api_keys
+        }
+        producers: Dict[str, Callable[[], Iterable[Tuple[str, Any]]]] = {}
+        if 'github' in self.checks:
+            producers['github_repo'] = self.iter_github_status
+        if 'local' in self.checks:
+            producers['local_project'] = self.iter_local_projects
+        if 'mcp' in self.checks:
+            producers['mcp_server'] = lambda: self.check_mcp_servers().items()
+        if 'api' in self.checks:
+            producers['api_key'] = lambda: self.check_api_keys().items()
+        if self.run_tests:
+            sections['tests'] = report.tests
+            producers['tests'] = lambda: self.check_project_tests()[0].items()
         
-        print("🔍 Checking API keys...")
-        report.api_keys = self.check_api_keys()
+        for kind, (name, result) in merge_streams(producers):
+            sections[kind][name] = result
+            yield {'type': kind, 'name': name, 'result': result}
+        
+        if self.github_cache:
+            report.github_cache = self.github_cache.stats()
+        self.assess_report(report)
+        yield {
+            'type': 'summary',
+            'timestamp': report.timestamp.isoformat(),
+            'overall_health': report.overall_health.value,
+            'recommendations': report.recommendations,
+            'github_cache': report.github_cache,
+            'timings': self.timings.summary()
+        }
+    
+    def assess_report(self, report: HealthReport) -> None:
+        """Derive overall health and recommendations from the check results"""
+        report.recommendations = []
         
         # Determine overall health
         error_count: int = 0
         warning_count: int = 0
         
+        # Sections served or collected as JSON carry plain status strings
         for repo in report.github_repos.values():
-            if repo['status'] == HealthStatus.ERROR:
+            if HealthStatus(repo['status']) == HealthStatus.ERROR:
                 error_count += 1
-            elif repo['status'] == HealthStatus.WARNING:
+            elif HealthStatus(repo['status']) == HealthStatus.WARNING:
                 warning_count += 1
         
         for project in report.local_projects.values():
-            if project['status'] == HealthStatus.ERROR:
+            if HealthStatus(project['status']) == HealthStatus.ERROR:
                 error_count += 1
-            elif project['status'] == HealthStatus.WARNING:
+            elif HealthStatus(project['status']) == HealthStatus.WARNING:
                 warning_count += 1
         
+        for name, tests in report.tests.items():
+            if tests['failed'] > 0:
+                warning_count += 1
+                report.recommendations.append(f"Fix failing tests in {name}")
+        
         # Generate recommendations
+        for name, repo in report.github_repos.items():
+            for problem in repo.get('problems', []):
+                report.recommendations.append(f"Look into {name}: {problem}")
+        
+        stale: int = sum(1 for repo in report.github_repos.values() if repo.get('stale'))
+        if stale:
+            report.recommendations.append(
+                f"GitHub rate limit reached: {stale} repositories show last-known data"
+            )
+        
         if not all(report.api_keys.values()):
             report.recommendations.append("Configure missing API keys")
         
@@ -349,8 +742,6 @@ class ProjectHealthMonitor:
             report.overall_health = HealthStatus.WARNING
         else:
             report.overall_health = HealthStatus.HEALTHY
-        
-        return report
     
     def display_report(self, report: HealthReport) -> None:
         """Display health report in formatted output"""
@@ -369,26 +760,51 @@ class ProjectHealthMonitor:
         print(f"\n🎯 Overall Health: {status_emoji[report.overall_health]} {report.overall_health.value.upper()}")
         
         # GitHub repositories
-        print(f"\n📦 GitHub Repositories:")
-        for repo_name, info in report.github_repos.items():
-            print(f"  {status_emoji[info['status']]} {repo_name}")
-            print(f"     ⭐ {info['stars']} | 🍴 {info['forks']} | 🐛 {info['open_issues']} issues")
+        if 'github' in self.checks:
+            print(f"\n📦 GitHub Repositories:")
+            for repo_name, info in report.github_repos.items():
+                print(f"  {status_emoji[info['status']]} {repo_name}{' (stale)' if info['stale'] else ''}")
+                print(f"     ⭐ {info['stars']} | 🍴 {info['forks']} | 🐛 {info['open_issues']} issues")
+                for problem in info.get('problems', []):
+                    print(f"     ↳ {problem}")
+            if report.github_cache:
+                print(f"  🗄️  Cache: {report.github_cache['hits']} hits | {report.github_cache['misses']} misses")
         
         # Local projects
-        print(f"\n💻 Local Projects:")
-        for name, project_info in report.local_projects.items():
-            print(f"  {status_emoji[project_info['status']]} {name}")
-            print(f"     📁 {project_info['size_mb']}MB | {'🔧 Git' if project_info['has_git'] else '⚠️  No Git'} | 📝 {project_info['uncommitted_changes']} uncommitted")
+        if 'local' in self.checks:
+            print(f"\n💻 Local Projects:")
+            for name, project_info in report.local_projects.items():
+                print(f"  {status_emoji[project_info['status']]} {name}")
+                print(f"     📁 {project_info['size_mb']}MB | {'🔧 Git' if project_info['has_git'] else '⚠️  No Git'} | 📝 {project_info['uncommitted_changes']} uncommitted")
         
         # MCP Servers
-        print(f"\n🔌 MCP Servers:")
-        for server, configured in report.mcp_servers.items():
-            print(f"  {'✅' if configured else '❌'} {server}")
+        if 'mcp' in self.checks:
+            print(f"\n🔌 MCP Servers:")
+            for server, configured in report.mcp_servers.items():
+                print(f"  {'✅' if configured else '❌'} {server}")
         
         # API Keys
-        print(f"\n🔑 API Keys:")
-        for key, configured in report.api_keys.items():
-            print(f"  {'✅' if configured else '❌'} {key}")
+        if 'api' in self.checks:
+            print(f"\n🔑 API Keys:")
+            for key, configured in report.api_keys.items():
+                print(f"  {'✅' if configured else '❌'} {key}")
+        
+        # Tests
+        if report.tests:
+            print(f"\n🧪 Tests:")
+            for name, tests in report.tests.items():
+                print(f"  {'✅' if tests['failed'] == 0 else '❌'} {name}: "
+                      f"{tests['passed']} passed | {tests['failed']} failed | {tests['skipped']} skipped "
+                      f"({report.test_durations.get(name, 0.0):.1f}s)")
+            if report.test_cache:
+                print(f"  🗄️  Cache: {report.test_cache['hits']} hits | {report.test_cache['misses']} misses | "
+                      f"{report.test_cache['seconds_saved']:.1f}s saved")
+        
+        # Timings
+        if report.timings.get('checks'):
+            print(f"\n⏱️  Timings:")
+            for check, timing in report.timings['checks'].items():
+                print(f"  {check}: {timing['wall_s']:.2f}s wall | {timing['cpu_s']:.2f}s cpu")
         
         # Recommendations
         if report.recommendations:
@@ -398,6 +814,23 @@ class ProjectHealthMonitor:
         
         print("\n" + "="*60)
     
+    def report_to_dict(self, report: HealthReport) -> Dict[str, Any]:
+        """Convert report to a JSON-serialisable dict"""
+        return {
+            'timestamp': report.timestamp.isoformat(),
+            'overall_health': report.overall_health.value,
+            'github_repos': report.github_repos,
+            'local_projects': report.local_projects,
+            'mcp_servers': report.mcp_servers,
+            'api_keys': report.api_keys,
+            'recommendations': report.recommendations,
+            'github_cache': report.github_cache,
+            'timings': report.timings,
+            'tests': report.tests,
+            'test_durations': report.test_durations,
+            'test_cache': report.test_cache
+        }
+    
     def save_report(self, report: HealthReport, filename: Optional[str] = None) -> Path:
         """Save report to JSON file"""
         if not filename:
@@ -408,45 +841,251 @@ class ProjectHealthMonitor:
         
         report_path = reports_dir / filename
         
-        # Convert report to dict
-        report_dict = {
-            'timestamp': report.timestamp.isoformat(),
-            'overall_health': report.overall_health.value,
-            'github_repos': report.github_repos,
-            'local_projects': report.local_projects,
-            'mcp_servers': report.mcp_servers,
-            'api_keys': report.api_keys,
-            'recommendations': report.recommendations
-        }
-        
-        report_path.write_text(json.dumps(report_dict, indent=2))
+        report_path.write_text(json.dumps(self.report_to_dict(report), indent=2, default=json_default))
         return report_path
 
+def run_history_command(args: Any) -> None:
+    """Import old reports into, or query trends from, the history store"""
+    from health.history import HealthHistory
+    
+    history = HealthHistory()
+    try:
+        if args.history_import:
+            count: int = history.import_json_reports(args.history_import)
+            print(f"📥 Imported {count} reports from {args.history_import}")
+        
+        if args.trend:
+            entity, _, field_name = args.trend.rpartition(':')
+            since = datetime.datetime.now() - datetime.timedelta(days=args.since_days)
+            if args.bucket:
+                for bucket in history.downsample(entity, field_name, args.bucket, start=since):
+                    print(json.dumps(bucket))
+            else:
+                for timestamp, value in history.series(entity, field_name, start=since):
+                    print(json.dumps({'timestamp': timestamp.isoformat(), field_name: value}))
+    finally:
+        history.close()
+
 def main() -> None:
     """Main entry point"""
     import argparse
     
     parser = argparse.ArgumentParser(description='Monitor project health')
+    parser.add_argument('--config', type=Path, metavar='FILE',
+                        help='Targets and budgets (TOML, YAML or JSON; default: $PROJECT_HEALTH_CONFIG, '
+                             'then ~/.config/project-health/config.*)')
     parser.add_argument('--save', action='store_true', help='Save report to file')
     parser.add_argument('--json', action='store_true', help='Output as JSON')
     parser.add_argument('--quiet', action='store_true', help='Minimal output')
+    parser.add_argument('--only', type=str, metavar='CHECKS',
+                        help=f"Comma-separated checks to run (default: all of {','.join(CHECKS)})")
+    parser.add_argument('--tests', action='store_true', help='Run local project test suites')
+    parser.add_argument('--test-workers', type=int,
+                        help='Maximum concurrent pytest processes')
+    parser.add_argument('--test-shards', type=int,
+                        help='Split each suite across this many pytest processes')
+    parser.add_argument('--no-test-cache', action='store_true',
+                        help='Always re-run suites even if their sources are unchanged')
+    parser.add_argument('--test-timeout', type=float, help='Per-pytest-process timeout in seconds')
+    parser.add_argument('--github-concurrency', type=int,
+                        help='Maximum concurrent GitHub requests')
+    parser.add_argument('--github-timeout', type=float,
+                        help='Per-request GitHub timeout in seconds')
+    parser.add_argument('--github-retries', type=int,
+                        help='Retries for transient GitHub failures')
+    parser.add_argument('--github-reserve', type=int,
+                        help='GitHub requests per rate-limit window to leave unused for other tools')
+    parser.add_argument('--github-backend', choices=['rest', 'graphql'],
+                        help='Fetch repos one REST call each or in batched GraphQL queries')
+    parser.add_argument('--scan-workers', type=int,
+                        help='Scan local projects (and their top-level subtrees) in parallel')
+    parser.add_argument('--scan-timeout', type=float,
+                        help='Give up on a local project after this many seconds')
+    parser.add_argument('--git-warm', action='store_true',
+                        help='Use git untracked cache / fsmonitor daemon for dirty-file counts')
+    parser.add_argument('--exclude-dir', action='append', metavar='GLOB',
+                        help='Skip matching directories when measuring project size')
+    parser.add_argument('--summarize-dir', action='append', metavar='GLOB',
+                        help='Count matching directories as one opaque total (default: node_modules, .venv, venv)')
+    parser.add_argument('--history', action='store_true',
+                        help='Append this run to the SQLite history store')
+    parser.add_argument('--history-import', type=Path, metavar='DIR',
+                        help='Import existing health-report-*.json files into the history store and exit')
+    parser.add_argument('--trend', type=str, metavar='ENTITY:FIELD',
+                        help='Print the history of one field, e.g. bee-supabase:uncommitted_changes, and exit')
+    parser.add_argument('--since-days', type=float, default=7.0,
+                        help='Time range for --trend')
+    parser.add_argument('--bucket', type=float, metavar='SECONDS',
+                        help='Downsample --trend output into buckets of this width')
+    parser.add_argument('--retain-days', type=float,
+                        help='With --history, delete history older than this many days')
+    parser.add_argument('--compact-days', type=float,
+                        help='With --history, keep one report per hour for history older than this many days')
+    parser.add_argument('--profile', type=Path, metavar='FILE',
+                        help='Write a Chrome trace (*.json) or cProfile stats (any other name; main thread only)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Emit each check result as an NDJSON line as soon as it completes')
+    parser.add_argument('--watch', action='store_true',
+                        help='Stay resident and stream report diffs as NDJSON when inputs change')
+    parser.add_argument('--github-interval', type=float,
+                        help='Seconds between GitHub refreshes in resident modes')
+    parser.add_argument('--poll-interval', type=float, default=5.0,
+                        help='Polling interval when inotify is unavailable')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Disable the conditional-request GitHub cache')
+    parser.add_argument('--serve-port', type=int, metavar='PORT',
+                        help='Serve cached report sections over HTTP on 127.0.0.1:PORT (0 picks a free port)')
+    parser.add_argument('--serve-socket', type=Path, metavar='PATH',
+                        help='Serve cached report sections over HTTP on a Unix socket')
+    parser.add_argument('--serve-ttl', action='append', default=[], metavar='SECTION=SECONDS',
+                        help='Freshness TTL for a served section (github, local, mcp, api, tests)')
+    parser.add_argument('--serve-host', type=str, default='127.0.0.1',
+                        help='Address --serve-port binds to (agents reached over the network need a routable one)')
+    parser.add_argument('--agent', action='store_true',
+                        help='With --serve-port/--serve-socket, serve host-local sections to a fleet collector '
+                             '(GitHub is left to the collector)')
+    parser.add_argument('--agent-name', type=str,
+                        help='Host name an agent reports (default: this machine\'s hostname)')
+    parser.add_argument('--collect', action='append', default=[], metavar='NAME=URL',
+                        help='Collect from a fleet agent at http://HOST:PORT or unix:/PATH (repeatable)')
+    parser.add_argument('--collect-interval', type=float, metavar='SECONDS',
+                        help='Keep polling agents and stream per-host diffs as NDJSON')
+    parser.add_argument('--collect-timeout', type=float, default=10.0,
+                        help='Per-agent request timeout in seconds')
     
     args = parser.parse_args()
     
-    monitor = ProjectHealthMonitor()
+    # Command-line budgets override the config file's, including after it is reloaded
+    overrides: Dict[str, Any] = {}
+    if args.only:
+        checks: List[str] = [name.strip() for name in args.only.split(',') if name.strip()]
+        unknown: List[str] = [name for name in checks if name not in CHECKS]
+        if unknown:
+            parser.error(f"unknown check(s) for --only: {', '.join(unknown)}")
+        overrides['checks'] = checks
+    for key, value in [
+        ('github.concurrency', args.github_concurrency),
+        ('github.timeout', args.github_timeout),
+        ('github.retries', args.github_retries),
+        ('github.backend', args.github_backend),
+        ('github.reserve', args.github_reserve),
+        ('github.interval', args.github_interval),
+        ('local.concurrency', args.scan_workers),
+        ('local.timeout', args.scan_timeout),
+        ('local.exclude_dirs', args.exclude_dir),
+        ('local.summarize_dirs', args.summarize_dir),
+        ('tests.concurrency', args.test_workers),
+        ('tests.shards', args.test_shards),
+        ('tests.timeout', args.test_timeout)
+    ]:
+        if value is not None:
+            overrides[key] = value
+    
+    if args.history_import or args.trend:
+        run_history_command(args)
+        exit(0)
+    
+    try:
+        config: HealthConfig = load_config(args.config or find_config())
+    except ConfigError as e:
+        parser.error(str(e))
+    monitor = ProjectHealthMonitor(config)
+    monitor.config_overrides = overrides
+    monitor.apply_config(config)
+    monitor.run_tests = args.tests
+    if args.no_test_cache:
+        monitor.test_cache = None
+    if args.no_cache:
+        monitor.github_cache = None
+    monitor.git_status.warm = args.git_warm
+    
+    if args.collect:
+        from health.fleet import FleetCollector, display_fleet, parse_hosts
+        
+        try:
+            hosts: Dict[str, str] = parse_hosts(args.collect)
+        except ValueError as e:
+            parser.error(f"--collect: {e}")
+        monitor.log_file = sys.stderr
+        collector = FleetCollector(monitor, hosts, monitor.config.intervals()['github'], args.collect_timeout)
+        if args.collect_interval is not None:
+            try:
+                collector.run(args.collect_interval)
+            except KeyboardInterrupt:
+                pass
+            exit(0)
+        fleet: Dict[str, Any] = collector.collect()
+        if args.json:
+            print(json.dumps(fleet, indent=2))
+        elif not args.quiet:
+            display_fleet(fleet)
+        exit({HealthStatus.ERROR.value: 2, HealthStatus.WARNING.value: 1}.get(fleet['overall_health'], 0))
+    
+    if args.serve_port is not None or args.serve_socket:
+        from health.server import HealthRequestHandler, HealthServer, serve
+        
+        ttls: Dict[str, float] = {}
+        for spec in args.serve_ttl:
+            section, _, seconds = spec.partition('=')
+            if section not in monitor.config.intervals():
+                parser.error(f"unknown section for --serve-ttl: {section}")
+            ttls[section] = float(seconds)
+        monitor.log_file = sys.stderr
+        health: Optional[HealthServer] = None
+        handler_class: Type[HealthRequestHandler] = HealthRequestHandler
+        if args.agent:
+            from health.fleet import AgentRequestHandler, AgentServer
+            
+            # The collector fetches GitHub once for the whole fleet
+            monitor.config_overrides['checks'] = [name for name in monitor.checks if name != 'github']
+            monitor.apply_config(config)
+            health = AgentServer(monitor, ttls, args.agent_name)
+            handler_class = AgentRequestHandler
+        try:
+            serve(monitor, args.serve_port, args.serve_socket, ttls, args.serve_host, health, handler_class)
+        except KeyboardInterrupt:
+            pass
+        exit(0)
+    
+    if args.watch:
+        from health.watch import WatchSession
+        
+        monitor.log_file = sys.stderr
+        session = WatchSession(monitor, monitor.config.intervals()['github'], args.poll_interval)
+        try:
+            session.run()
+        except KeyboardInterrupt:
+            pass
+        exit(0)
+    
+    if args.stream:
+        monitor.log_file = sys.stderr
+        overall: str = HealthStatus.UNKNOWN.value
+        for record in monitor.stream_health_report():
+            print(json.dumps(record, default=json_default), flush=True)
+            if record['type'] == 'summary':
+                overall = record['overall_health']
+        if args.profile and args.profile.suffix == '.json':
+            monitor.timings.write_chrome_trace(args.profile)
+        exit({HealthStatus.ERROR.value: 2, HealthStatus.WARNING.value: 1}.get(overall, 0))
+    
+    profiler: Any = None
+    if args.profile and args.profile.suffix != '.json':
+        import cProfile
+        
+        profiler = cProfile.Profile()
+        profiler.enable()
+    
     report = monitor.generate_health_report()
     
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(str(args.profile))
+    elif args.profile:
+        monitor.timings.write_chrome_trace(args.profile)
+    
     if args.json:
-        report_dict = {
-            'timestamp': report.timestamp.isoformat(),
-            'overall_health': report.overall_health.value,
-            'github_repos': report.github_repos,
-            'local_projects': report.local_projects,
-            'mcp_servers': report.mcp_servers,
-            'api_keys': report.api_keys,
-            'recommendations': report.recommendations
-        }
-        print(json.dumps(report_dict, indent=2))
+        print(json.dumps(monitor.report_to_dict(report), indent=2, default=json_default))
     elif not args.quiet:
         monitor.display_report(report)
     
@@ -454,6 +1093,18 @@ def main() -> None:
         saved_path = monitor.save_report(report)
         print(f"\n💾 Report saved to: {saved_path}")
     
+    if args.history:
+        from health.history import HealthHistory
+        
+        history = HealthHistory()
+        history.add(monitor.report_to_dict(report))
+        now = datetime.datetime.now()
+        if args.compact_days is not None:
+            history.compact(now - datetime.timedelta(days=args.compact_days), 3600)
+        if args.retain_days is not None:
+            history.prune(now - datetime.timedelta(days=args.retain_days))
+        history.close()
+    
     # Exit with appropriate code
     if report.overall_health == HealthStatus.ERROR:
         exit(2)
@@ -0,0 +1,8 @@
+"""
+Shared test setup: make the repository's top-level modules importable
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,96 @@
+"""
+Fleet collection from real agent processes
+Starts agents on ephemeral ports, each with its own HOME, and checks the
+collector merges their reports and keeps going when one of them dies
+"""
+
+import io
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import pytest
+
+from health.config import HealthConfig
+from health.fleet import FleetCollector
+from project_health_monitor import ProjectHealthMonitor
+
+ROOT: Path = Path(__file__).resolve().parent.parent
+SERVING = re.compile(r'Serving health reports on (http://\S+)')
+
+def start_agent(workdir: Path, name: str, servers: List[str]) -> 'subprocess.Popen[bytes]':
+    home: Path = workdir / name
+    config: Path = home / 'Library' / 'Application Support' / 'Claude' / 'claude_desktop_config.json'
+    config.parent.mkdir(parents=True)
+    config.write_text(json.dumps({'mcpServers': {server: {} for server in servers}}))
+    env: Dict[str, str] = dict(os.environ, HOME=str(home))
+    env.pop('PROJECT_HEALTH_CONFIG', None)
+    with open(workdir / f'{name}.log', 'wb') as log:
+        return subprocess.Popen(
+            [sys.executable, str(ROOT / 'project_health_monitor.py'),
+             '--agent', '--agent-name', name, '--serve-port', '0', '--only', 'local,mcp,api'],
+            env=env, stdout=subprocess.DEVNULL, stderr=log
+        )
+
+def agent_url(workdir: Path, name: str, agent: 'subprocess.Popen[bytes]', timeout: float = 30.0) -> str:
+    """The address an agent printed once it bound its ephemeral port"""
+    deadline: float = time.monotonic() + timeout
+    log: Path = workdir / f'{name}.log'
+    while time.monotonic() < deadline:
+        match = SERVING.search(log.read_text(errors='replace'))
+        if match:
+            return match.group(1)
+        if agent.poll() is not None:
+            raise RuntimeError(f'{name} exited: {log.read_text(errors="replace")}')
+        time.sleep(0.05)
+    raise TimeoutError(f'{name} did not start')
+
+@pytest.fixture
+def agents(tmp_path: Path) -> Iterator[Dict[str, 'subprocess.Popen[bytes]']]:
+    started: Dict[str, 'subprocess.Popen[bytes]'] = {
+        'host-a': start_agent(tmp_path, 'host-a', ['filesystem']),
+        'host-b': start_agent(tmp_path, 'host-b', ['filesystem', 'memory'])
+    }
+    try:
+        yield started
+    finally:
+        for agent in started.values():
+            if agent.poll() is None:
+                agent.terminate()
+        for agent in started.values():
+            agent.wait(timeout=10)
+
+def test_collector_merges_agents_and_survives_a_dead_one(
+    tmp_path: Path, agents: Dict[str, 'subprocess.Popen[bytes]']
+) -> None:
+    hosts: Dict[str, str] = {name: agent_url(tmp_path, name, agent) for name, agent in agents.items()}
+    assert len(set(hosts.values())) == 2
+
+    monitor = ProjectHealthMonitor(HealthConfig())
+    monitor.log_file = io.StringIO()
+    collector = FleetCollector(monitor, hosts, timeout=5.0)
+
+    assert set(collector.poll()) == {'host-a', 'host-b'}
+    report = collector.report()
+    assert set(report['hosts']) == {'host-a', 'host-b'}
+    assert report['hosts']['host-a']['mcp_servers']['memory'] is False
+    assert report['hosts']['host-b']['mcp_servers']['memory'] is True
+    assert not any(host['freshness']['stale'] for host in report['hosts'].values())
+
+    agents['host-b'].kill()
+    agents['host-b'].wait(timeout=10)
+
+    changed: Dict[str, int] = collector.poll()
+    report = collector.report()
+    assert 'host-b' not in changed and 'host-a' in changed
+    dead = report['hosts']['host-b']['freshness']
+    assert dead['stale'] and dead['error']
+    assert not report['hosts']['host-a']['freshness']['stale']
+    # The unreachable host keeps its last data and pulls the fleet out of healthy
+    assert report['hosts']['host-b']['mcp_servers']['memory'] is True
+    assert report['overall_health'] != 'healthy'
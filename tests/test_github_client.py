@@ -0,0 +1,187 @@
+"""
+GitHubClient against a stub HTTP server
+Covers retries with backoff, the per-request timeout, ETag revalidation and
+telling rate-limit rejections apart from plain 403s
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+import pytest
+
+from health.cache import ResponseCache
+from health.github import FetchConfig, GitHubClient
+from health.ratelimit import RateLimitTracker
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers from the server's script: path -> list of (status, headers, body), last one repeating"""
+
+    server: 'StubServer'
+
+    def do_GET(self) -> None:
+        self.server.seen.append((self.path, dict(self.headers)))
+        if self.path == '/slow':
+            time.sleep(1.0)
+        if self.path == '/etag':
+            if self.headers.get('If-None-Match') == '"v1"':
+                self._reply(304, {'ETag': '"v1"'}, None)
+            else:
+                self._reply(200, {'ETag': '"v1"'}, {'name': 'repo'})
+            return
+        responses = self.server.script.get(self.path, [(404, {}, {'message': 'Not Found'})])
+        status, headers, body = responses.pop(0) if len(responses) > 1 else responses[0]
+        self._reply(status, headers, body)
+
+    def _reply(self, status: int, headers: Dict[str, str], body: Any) -> None:
+        payload: bytes = b'' if body is None else json.dumps(body).encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(('127.0.0.1', 0), StubHandler)
+        self.script: Dict[str, List[Tuple[int, Dict[str, str], Any]]] = {}
+        self.seen: List[Tuple[str, Dict[str, str]]] = []
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+@pytest.fixture
+def server() -> Iterator[StubServer]:
+    stub = StubServer()
+    thread = threading.Thread(target=stub.serve_forever, daemon=True)
+    thread.start()
+    yield stub
+    stub.shutdown()
+    stub.server_close()
+
+def make_client(**options: Any) -> GitHubClient:
+    cache = options.pop('cache', None)
+    limits = options.pop('limits', None)
+    return GitHubClient('test-token', FetchConfig(**options), cache=cache, limits=limits)
+
+def test_retries_5xx_with_exponential_backoff(server: StubServer, monkeypatch: pytest.MonkeyPatch) -> None:
+    server.script['/flaky'] = [(503, {}, {}), (502, {}, {}), (200, {}, {'ok': True})]
+    delays: List[float] = []
+    monkeypatch.setattr('health.github.time.sleep', delays.append)
+
+    result = make_client(retries=2, backoff=0.5).get_json(f'{server.url}/flaky')
+
+    assert result.ok and result.data == {'ok': True}
+    assert result.attempts == 3
+    assert delays == [0.5, 1.0]
+
+def test_gives_up_after_retries(server: StubServer, monkeypatch: pytest.MonkeyPatch) -> None:
+    server.script['/down'] = [(500, {}, {})]
+    monkeypatch.setattr('health.github.time.sleep', lambda seconds: None)
+
+    result = make_client(retries=1).get_json(f'{server.url}/down')
+
+    assert not result.ok
+    assert result.attempts == 2
+    assert result.status_code == 500
+    assert result.error == 'HTTP 500'
+
+def test_client_errors_are_not_retried(server: StubServer) -> None:
+    result = make_client(retries=2).get_json(f'{server.url}/missing')
+
+    assert result.status_code == 404
+    assert result.attempts == 1
+    assert result.error == 'HTTP 404'
+
+def test_per_request_timeout(server: StubServer) -> None:
+    started = time.monotonic()
+    result = make_client(timeout=0.2, retries=0).get_json(f'{server.url}/slow')
+
+    assert time.monotonic() - started < 0.9
+    assert result.status_code == 0
+    assert result.attempts == 1
+    assert result.error is not None and 'timed out' in result.error.lower()
+
+def test_304_reuses_cached_body(server: StubServer, tmp_path: Path) -> None:
+    cache = ResponseCache(path=tmp_path)
+    client = make_client(cache=cache)
+
+    first = client.get_json(f'{server.url}/etag')
+    second = client.get_json(f'{server.url}/etag')
+
+    assert first.status_code == 200 and not first.from_cache
+    assert second.status_code == 304 and second.from_cache
+    assert second.data == {'name': 'repo'}
+    assert 'If-None-Match' not in server.seen[0][1]
+    assert server.seen[1][1]['If-None-Match'] == '"v1"'
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_exhausted_quota_blocks_until_reset(server: StubServer) -> None:
+    reset = int(time.time()) + 600
+    server.script['/limited'] = [(403, {
+        'X-RateLimit-Limit': '60',
+        'X-RateLimit-Remaining': '0',
+        'X-RateLimit-Reset': str(reset),
+        'X-RateLimit-Resource': 'core'
+    }, {'message': 'API rate limit exceeded'})]
+    limits = RateLimitTracker()
+    client = make_client(retries=2, limits=limits)
+
+    result = client.get_json(f'{server.url}/limited')
+
+    assert result.rate_limited
+    assert result.attempts == 1
+    assert limits.blocked_until('core') == reset
+
+    # Further requests are not sent until the window resets
+    skipped = client.get_json(f'{server.url}/missing')
+    assert skipped.rate_limited and skipped.attempts == 0
+    assert len(server.seen) == 1
+
+def test_secondary_limit_honours_retry_after(server: StubServer) -> None:
+    server.script['/abuse'] = [(403, {'Retry-After': '30'}, {'message': 'You have exceeded a secondary rate limit'})]
+    limits = RateLimitTracker()
+
+    result = make_client(limits=limits).get_json(f'{server.url}/abuse')
+
+    assert result.rate_limited
+    assert 25 < limits.blocked_until('core') - time.time() <= 30
+
+def test_secondary_limit_without_retry_after(server: StubServer) -> None:
+    server.script['/abuse'] = [(403, {}, {'message': 'You have exceeded a secondary rate limit'})]
+    limits = RateLimitTracker()
+
+    result = make_client(limits=limits).get_json(f'{server.url}/abuse')
+
+    assert result.rate_limited
+    assert limits.blocked_until('core') - time.time() > 55
+
+def test_plain_403_is_not_a_rate_limit(server: StubServer) -> None:
+    server.script['/private'] = [(403, {
+        'X-RateLimit-Limit': '5000',
+        'X-RateLimit-Remaining': '4999',
+        'X-RateLimit-Reset': str(int(time.time()) + 600)
+    }, {'message': 'Resource not accessible by personal access token'})]
+    limits = RateLimitTracker()
+    client = make_client(limits=limits)
+
+    result = client.get_json(f'{server.url}/private')
+
+    assert not result.rate_limited
+    assert result.status_code == 403
+    assert result.error == 'HTTP 403'
+    assert limits.blocked_until('core') == 0.0
+    assert limits.limits['core'].remaining == 4999
+    assert client.get_json(f'{server.url}/private').attempts == 1
+    assert len(server.seen) == 2